@@ -0,0 +1,185 @@
+"""
+@gitsil10
+@version 0.1
+@date 2026-10-19
+@file cross_validation.py
+@brief cross validation
+
+@dependencies
+numpy -> np
+joblib -> Parallel | delayed | hash
+sklearn -> base | model_selection
+base -> clone
+model_selection -> KFold | RepeatedKFold | TimeSeriesSplit
+time -> perf_counter
+
+@details
+A file to cross validate models
+        1. schemes
+            1. kfold -> k disjoint test folds, every observation is tested once
+            2. repeated -> kfold repeated with a different shuffle every repeat
+            3. walk_forward -> expanding | sliding train window, the test fold always follows it in time
+        2. scaling
+            1. every fold is standardized with the mean and standard deviation of its train rows
+            2. scaled fold matrices are cached by the content of the feature and reused by later evaluations
+            3. the cache keeps the features of the latest evaluations only | the oldest one is dropped first
+        3. folds
+            1. fitted in parallel with joblib | a clone of the estimator per fold
+            2. large fold matrices are memory-mapped to the workers by joblib
+        4. results -> one array per metric | fit and score time per fold
+"""
+#imports
+import numpy as np
+from joblib import Parallel, delayed, hash as content_hash
+from sklearn.base import clone
+from sklearn.model_selection import KFold, RepeatedKFold, TimeSeriesSplit
+from time import perf_counter
+
+#functions
+def _fit_fold(estimator, X_train:np.ndarray, y_train:np.ndarray, X_test:np.ndarray, y_test:np.ndarray,
+              metrics:dict) -> dict:
+    """
+    @brief Fit and score one fold
+    @param estimator -> sklearn estimator | unfitted
+    @param X_train -> np.ndarray | scaled train rows
+    @param y_train -> np.ndarray | train responses
+    @param X_test -> np.ndarray | scaled test rows
+    @param y_test -> np.ndarray | test responses
+    @param metrics -> dict | name -> metric(y_true, y_pred)
+    @return (dict): metric -> value | fit_time | score_time
+    """
+    start = perf_counter()
+    estimator.fit(X_train, y_train)
+    fitted = perf_counter()
+    prediction = estimator.predict(X_test)
+    scores = {name: metric(y_test, prediction) for name, metric in metrics.items()}
+    scores["fit_time"] = fitted - start
+    scores["score_time"] = perf_counter() - fitted
+    return scores
+
+#class
+class CrossValidation:
+    """
+    @brief A class to cross validate models
+    @param scheme -> str | kfold | repeated | walk_forward
+    @param n_splits -> int | the number of folds
+    @param n_repeats -> int | the repeats of repeated
+    @param shuffle -> bool | shuffle the observations of kfold
+    @param random_state -> int | the seed of the shuffles
+    @param gap -> int | walk_forward | observations left out between the train and test window
+    @param max_train_size -> int | walk_forward | None expands the train window, otherwise slides it
+    @param n_jobs -> int | the folds fitted at once, None fits them in this process
+    @param cache -> bool | keep the scaled fold matrices for later evaluations
+    @param cache_size -> int | the features whose fold matrices are kept
+
+    @details
+    splits -> list | (train, test) indices of every fold
+    evaluate -> dict | fit and score an estimator on every fold
+    clear -> None | drop the cached fold matrices
+    """
+    _schemes:tuple = ("kfold", "repeated", "walk_forward")
+
+    def __init__(self, scheme:str = "kfold", n_splits:int = 5, n_repeats:int = 3, shuffle:bool = True,
+                 random_state:int = 0, gap:int = 0, max_train_size:int = None, n_jobs:int = None,
+                 cache:bool = True, cache_size:int = 2):
+        if scheme not in self._schemes:
+            raise ValueError(f"The scheme must be one of {', '.join(self._schemes)}")
+        if n_splits < 2 or n_repeats < 1:
+            raise ValueError("At least two splits and one repeat are required")
+        if cache_size < 1:
+            raise ValueError("The cache size must be positive")
+
+        self._scheme:str = scheme
+        if scheme == "kfold":
+            self._splitter = KFold(n_splits, shuffle=shuffle, random_state=random_state if shuffle else None)
+        elif scheme == "repeated":
+            self._splitter = RepeatedKFold(n_splits=n_splits, n_repeats=n_repeats, random_state=random_state)
+        else:
+            self._splitter = TimeSeriesSplit(n_splits, gap=gap, max_train_size=max_train_size)
+        self._n_jobs:int = n_jobs
+        self._cache:dict = {} if cache else None
+        self._cache_size:int = cache_size
+
+    @property
+    def scheme(self) -> str:
+        """
+        @brief Get the scheme
+        @return (str): kfold | repeated | walk_forward
+        """
+        return self._scheme
+
+    def splits(self, n:int) -> list:
+        """
+        @brief Get the folds
+        @param n -> int | the number of observations
+        @return (list): (train, test) indices of every fold
+        """
+        return list(self._splitter.split(np.empty((n, 1))))
+
+    def evaluate(self, estimator, feature, response, metrics:dict) -> dict:
+        """
+        @brief Fit and score an estimator on every fold
+        @param estimator -> sklearn estimator | cloned for every fold, never fitted itself
+        @param feature -> array | (observations,) | (observations, features)
+        @param response -> array | (observations,)
+        @param metrics -> dict | name -> metric(y_true, y_pred)
+        @return (dict): metric -> np.ndarray | fit_time -> np.ndarray | score_time -> np.ndarray | mean -> dict | folds -> int
+
+        @example
+        cv = CrossValidation("walk_forward", n_splits=10, n_jobs=4)
+        cv.evaluate(LinearRegression(), X, y, {"mse": mean_squared_error})["mse"]
+
+        @note
+        Time: O(folds * fit) / n_jobs, the scaling is O(observations * features) once per feature
+        Space: O(cache_size * folds * observations * features) while cached
+        """
+        X = np.asarray(feature, dtype=float)
+        X = X.reshape(-1, 1) if X.ndim == 1 else X
+        y = np.asarray(response).ravel()
+        if X.shape[0] != y.shape[0]:
+            raise ValueError("The feature and the response must have the same observations")
+
+        folds = self._folds(X)
+        results = Parallel(n_jobs=self._n_jobs)(
+            delayed(_fit_fold)(clone(estimator), X_train, y[train], X_test, y[test], metrics)
+            for train, test, X_train, X_test in folds
+        )
+
+        scores = {name: np.array([result[name] for result in results])
+                  for name in list(metrics) + ["fit_time", "score_time"]}
+        scores["mean"] = {name: float(np.mean(values)) for name, values in scores.items()}
+        scores["folds"] = len(results)
+        return scores
+
+    def clear(self) -> None:
+        """
+        @brief Drop the cached fold matrices
+        """
+        if not self._cache is None:
+            self._cache = {}
+
+    def _folds(self, X:np.ndarray) -> list:
+        """
+        @brief Split and scale the feature
+        @param X -> np.ndarray | (observations, features)
+        @return (list): (train, test, scaled train rows, scaled test rows) of every fold
+        """
+        key = content_hash(X) if not self._cache is None else None
+        if key in (self._cache or {}):
+            return self._cache[key]
+
+        folds = []
+        for train, test in self.splits(X.shape[0]):
+            X_train = X[train]
+            mean = X_train.mean(axis=0)
+            scale = X_train.std(axis=0)
+            scale[scale == 0] = 1.0
+            X_train -= mean
+            X_train /= scale
+            folds.append((train, test, X_train, (X[test] - mean) / scale))
+
+        if not key is None:
+            if len(self._cache) >= self._cache_size:
+                del self._cache[next(iter(self._cache))]
+            self._cache[key] = folds
+        return folds
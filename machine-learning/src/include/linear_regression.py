@@ -6,6 +6,7 @@
 @brief linear regression
 
 @dependencies
+concurrent.futures -> ThreadPoolExecutor
 numpy -> np
 scipy -> stats | st
 
@@ -15,6 +16,12 @@ metrics -> mean_squared_error | r2_score
 model_selection -> train_test_split
 preprocessing -> StandardScaler
 
+include -> cross_validation
+cross_validation -> CrossValidation
+
+utils -> persistence_mgmt
+persistence_mgmt -> PersistenceMgmt
+
 @details 
 A file to perform linear regression
 
@@ -41,14 +48,30 @@ Modeling the relationship between a dependent variable and independent variables
             2. independence
             3. homoscedasticity
             4. normality
+        9. batch regression
+            1. many feature | response pairs at once -> (pairs, observations)
+            2. closed form from sufficient statistics -> sum of x, y, x^2, xy, y^2
+            3. slope = sxy / sxx | intercept = mean(y) - slope * mean(x)
+            4. r = sxy / sqrt(sxx * syy) | t = r * sqrt((n - 2) / (1 - r^2))
+            5. std_err = sqrt((1 - r^2) * syy / sxx / (n - 2))
+        10. online regression -> recursive least squares
+            1. coefficients updated with every new observation in O(p^2)
+            2. P -> inverse of the weighted X^T X | k = P z / (lambda + z^T P z)
+            3. forgetting -> lambda | 1 weighs every observation equally | < 1 discounts older observations
+        11. rolling regression -> a simple linear regression per trailing window
+            1. window sums of x, y, x^2, xy, y^2 from cumulative sums | O(n) for every window
+            2. the data is centered first so the cumulative sums keep their precision
 """
 #imports
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import scipy.stats as st
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
+from include.cross_validation import CrossValidation
+from utils.persistence_mgmt import PersistenceMgmt
 #class
 class Regression:
     """
@@ -66,6 +89,9 @@ class Regression:
     @details
     Modeling the relationship between a dependent variable and independent variables
     """
+    #fitted values kept by save
+    _saved:tuple = ("slope", "intercept", "mean_squared_error", "r_squared", "p_value", "std_err")
+
     def __init__(self):
         self._regression:dict = {
             "feature":None,
@@ -79,6 +105,8 @@ class Regression:
         }
         
         self._model = LinearRegression()
+        self._scaler:StandardScaler = None
+        self._online:dict = None
 
     @property
     def regression(self) -> dict:
@@ -176,12 +204,25 @@ class Regression:
         """
         return self._model
 
+    @property
+    def scaler(self) -> StandardScaler:
+        """
+        @brief Get the scaler fitted on the training split
+        @return (StandardScaler): The scaler, None before fit
+        """
+        return self._scaler
+
     def fit(self, feature:tuple[float] = None, response:tuple[float] = None) -> bool:
         """
         @brief Fit the linear regression model
-        @param feature -> tuple[float] | None | continuous | the independent variable
+        @param feature -> tuple[float] | None | continuous | the independent variables, (observations,) | (observations, features)
         @param response -> tuple[float] | None | continuous | the dependent variable
-        @return (None)
+        @return (bool): True if the model was fitted, False if the feature or response is not set
+
+        @details
+        The scaler fitted on the training split is kept for predict, an online regression is stopped
+        slope is one coefficient per scaled feature, a float for a single feature
+        p_value and std_err are from ordinary least squares on every observation
         """
         #feature is set
         if not feature is None:
@@ -194,38 +235,435 @@ class Regression:
         #ignore if feature is not set
         if self.regression["feature"] is None or self.regression["response"] is None:
             return False
-        
+
+        X = np.asarray(self.feature, dtype=float)
+        X = X.reshape(-1, 1) if X.ndim == 1 else X
+        y = np.asarray(self.response, dtype=float).ravel()
+        if X.shape[0] != y.shape[0]:
+            raise ValueError("The feature and the response must have the same observations")
+
         #simple random sampling
-        X_train, X_test, y_train, y_test = train_test_split(
-            np.array(self.feature).reshape(-1, 1), 
-            np.array(self.response).reshape(-1, 1), 
-            test_size=0.2, 
-            random_state=0
-        )
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=0)
 
         #normalize
-        scaler = StandardScaler()
-        X_train, X_test = scaler.fit_transform(X_train), scaler.transform(X_test)
-            
+        self._online = None
+        self._scaler = StandardScaler()
+        X_train, X_test = self._scaler.fit_transform(X_train), self._scaler.transform(X_test)
+
         #model fitting
         self.model.fit(X_train, y_train)
 
         #model evaluation
-        self.regression["slope"] = self.model.coef_[0][0]
-        self.regression["intercept"] = self.model.intercept_[0]
+        single = X.shape[1] == 1
+        self.regression["slope"] = self.model.coef_[0] if single else self.model.coef_.copy()
+        self.regression["intercept"] = self.model.intercept_
         self.regression["predictions"] = self.model.predict(X_test)
         self.regression["mean_squared_error"] = mean_squared_error(y_test, self.predictions)
         self.regression["r_squared"] = r2_score(y_test, self.predictions)
-        self.regression["p_value"] = st.linregress(self.feature, self.response).pvalue
-        self.regression["std_err"] = st.linregress(self.feature, self.response).stderr
-        self.regression["residuals"] = y_test - self.predictions
+        p_value, std_err = self._inference(X, y)
+        self.regression["p_value"] = p_value[0] if single else p_value
+        self.regression["std_err"] = std_err[0] if single else std_err
+        self.regression["residuals"] = y_test - self.regression["predictions"]
         return True
-        
+
+    def cross_validate(self, feature:tuple[float] = None, response:tuple[float] = None,
+                       cv:CrossValidation = None, **options) -> dict:
+        """
+        @brief Cross validate the linear regression model
+        @param feature -> tuple[float] | None | continuous | the independent variables
+        @param response -> tuple[float] | None | continuous | the dependent variable
+        @param cv -> CrossValidation | None | reuse an engine and its cached folds
+        @param options -> dict | arguments of CrossValidation when cv is None, e.g. scheme="walk_forward" | not both
+        @return (dict): mean_squared_error | r_squared | fit_time | score_time -> one value per fold | mean | folds
+
+        @details
+        The results are also kept in regression["cross_validation"]
+        """
+        if not feature is None:
+            self.regression["feature"] = feature
+        if not response is None:
+            self.regression["response"] = response
+        if self.regression["feature"] is None or self.regression["response"] is None:
+            raise ValueError("The feature and the response must be set")
+
+        if not cv is None and options:
+            raise ValueError("Pass either cv or the arguments of CrossValidation, not both")
+        cv = CrossValidation(**options) if cv is None else cv
+        scores = cv.evaluate(self.model, self.feature, self.response, {
+            "mean_squared_error": mean_squared_error,
+            "r_squared": r2_score
+        })
+        self.regression["cross_validation"] = scores
+        return scores
+
+    def predict(self, feature, chunk_size:int = 1 << 20, workers:int = None) -> np.ndarray:
+        """
+        @brief Predict the dependent variable for many observations
+        @param feature -> array | (observations,) | (observations, features) | unscaled
+        @param chunk_size -> int | 1 << 20 | the observations per chunk
+        @param workers -> int | None | threads for the chunks, None runs them in this thread
+        @return (np.ndarray): The predictions, (observations,)
+
+        @details
+        The scaler is folded into the coefficients once, w = coef / scale | b = intercept - (mean / scale) . coef
+        An online regression predicts with its current coefficients, already on the unscaled feature
+        Every chunk is one matrix-vector product written into a preallocated output
+        No scaled copy of the feature is made, memory-mapped features are read chunk by chunk
+
+        @note
+        Time: O(observations * features)
+        Space: O(observations) for the output
+        """
+        if self._scaler is None and self._online is None:
+            raise ValueError("The model must be fitted")
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive")
+
+        X = np.asarray(feature)
+        X = X.reshape(-1, 1) if X.ndim == 1 else X
+        weights, bias = self._weights()
+        if X.shape[1] != weights.shape[0]:
+            raise ValueError(f"The feature must have {weights.shape[0]} columns")
+
+        output = np.empty(X.shape[0])
+        def predict_chunk(start:int) -> None:
+            stop = min(start + chunk_size, X.shape[0])
+            np.dot(X[start:stop], weights, out=output[start:stop])
+            output[start:stop] += bias
+
+        starts = range(0, X.shape[0], chunk_size)
+        if workers is None or workers <= 1 or len(starts) <= 1:
+            for start in starts:
+                predict_chunk(start)
+        else:
+            #numpy releases the gil in the products
+            with ThreadPoolExecutor(max_workers=workers) as threads:
+                list(threads.map(predict_chunk, starts))
+        return output
+
+    def fit_batch(self, feature, response, residuals:bool = True) -> dict:
+        """
+        @brief Fit simple linear regressions for many feature | response pairs at once
+        @param feature -> array | (pairs, observations) | (observations,) shared by every pair
+        @param response -> array | (pairs, observations)
+        @param residuals -> bool | True | compute the residuals, (pairs, observations)
+        @return (dict): slope | intercept | r_squared | p_value | std_err | intercept_std_err | count | residuals
+
+        @details
+        Ordinary least squares on all the observations, no split and no scaling
+        An observation is missing if the feature or the response is nan, every pair is fitted on its own valid observations
+        Pairs with less than three valid observations are nan
+        Matches st.linregress for every pair, in one vectorized pass
+        The results are also kept in regression["batch"]
+
+        @note
+        Time: O(pairs * observations)
+        Space: O(pairs * observations)
+        """
+        y = np.atleast_2d(np.asarray(response, dtype=float))
+        x = np.asarray(feature, dtype=float)
+        if x.ndim == 1:
+            x = x[None, :]
+        if x.shape[-1] != y.shape[-1] or x.shape[0] not in (1, y.shape[0]):
+            raise ValueError("The feature and the response must have the same observations")
+
+        if y.shape[-1] < 3:
+            raise ValueError("At least three observations are required")
+
+        #sufficient statistics of the valid observations of every pair
+        x = np.broadcast_to(x, y.shape)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        n = valid.sum(axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_mean = np.where(valid, x, 0).sum(axis=-1) / n
+            y_mean = np.where(valid, y, 0).sum(axis=-1) / n
+        x_centered = np.where(valid, x - x_mean[:, None], 0)
+        y_centered = np.where(valid, y - y_mean[:, None], 0)
+        sxx = np.einsum("ij,ij->i", x_centered, x_centered)
+        syy = np.einsum("ij,ij->i", y_centered, y_centered)
+        sxy = np.einsum("ij,ij->i", x_centered, y_centered)
+
+        df = np.where(n > 2, n - 2, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = sxy / sxx
+            intercept = y_mean - slope * x_mean
+            r = np.clip(sxy / np.sqrt(sxx * syy), -1, 1)
+            r[(sxx == 0) | (syy == 0)] = 0.0
+            t = r * np.sqrt(df / ((1 - r) * (1 + r)))
+            std_err = np.sqrt((1 - r ** 2) * syy / sxx / df)
+        p_value = 2 * st.t.sf(np.abs(t), df)
+
+        few = n < 3
+        for values in (slope, intercept, r, p_value, std_err):
+            values[few] = np.nan
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            intercept_std_err = std_err * np.sqrt(sxx / n + x_mean ** 2)
+        batch = {
+            "slope": slope,
+            "intercept": intercept,
+            "r_squared": r ** 2,
+            "p_value": p_value,
+            "std_err": std_err,
+            "intercept_std_err": intercept_std_err,
+            "count": n,
+            "residuals": y - (intercept[:, None] + slope[:, None] * x) if residuals else None
+        }
+        self.regression["batch"] = batch
+        return batch
+
+    def fit_rolling(self, feature, response, window:int) -> dict:
+        """
+        @brief Fit a simple linear regression over every trailing window
+        @param feature -> array | (pairs, observations) | (observations,) shared by every pair
+        @param response -> array | (pairs, observations)
+        @param window -> int | the observations per regression, e.g. 60 | 120 | 252
+        @return (dict): slope | intercept | r_squared | std_err, each (pairs, observations)
+
+        @details
+        Entry t is the regression over observations t - window + 1 .. t, nan before the first full window
+        An observation is missing if the feature or the response is nan, only windows holding one are nan
+        Pairs with different histories, e.g. symbols listed at different dates, are fitted in one call
+        Matches fit_batch on every window, for every pair in one vectorized pass
+        The results are also kept in regression["rolling"]
+
+        @example
+        Rolling beta and alpha of symbols against an index
+        rolling = model.fit_rolling(index_returns, symbol_returns, 252)
+        rolling["slope"], rolling["intercept"]
+
+        @note
+        Time: O(pairs * observations), independent of the window
+        Space: O(pairs * observations)
+        """
+        y = np.atleast_2d(np.asarray(response, dtype=float))
+        x = np.asarray(feature, dtype=float)
+        if x.ndim == 1:
+            x = x[None, :]
+        if x.shape[-1] != y.shape[-1] or x.shape[0] not in (1, y.shape[0]):
+            raise ValueError("The feature and the response must have the same observations")
+        if not 3 <= window <= y.shape[-1]:
+            raise ValueError("The window must be within 3 and the number of observations")
+
+        #centered cumulative sums over the valid observations, shifted back after the window sums
+        x = np.broadcast_to(x, y.shape)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        count = np.maximum(valid.sum(axis=-1, keepdims=True), 1)
+        x_shift = np.where(valid, x, 0).sum(axis=-1, keepdims=True) / count
+        y_shift = np.where(valid, y, 0).sum(axis=-1, keepdims=True) / count
+        x = np.where(valid, x - x_shift, 0)
+        y = np.where(valid, y - y_shift, 0)
+
+        def window_sum(values:np.ndarray) -> np.ndarray:
+            total = np.cumsum(values, axis=-1)
+            total[:, window:] = total[:, window:] - total[:, :-window]
+            return total[:, window - 1:]
+
+        complete = window_sum(valid.astype(np.int64)) == window
+        sx = window_sum(x)
+        sy = window_sum(y)
+        sxx = window_sum(x * x) - sx * sx / window
+        syy = window_sum(y * y) - sy * sy / window
+        sxy = window_sum(x * y) - sx * sy / window
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = sxy / sxx
+            x_mean = sx / window + x_shift
+            intercept = sy / window + y_shift - slope * x_mean
+            r_squared = np.clip(sxy * sxy / (sxx * syy), 0, 1)
+            r_squared[(sxx <= 0) | (syy <= 0)] = 0.0
+            std_err = np.sqrt(np.maximum(syy - slope * sxy, 0) / (window - 2) / sxx)
+
+        rolling = {}
+        for name, values in (("slope", slope), ("intercept", intercept), ("r_squared", r_squared), ("std_err", std_err)):
+            series = np.full(y.shape, np.nan)
+            series[:, window - 1:] = np.where(complete, values, np.nan)
+            rolling[name] = series
+        self.regression["rolling"] = rolling
+        return rolling
+
+    def online(self, n_features:int = 1, forgetting:float = 1.0, delta:float = 1e4) -> None:
+        """
+        @brief Start an online regression
+        @param n_features -> int | 1 | the number of independent variables
+        @param forgetting -> float | 1.0 | lambda within (0, 1] | weight of an observation decays by lambda per update
+        @param delta -> float | 1e4 | initial P = delta * I | larger trusts the first observations more
+        @return (None)
+
+        @details
+        The coefficients start at zero and are updated by update
+        Coefficients are on the unscaled feature, no split and no scaler
+        predict uses the online coefficients until fit is called again
+        """
+        if n_features < 1 or not 0 < forgetting <= 1 or delta <= 0:
+            raise ValueError("n_features and delta must be positive, forgetting within (0, 1]")
+
+        size = n_features + 1
+        self._online = {
+            "theta": np.zeros(size),
+            "P": np.eye(size) * delta,
+            "forgetting": forgetting,
+            "count": 0,
+            "weight": 0.0,
+            "prequential_sse": 0.0,
+            "zz": np.zeros((size, size)),
+            "zy": np.zeros(size),
+            "sum_y": 0.0,
+            "sum_yy": 0.0
+        }
+
+    def update(self, feature, response:float) -> float:
+        """
+        @brief Update the online regression with one observation
+        @param feature -> float | tuple[float] | the independent variables of the observation
+        @param response -> float | the dependent variable of the observation
+        @return (float): The a priori error, the response minus its prediction before the update
+
+        @details
+        Keeps slope, intercept, mean_squared_error and r_squared of regression up to date
+        mean_squared_error | r_squared -> in-sample fit of the current coefficients on every observation
+            sse = y^T y - 2 theta^T Z^T y + theta^T Z^T Z theta, from the weighted sums kept per update
+        prequential_mean_squared_error -> mean of the a priori errors, each scored before its update
+        Every sum is weighted by the forgetting factor
+
+        @note
+        Time: O(p^2)
+        Space: O(p^2)
+        """
+        if self._online is None:
+            self.online(np.size(feature))
+
+        state = self._online
+        z = np.concatenate(([1.0], np.ravel(np.asarray(feature, dtype=float))))
+        if z.size != state["theta"].size:
+            raise ValueError("The observation must have n_features independent variables")
+
+        forgetting = state["forgetting"]
+        Pz = state["P"] @ z
+        gain = Pz / (forgetting + z @ Pz)
+        error = float(response - state["theta"] @ z)
+        state["theta"] += gain * error
+        state["P"] = (state["P"] - np.outer(gain, Pz)) / forgetting
+
+        #weighted sufficient statistics
+        state["count"] += 1
+        state["weight"] = forgetting * state["weight"] + 1
+        state["prequential_sse"] = forgetting * state["prequential_sse"] + error * error
+        state["zz"] = forgetting * state["zz"] + np.outer(z, z)
+        state["zy"] = forgetting * state["zy"] + z * response
+        state["sum_y"] = forgetting * state["sum_y"] + response
+        state["sum_yy"] = forgetting * state["sum_yy"] + response * response
+
+        theta = state["theta"]
+        sse = state["sum_yy"] - 2 * theta @ state["zy"] + theta @ state["zz"] @ theta
+        mse = max(sse, 0.0) / state["weight"]
+        variance = state["sum_yy"] / state["weight"] - (state["sum_y"] / state["weight"]) ** 2
+        self.regression["slope"] = theta[1] if theta.size == 2 else theta[1:].copy()
+        self.regression["intercept"] = theta[0]
+        self.regression["mean_squared_error"] = mse
+        self.regression["r_squared"] = 1 - mse / variance if variance > 0 else None
+        self.regression["prequential_mean_squared_error"] = state["prequential_sse"] / state["weight"]
+        return error
+
+    def update_batch(self, feature, response) -> np.ndarray:
+        """
+        @brief Update the online regression with observations in order
+        @param feature -> array | (observations,) | (observations, n_features)
+        @param response -> array | (observations,)
+        @return (np.ndarray): The a priori errors
+        """
+        feature = np.asarray(feature, dtype=float)
+        response = np.asarray(response, dtype=float)
+        if feature.ndim == 1:
+            feature = feature[:, None]
+        return np.array([self.update(x, y) for x, y in zip(feature, response)])
+
+    def save(self, file_name:str, metadata:dict = None) -> None:
+        """
+        @brief Save the fitted model
+        @param file_name -> str | the path to the file
+        @param metadata -> dict | None | values kept with the model, e.g. symbol
+        @return (None)
+
+        @details
+        Keeps the estimator, the scaler, the online state and the fitted values
+        The feature and response are not saved
+        """
+        values = {name: self.regression.get(name) for name in self._saved}
+        PersistenceMgmt.save(file_name, type(self).__name__, {
+            "model": self.model,
+            "scaler": self._scaler,
+            "online": self._online,
+            "regression": values
+        }, metadata)
+
+    @classmethod
+    def load(cls, file_name:str, mmap:bool = True) -> "Regression":
+        """
+        @brief Load a saved model
+        @param file_name -> str | the path to the file
+        @param mmap -> bool | True | map the arrays read-only instead of reading them
+        @return (Regression): The model, ready to predict | metadata in regression["metadata"]
+        """
+        payload = PersistenceMgmt.load(file_name, cls.__name__, mmap)
+        state = payload["state"]
+        regression = cls()
+        regression._model = state["model"]
+        regression._scaler = state["scaler"]
+        if state["online"] is not None:
+            #updated in place, never mapped
+            regression._online = {name: np.array(value) if isinstance(value, np.ndarray) else value
+                                  for name, value in state["online"].items()}
+        regression.regression.update(state["regression"])
+        regression.regression["metadata"] = payload["metadata"]
+        return regression
+
     def prediction(self, feature:tuple[float]) -> float:
         """
         @brief Predict the dependent variable
-        @param feature -> tuple[float] | continuous | the independent variable
+        @param feature -> tuple[float] | continuous | the independent variables of one observation
         @return (float): The predicted dependent variable
         """
-        return self.model.predict(np.array(self.feature).reshape(-1, 1))[0][0]
-    
+        return float(self.predict(np.asarray(feature, dtype=float).reshape(1, -1))[0])
+
+    def _weights(self) -> tuple:
+        """
+        @brief Fold the scaler into the coefficients
+        @return (tuple): weights -> (features,) | bias -> float, on the unscaled feature
+        """
+        #online coefficients are not scaled
+        if not self._online is None:
+            theta = self._online["theta"]
+            return theta[1:].copy(), float(theta[0])
+
+        scale = self._scaler.scale_
+        weights = self.model.coef_.ravel() / scale
+        bias = float(self.model.intercept_ - self._scaler.mean_ @ weights)
+        return weights, bias
+
+    @staticmethod
+    def _inference(X:np.ndarray, y:np.ndarray) -> tuple:
+        """
+        @brief Test the coefficients of ordinary least squares
+        @param X -> np.ndarray | (observations, features)
+        @param y -> np.ndarray | (observations,)
+        @return (tuple): p_value | std_err, one per feature
+
+        @details
+        cov = sigma^2 (Z^T Z)^-1 with Z = [1, X] | sigma^2 = rss / (n - features - 1)
+        t = coefficient / std_err, two-sided | matches st.linregress for a single feature
+        """
+        Z = np.column_stack((np.ones(X.shape[0]), X))
+        df = Z.shape[0] - Z.shape[1]
+        if df < 1:
+            nan = np.full(X.shape[1], np.nan)
+            return nan, nan.copy()
+
+        coefficients, _, _, _ = np.linalg.lstsq(Z, y, rcond=None)
+        residuals = y - Z @ coefficients
+        sigma = residuals @ residuals / df
+        covariance = sigma * np.linalg.pinv(Z.T @ Z)
+        std_err = np.sqrt(np.diag(covariance)[1:])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = coefficients[1:] / std_err
+        return 2 * st.t.sf(np.abs(t), df), std_err
@@ -6,11 +6,24 @@
 @brief support vector machine
 
 @dependencies
+concurrent.futures -> ProcessPoolExecutor
+joblib -> Parallel | delayed
+math -> ceil
 numpy -> np
-sklearn -> svm | metrics | model_selection | preprocessing
-metrics -> accuracy_score | classification_report | confusion_matrix
-model_selection -> train_test_split
+sklearn -> svm | exceptions | kernel_approximation | linear_model | metrics | model_selection | pipeline | preprocessing
+exceptions -> ConvergenceWarning
+kernel_approximation -> Nystroem | RBFSampler
+linear_model -> SGDClassifier
+metrics -> accuracy_score | classification_report | confusion_matrix | pairwise_kernels
+model_selection -> ParameterGrid | train_test_split
+pipeline -> make_pipeline
 preprocessing -> StandardScaler
+time -> perf_counter
+warnings
+include -> cross_validation
+cross_validation -> CrossValidation
+utils -> persistence_mgmt
+persistence_mgmt -> PersistenceMgmt
 
 @details
 Set of related algorithms for supervised learning problems
@@ -50,13 +63,91 @@ Set of related algorithms for supervised learning problems
     8. non-linear regression
     9. uses classification algorithms for two-group classification problems
     10. inefficient for large datasets
+    11. streaming -> large datasets
+        1. linear max-margin classifier | hinge loss minimized by stochastic gradient descent
+        2. chunks of rows are read one at a time, memory is O(chunk)
+        3. online scaler -> running mean and variance updated by every chunk
+        4. early stopping -> accuracy on a validation stream, stops after patience checks without improvement
+    12. kernel approximation -> non-linear boundaries on large datasets
+        1. explicit feature map z(x) with z(x) . z(y) ~ exp(-gamma |x - y|^2)
+        2. nystroem -> kernel columns of n_components sampled rows | adapts to the data
+        3. rff -> random fourier features | n_components random cosines | independent of the data
+        4. linear support vector machine on the mapped features
+        5. fit -> O(samples * n_components^2) instead of O(samples^2) to O(samples^3) for the exact kernel
+    13. tuning -> successive halving
+        1. every candidate is fitted on a small budget of training rows, the best 1 / factor move on
+        2. the budget grows by factor every rung until the best candidate is fitted on every row
+        3. budgets are nested -> the rows of a rung are the first rows of the next
+        4. kernel matrices are computed once per kernel | gamma and shared by every C
+        5. a larger budget extends the cached kernel matrix with the new rows only
+    14. evaluation
+        1. every fit increments the version of the model
+        2. metrics are computed on first access from the test split and memoized per version
+        3. scoring and decision values of large sets are computed in chunks | O(chunk) memory
 """
 #imports
+from concurrent.futures import ProcessPoolExecutor
+from joblib import Parallel, delayed
+from math import ceil
 import numpy as np
 from sklearn import svm
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from sklearn.model_selection import train_test_split
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, classification_report, confusion_matrix, pairwise_kernels
+from sklearn.model_selection import ParameterGrid, train_test_split
+from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import StandardScaler
+from time import perf_counter
+import warnings
+from include.cross_validation import CrossValidation
+from utils.persistence_mgmt import PersistenceMgmt
+
+#functions
+def _error(y_true:np.ndarray, y_pred:np.ndarray) -> float:
+    return 1 - accuracy_score(y_true, y_pred)
+
+#model of a scoring worker, sent once by _score_init
+_scoring:dict = {}
+
+def _count_correct(model, scaler:StandardScaler, X:np.ndarray, y:np.ndarray) -> int:
+    """
+    @brief Count the correct predictions of a chunk
+    @param model: The fitted model
+    @param scaler (StandardScaler): The scaler of the model, None for unscaled models
+    @param X (np.ndarray): The independent variable of the chunk
+    @param y (np.ndarray): The dependent variable of the chunk
+    @return (int): The correct predictions
+    """
+    X = X if scaler is None else scaler.transform(X)
+    return int((model.predict(X) == y).sum())
+
+def _score_init(model, scaler:StandardScaler) -> None:
+    _scoring["model"] = model
+    _scoring["scaler"] = scaler
+
+def _score_chunk(X:np.ndarray, y:np.ndarray) -> int:
+    return _count_correct(_scoring["model"], _scoring["scaler"], X, y)
+
+def _fit_kernel(K_train:np.ndarray, y_train:np.ndarray, K_validation:np.ndarray, y_validation:np.ndarray,
+                values:list, max_iter:int) -> list:
+    """
+    @brief Fit support vector machines on a precomputed kernel
+    @param K_train (np.ndarray): (samples, samples) kernel of the training rows
+    @param y_train (np.ndarray): The training responses
+    @param K_validation (np.ndarray): (validation, samples) kernel of the validation rows
+    @param y_validation (np.ndarray): The validation responses
+    @param values (list): The C of every fit
+    @param max_iter (int): The solver iterations of a fit, a fit that does not converge keeps its iterate
+    @return (list): The validation accuracy of every C
+    """
+    scores = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        for C in values:
+            model = svm.SVC(kernel="precomputed", C=C, max_iter=max_iter).fit(K_train, y_train)
+            scores.append(accuracy_score(y_validation, model.predict(K_validation)))
+    return scores
 
 #class
 class SupportVectorMachine:
@@ -68,6 +159,24 @@ class SupportVectorMachine:
     @param classification_report -> dict | the classification report
     @details
     """
+    #fitted values kept by save
+    _saved:tuple = ("accuracy", "error", "classification_report", "confusion_matrix")
+
+    #candidates of tune
+    _grid:dict = {
+        "kernel": ["rbf", "linear"],
+        "C": [0.01, 0.1, 1.0, 10.0, 100.0, 1000.0],
+        "gamma": ["scale", 0.001, 0.01, 0.1, 1.0]
+    }
+
+    #parameters used by each kernel, the others do not make a new candidate
+    _kernel_parameters:dict = {
+        "linear": (),
+        "rbf": ("gamma",),
+        "poly": ("gamma", "degree", "coef0"),
+        "sigmoid": ("gamma", "coef0")
+    }
+
     def __init__(self):
         self._machines:dict = {
             "feature":None,
@@ -78,13 +187,23 @@ class SupportVectorMachine:
             "classification_report":None,
             "confusion_matrix":None
         }
+        self._parameters:dict = {}
         self._model = svm.SVC()
+        self._mode:str = "exact"
+        self._scaler:StandardScaler = None
+        self._version:int = 0
+        self._data_version:int = 0
+        self._evaluation:dict = None
+        self._metrics:dict = {}
 
     @property
     def machines(self) -> dict:
         """
         @brief Get the support vector machines values
         @return (dict): The support vector machines values
+        @details
+        accuracy | error | classification_report | confusion_matrix are lazy
+        They are None until read through their property, or save, after every fit
         """
         return self._machines
     
@@ -118,7 +237,7 @@ class SupportVectorMachine:
         @brief Get the accuracy
         @return (float): The accuracy
         """
-        return self.machines["accuracy"]
+        return self._metric("accuracy")
     
     @property
     def classification_report(self) -> dict:
@@ -126,7 +245,7 @@ class SupportVectorMachine:
         @brief Get the classification report
         @return (dict): The classification report
         """
-        return self.machines["classification_report"]
+        return self._metric("classification_report")
     
     @property
     def confusion_matrix(self) -> dict:
@@ -134,7 +253,7 @@ class SupportVectorMachine:
         @brief Get the confusion matrix
         @return (dict): The confusion matrix
         """
-        return self.machines["confusion_matrix"]
+        return self._metric("confusion_matrix")
     
     @property
     def error(self) -> float:
@@ -142,15 +261,47 @@ class SupportVectorMachine:
         @brief Get the error
         @return (float): The error
         """
-        return self.machines["error"]
+        return self._metric("error")
     
     @property
     def model(self) -> svm.SVC:
         """
         @brief Get the model
-        @return (svm.SVC): The model
+        @return (svm.SVC): The model of the last fit, see mode
         """
         return self._model
+
+    @property
+    def mode(self) -> str:
+        """
+        @brief Get the kind of the last fit
+        @return (str): exact -> svm.SVC | stream -> SGDClassifier | approximate -> feature map and svm.LinearSVC
+        """
+        return self._mode
+
+    @property
+    def parameters(self) -> dict:
+        """
+        @brief Get the parameters of the svm.SVC fitted by fit, set by tune
+        @return (dict): The parameters, empty for the defaults
+        """
+        return self._parameters
+
+    @property
+    def scaler(self) -> StandardScaler:
+        """
+        @brief Get the scaler fitted on the training split
+        @return (StandardScaler): The scaler, None before fit
+        """
+        return self._scaler
+
+    @property
+    def version(self) -> int:
+        """
+        @brief Get the version of the fitted model
+        @return (int): The number of fits, the metrics are memoized per version
+        """
+        return self._version
     
     def fit(self, feature:tuple[float] = None, response:tuple[float] = None
             , test_size:float=0.2, random_state:int=0) -> bool:
@@ -160,12 +311,10 @@ class SupportVectorMachine:
         @param response (tuple[float]): The dependent variable
         @param test_size (float): The test size
         @param random_state (int): The random state
+        @details
+        Always fits a new svm.SVC with parameters, whatever the mode of the last fit
         """
-        if not feature is None:
-            self.machines["feature"] = feature
-
-        if not response is None:
-            self.machines["response"] = response
+        self._set_data(feature, response)
 
         if self.feature is None or self.response is None:
             return False
@@ -176,37 +325,580 @@ class SupportVectorMachine:
         )
         
         #scale the features
-        scaler = StandardScaler()
-        X_train = scaler.fit_transform(X_train)
-        X_test = scaler.transform(X_test)
+        self._scaler = StandardScaler()
+        X_train = self._scaler.fit_transform(X_train)
+        X_test = self._scaler.transform(X_test)
 
         #fit the model
+        self._model = svm.SVC(**self._parameters)
+        self._mode = "exact"
+        start = perf_counter()
         self.model.fit(X_train, y_train)
+        self.machines["fit_time"] = perf_counter() - start
 
-        #process
-        self.machines["prediction"] = self.model.predict(X_test)
+        self._evaluate(X_test, y_test)
+        return True
+
+    def fit_approximate(self, feature:tuple[float] = None, response:tuple[float] = None,
+                        method:str = "nystroem", n_components:int = 500, n_samples:int = None,
+                        gamma:float = None, C:float = 1.0, test_size:float = 0.2, random_state:int = 0) -> bool:
+        """
+        @brief Fit a support vector machine on an approximate rbf kernel
+        @param feature (tuple[float]): The independent variable
+        @param response (tuple[float]): The dependent variable
+        @param method (str): nystroem | rff
+        @param n_components (int): The dimension of the feature map
+        @param n_samples (int): The training rows used, None uses every row of the training split
+        @param gamma (float): The rbf kernel width, None matches svm.SVC gamma="scale" on scaled features
+        @param C (float): The regularization, smaller widens the margin
+        @param test_size (float): The test size
+        @param random_state (int): The random state
+        @return (bool): True if the model was fitted
+        @details
+        The model becomes a pipeline of the feature map and a linear support vector machine, mode -> approximate
+        A later fit, tune or cross_validate uses an svm.SVC again
+        Evaluated on the test split like fit | settings and fit time in machines["approximate"]
+        """
+        if method not in ("nystroem", "rff"):
+            raise ValueError("The method must be nystroem or rff")
+        self._set_data(feature, response)
+        if self.feature is None or self.response is None:
+            return False
 
-        #evaluate
-        self.machines["accuracy"] = accuracy_score(y_test, self.prediction)
-        self.machines["classification_report"] = classification_report(y_test, self.prediction)
-        self.machines["confusion_matrix"] = confusion_matrix(y_test, self.prediction)
-        self.machines["error"] = 1 - self.accuracy
+        X_train, X_test, y_train, y_test = train_test_split(
+            np.asarray(self.feature, dtype=float), np.asarray(self.response).ravel(),
+            test_size=test_size, random_state=random_state
+        )
+        if not n_samples is None and n_samples < X_train.shape[0]:
+            rows = np.random.default_rng(random_state).choice(X_train.shape[0], n_samples, replace=False)
+            X_train, y_train = X_train[rows], y_train[rows]
+
+        self._scaler = StandardScaler()
+        X_train = self._scaler.fit_transform(X_train)
+        X_test = self._scaler.transform(X_test)
+
+        gamma = 1.0 / X_train.shape[1] if gamma is None else gamma
+        if method == "nystroem":
+            mapping = Nystroem(gamma=gamma, n_components=min(n_components, X_train.shape[0]), random_state=random_state)
+        else:
+            mapping = RBFSampler(gamma=gamma, n_components=n_components, random_state=random_state)
+        #the dual solver converges faster on the dense mapped features
+        self._model = make_pipeline(mapping, svm.LinearSVC(C=C, dual=True))
+        self._mode = "approximate"
+
+        start = perf_counter()
+        self.model.fit(X_train, y_train)
+        self.machines["fit_time"] = perf_counter() - start
+        self.machines["approximate"] = {
+            "method": method,
+            "n_components": n_components,
+            "n_samples": X_train.shape[0],
+            "gamma": gamma,
+            "fit_time": self.machines["fit_time"]
+        }
+        self._evaluate(X_test, y_test)
         return True
+
+    def benchmark(self, feature:tuple[float] = None, response:tuple[float] = None,
+                  sizes:tuple = (1000, 5000, 20000, 100000), exact_limit:int = 20000,
+                  method:str = "nystroem", n_components:int = 500, random_state:int = 0) -> list:
+        """
+        @brief Compare the exact and the approximate kernel at increasing data sizes
+        @param feature (tuple[float]): The independent variable
+        @param response (tuple[float]): The dependent variable
+        @param sizes (tuple): The rows of every comparison, sampled without replacement
+        @param exact_limit (int): The largest size the exact kernel is fitted on, it grows quadratically or worse
+        @param method (str): nystroem | rff
+        @param n_components (int): The dimension of the feature map
+        @param random_state (int): The random state
+        @return (list): size | model -> exact | method | fit_time | accuracy, one row per fit
+        @details
+        Every fit uses its own SupportVectorMachine, this one is not refitted
+        fit_time is the estimator fit only, without the split, scaling and evaluation
+        The rows are also kept in machines["benchmark"]
+        @example
+        for row in SupportVectorMachine().benchmark(X, y):
+            print(row["size"], row["model"], row["fit_time"], row["accuracy"])
+        """
+        feature = np.asarray(self.feature if feature is None else feature, dtype=float)
+        response = np.asarray(self.response if response is None else response).ravel()
+        order = np.random.default_rng(random_state).permutation(feature.shape[0])
+
+        rows = []
+        for size in sizes:
+            if size > feature.shape[0]:
+                break
+            X, y = feature[order[:size]], response[order[:size]]
+            if size <= exact_limit:
+                exact = SupportVectorMachine()
+                exact.fit(X, y, random_state=random_state)
+                rows.append({"size": size, "model": "exact", "fit_time": exact.machines["fit_time"],
+                             "accuracy": exact.accuracy})
+
+            approximate = SupportVectorMachine()
+            approximate.fit_approximate(X, y, method=method, n_components=n_components, random_state=random_state)
+            rows.append({"size": size, "model": method, "fit_time": approximate.machines["fit_time"],
+                         "accuracy": approximate.accuracy})
+
+        self.machines["benchmark"] = rows
+        return rows
     
+    def tune(self, feature:tuple[float] = None, response:tuple[float] = None, grid:dict = None,
+             factor:int = 3, min_samples:int = 200, max_samples:int = 10000, test_size:float = 0.2,
+             max_iter:int = 100000, random_state:int = 0, workers:int = None, refit:bool = True,
+             max_validation:int = None) -> dict:
+        """
+        @brief Search the parameters of the support vector machine by successive halving
+        @param feature (tuple[float]): The independent variable
+        @param response (tuple[float]): The dependent variable
+        @param grid (dict): kernel | C | gamma | degree | coef0 -> values, None uses the default grid
+        @param factor (int): The budget grows and the candidates shrink by factor every rung
+        @param min_samples (int): The smallest budget, training rows of the first rung
+        @param max_samples (int): The largest budget, the cached kernels are (max_samples, max_samples)
+        @param test_size (float): The validation size
+        @param max_iter (int): The solver iterations of a candidate, ill-conditioned candidates stop early and score low
+        @param random_state (int): The random state
+        @param workers (int): The processes fitting kernel groups at once, None fits them in this process
+        @param refit (bool): True to fit the best parameters with fit
+        @param max_validation (int): The largest number of validation rows, None uses max_samples
+        @return (dict): best | accuracy | history -> rung | samples | candidates | fits
+        @details
+        The split is made and scaled once, every candidate is scored on the same validation rows
+        A larger validation split is subsampled to max_validation rows, the validation kernels stay bounded
+        Candidates sharing kernel parameters are fitted in one task on one precomputed kernel
+        gamma "scale" is resolved on the scaled training rows, like svm.SVC
+        The kernel matrices are memory-mapped to the workers by joblib
+        The results are also kept in machines["tune"]
+        @example
+        machine.tune(X, y, {"kernel": ["rbf"], "C": [0.1, 1, 10], "gamma": [0.01, 0.1, 1]}, workers=4)
+        @note
+        Time: O(candidates * min_samples^2) + ... + O(max_samples^2 * features) per surviving kernel
+        Space: O(max_samples * (max_samples + max_validation)) per surviving kernel, independent of the rows
+        """
+        if factor < 2:
+            raise ValueError("The factor must be at least 2")
+        self._set_data(feature, response)
+        if self.feature is None or self.response is None:
+            raise ValueError("The feature and the response must be set")
+
+        X_train, X_validation, y_train, y_validation = train_test_split(
+            np.asarray(self.feature, dtype=float), np.asarray(self.response).ravel(),
+            test_size=test_size, random_state=random_state
+        )
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+
+        #bounded validation rows, every validation kernel is (max_validation, samples)
+        max_validation = max_samples if max_validation is None else max_validation
+        if max_validation < 1:
+            raise ValueError("The validation rows must be positive")
+        if X_validation.shape[0] > max_validation:
+            rows = np.random.default_rng(random_state).choice(X_validation.shape[0], max_validation, replace=False)
+            X_validation, y_validation = X_validation[rows], y_validation[rows]
+        X_validation = scaler.transform(X_validation)
+
+        #nested budgets, the first rows of a random order
+        order = np.random.default_rng(random_state).permutation(X_train.shape[0])[:max_samples]
+        X_train, y_train = X_train[order], y_train[order]
+        scale = float(1.0 / (X_train.shape[1] * X_train.var())) if X_train.var() > 0 else 1.0
+
+        #candidates grouped by kernel parameters
+        groups = {}
+        for candidate in ParameterGrid(grid or self._grid):
+            candidate = dict(candidate)
+            C = candidate.pop("C", 1.0)
+            if candidate.get("gamma") == "scale":
+                candidate["gamma"] = scale
+            kernel = candidate.get("kernel", "rbf")
+            candidate = {name: value for name, value in candidate.items()
+                         if name == "kernel" or name in self._kernel_parameters.get(kernel, ())}
+            key = tuple(sorted(candidate.items()))
+            groups.setdefault(key, [])
+            if C not in groups[key]:
+                groups[key].append(C)
+        alive = [(key, C) for key, values in groups.items() for C in values]
+
+        rungs = 1
+        while len(alive) > factor ** (rungs - 1):
+            rungs += 1
+        budgets = [max(min(min_samples, X_train.shape[0]), X_train.shape[0] // factor ** (rungs - 1 - rung))
+                   for rung in range(rungs)]
+
+        kernels = {}
+        history = []
+        fits = 0
+        with Parallel(n_jobs=workers) as parallel:
+            for rung, samples in enumerate(budgets):
+                keys = list(dict.fromkeys(key for key, _ in alive))
+                for key in keys:
+                    kernels[key] = self._extend_kernel(kernels.get(key), dict(key), X_train, X_validation, samples)
+
+                values = {key: [C for other, C in alive if other == key] for key in keys}
+                tasks = [delayed(_fit_kernel)(kernels[key][0], y_train[:samples], kernels[key][1], y_validation,
+                                              values[key], max_iter) for key in keys]
+                #a single group is not worth shipping its kernel to a worker
+                results = parallel(tasks) if len(keys) > 1 else [function(*args, **kwargs) for function, args, kwargs in tasks]
+                scores = [(key, C, score) for key, result in zip(keys, results) for C, score in zip(values[key], result)]
+                fits += len(scores)
+                scores.sort(key=lambda item: -item[2])
+                history.append({
+                    "rung": rung,
+                    "samples": samples,
+                    "candidates": [{**dict(key), "C": C, "accuracy": score} for key, C, score in scores]
+                })
+
+                alive = [(key, C) for key, C, _ in scores[:max(1, ceil(len(scores) / factor))]]
+                for key in list(kernels):
+                    if key not in {other for other, _ in alive}:
+                        del kernels[key]
+
+        key, C, accuracy = scores[0]
+        best = {**dict(key), "C": C}
+        tune = {"best": best, "accuracy": accuracy, "history": history, "fits": fits,
+                "grid_size": sum(len(values) for values in groups.values())}
+        self.machines["tune"] = tune
+
+        if refit:
+            self._parameters = best
+            self.fit(random_state=random_state, test_size=test_size)
+        return tune
+
+    @staticmethod
+    def _extend_kernel(cached:tuple, parameters:dict, X_train:np.ndarray, X_validation:np.ndarray,
+                       samples:int) -> tuple:
+        """
+        @brief Extend the kernel matrices of a smaller budget to samples training rows
+        @param cached (tuple): (K_train, K_validation) of a smaller budget, None computes them
+        @param parameters (dict): kernel | gamma | degree | coef0
+        @param X_train (np.ndarray): The scaled training rows, budgets are their first rows
+        @param X_validation (np.ndarray): The scaled validation rows
+        @param samples (int): The budget
+        @return (tuple): K_train (samples, samples) | K_validation (validation, samples)
+        @details
+        Only the kernel of the new rows against every row is computed
+        """
+        kernel = parameters.get("kernel", "rbf")
+        options = {name: value for name, value in parameters.items() if name != "kernel"}
+        def compute(X:np.ndarray, Y:np.ndarray) -> np.ndarray:
+            return pairwise_kernels(X, Y, metric=kernel, filter_params=True, **options)
+
+        start = 0 if cached is None else cached[0].shape[0]
+        if start >= samples:
+            return cached
+
+        K_train = np.empty((samples, samples))
+        K_validation = np.empty((X_validation.shape[0], samples))
+        if start:
+            K_train[:start, :start] = cached[0]
+            K_validation[:, :start] = cached[1]
+        block = compute(X_train[start:samples], X_train[:samples])
+        K_train[start:samples] = block
+        K_train[:start, start:samples] = block[:, :start].T
+        K_validation[:, start:samples] = compute(X_validation, X_train[start:samples])
+        return K_train, K_validation
+
+    def cross_validate(self, feature:tuple[float] = None, response:tuple[float] = None,
+                       cv:CrossValidation = None, **options) -> dict:
+        """
+        @brief Cross validate the support vector machines
+        @param feature (tuple[float]): The independent variable
+        @param response (tuple[float]): The dependent variable
+        @param cv (CrossValidation): Reuse an engine and its cached folds
+        @param options (dict): Arguments of CrossValidation when cv is None, e.g. scheme="repeated", not both
+        @return (dict): accuracy | error | fit_time | score_time -> one value per fold | mean | folds
+        @details
+        The results are also kept in machines["cross_validation"]
+        """
+        self._set_data(feature, response)
+        if self.feature is None or self.response is None:
+            raise ValueError("The feature and the response must be set")
+
+        if not cv is None and options:
+            raise ValueError("Pass either cv or the arguments of CrossValidation, not both")
+        cv = CrossValidation(**options) if cv is None else cv
+        scores = cv.evaluate(svm.SVC(**self._parameters), self.feature, self.response, {
+            "accuracy": accuracy_score,
+            "error": _error
+        })
+        self.machines["cross_validation"] = scores
+        return scores
+
+    def fit_stream(self, chunks, validation = None, classes:tuple = None, alpha:float = 1e-4,
+                   epochs:int = 1, check_every:int = 10, patience:int = 3, tol:float = 1e-4,
+                   random_state:int = 0) -> bool:
+        """
+        @brief Fit a linear support vector machine on a stream of chunks
+        @param chunks (iterable | callable): (feature, response) chunks, a callable returns a new stream per epoch
+        @param validation (list | callable): (feature, response) chunks for early stopping, None disables it
+        @param classes (tuple): Every class of the response, None takes the classes of the first chunk
+        @param alpha (float): The regularization, larger widens the margin
+        @param epochs (int): The passes over the stream, more than one requires a callable
+        @param check_every (int): The training chunks between validation checks
+        @param patience (int): The checks without improvement before stopping
+        @param tol (float): The accuracy gain that counts as an improvement
+        @param random_state (int): The random state
+        @return (bool): True if any chunk was fitted
+        @details
+        The model becomes an SGDClassifier with hinge loss, the scaler an online scaler, mode -> stream
+        A later fit fits an svm.SVC again
+        Every chunk updates the scaler, then the model on the scaled chunk
+        The coefficients and the scaler statistics of the best validation check are kept together
+        accuracy | error -> best validation accuracy | machines["stream"] -> rows | chunks | history | stopped
+        @note
+        Time: O(rows * features * epochs)
+        Space: O(chunk * features)
+        """
+        if epochs > 1 and not callable(chunks):
+            raise ValueError("More than one epoch requires a callable returning a new stream")
+
+        model = SGDClassifier(loss="hinge", alpha=alpha, random_state=random_state)
+        scaler = StandardScaler()
+        classes = None if classes is None else np.asarray(classes)
+        stream = {"rows": 0, "chunks": 0, "history": [], "stopped": False}
+        best = {"accuracy": -np.inf, "coef": None, "intercept": None, "scaler": None}
+        statistics = ("mean_", "var_", "scale_", "n_samples_seen_")
+        waited = 0
+
+        for _ in range(epochs):
+            for X, y in (chunks() if callable(chunks) else chunks):
+                X = np.asarray(X, dtype=float)
+                y = np.asarray(y).ravel()
+                if classes is None:
+                    classes = np.unique(y)
+                scaler.partial_fit(X)
+                model.partial_fit(scaler.transform(X), y, classes=classes)
+                stream["rows"] += X.shape[0]
+                stream["chunks"] += 1
+
+                if validation is None or stream["chunks"] % check_every:
+                    continue
+                accuracy = self._stream_accuracy(model, scaler, validation)
+                stream["history"].append(accuracy)
+                if accuracy > best["accuracy"] + tol:
+                    best = {"accuracy": accuracy, "coef": model.coef_.copy(), "intercept": model.intercept_.copy(),
+                            "scaler": {name: np.copy(getattr(scaler, name)) for name in statistics}}
+                    waited = 0
+                else:
+                    waited += 1
+                    if waited >= patience:
+                        stream["stopped"] = True
+                        break
+            if stream["stopped"]:
+                break
+
+        if stream["chunks"] == 0:
+            return False
+
+        if not validation is None:
+            accuracy = self._stream_accuracy(model, scaler, validation)
+            stream["history"].append(accuracy)
+            if best["coef"] is not None and best["accuracy"] > accuracy:
+                model.coef_, model.intercept_ = best["coef"], best["intercept"]
+                #the coefficients are on the scale of their check
+                for name, value in best["scaler"].items():
+                    setattr(scaler, name, value)
+            else:
+                best["accuracy"] = accuracy
+
+        self._model = model
+        self._mode = "stream"
+        self._scaler = scaler
+        self.machines["stream"] = stream
+        self._fitted(metrics=None if validation is None else {
+            "accuracy": best["accuracy"],
+            "error": 1 - best["accuracy"]
+        })
+        return True
+
+    @staticmethod
+    def _stream_accuracy(model:SGDClassifier, scaler:StandardScaler, validation) -> float:
+        """
+        @brief Score a model on a validation stream
+        @param model (SGDClassifier): The model
+        @param scaler (StandardScaler): The online scaler
+        @param validation (list | callable): (feature, response) chunks
+        @return (float): The accuracy over every chunk
+        """
+        correct, total = 0, 0
+        for X, y in (validation() if callable(validation) else validation):
+            y = np.asarray(y).ravel()
+            correct += int((model.predict(scaler.transform(np.asarray(X, dtype=float))) == y).sum())
+            total += y.shape[0]
+        return correct / total if total else np.nan
+
+    def _evaluate(self, X_test:np.ndarray, y_test:np.ndarray) -> None:
+        """
+        @brief Predict the scaled test split, the metrics are computed on first access
+        @param X_test (np.ndarray): The scaled independent variable
+        @param y_test (np.ndarray): The dependent variable
+        """
+        #process
+        prediction = self.model.predict(X_test)
+        self._fitted({"y_test": np.asarray(y_test), "prediction": prediction})
+        self.machines["prediction"] = prediction
+
+    def _set_data(self, feature:tuple[float], response:tuple[float]) -> None:
+        """
+        @brief Store the feature and the response, a new version of the stored data
+        @param feature (tuple[float]): The independent variable, None keeps the stored one
+        @param response (tuple[float]): The dependent variable, None keeps the stored one
+        """
+        if not feature is None:
+            self.machines["feature"] = feature
+        if not response is None:
+            self.machines["response"] = response
+        if not feature is None or not response is None:
+            self._data_version += 1
+
+    def _fitted(self, evaluation:dict = None, metrics:dict = None) -> None:
+        """
+        @brief Start a new version of the model, dropping the metrics of the previous one
+        @param evaluation (dict): y_test | prediction of the test split
+        @param metrics (dict): Metrics known without a test split, e.g. of a validation stream
+        """
+        self._version += 1
+        self._evaluation = evaluation
+        self._metrics = {}
+        self.machines["prediction"] = None
+        for name in self._saved:
+            self.machines[name] = None
+        for name, value in (metrics or {}).items():
+            self._metrics[(self._version, name)] = value
+            self.machines[name] = value
+
+    def _metric(self, name:str):
+        """
+        @brief Get a metric of the current version, computed on first access
+        @param name (str): accuracy | error | classification_report | confusion_matrix | score
+        @return The metric, None without a test split
+        """
+        key = (self._version, name)
+        if key in self._metrics:
+            return self._metrics[key]
+        if self._evaluation is None:
+            return self.machines.get(name)
+
+        y_test, prediction = self._evaluation["y_test"], self._evaluation["prediction"]
+        if name == "accuracy":
+            value = accuracy_score(y_test, prediction)
+        elif name == "error":
+            value = 1 - self._metric("accuracy")
+        elif name == "classification_report":
+            value = classification_report(y_test, prediction)
+        elif name == "confusion_matrix":
+            value = confusion_matrix(y_test, prediction)
+        else:
+            raise ValueError(f"{name} is not a metric")
+
+        self._metrics[key] = value
+        self.machines[name] = value
+        return value
+
     def predict(self, feature:tuple[float]) -> tuple[float]:
         """
         @brief Predict the response
-        @param feature (tuple[float]): The independent variable
+        @param feature (tuple[float]): The independent variable, unscaled
         @return (tuple[float]): The dependent variable
         """
-        return self.model.predict(feature)
+        return self.model.predict(self._transform(feature))
     
-    def score(self) -> float:
+    def score(self, feature:tuple[float] = None, response:tuple[float] = None,
+              chunk_size:int = 1 << 16, n_jobs:int = None) -> float:
         """
         @brief Score the model
+        @param feature (tuple[float]): The independent variable, None scores the stored feature
+        @param response (tuple[float]): The dependent variable, None scores the stored response
+        @param chunk_size (int): The rows predicted at once
+        @param n_jobs (int): The processes scoring chunks at once, None scores them in this process
+        @return (float): The accuracy
+        @details
+        Memory is O(chunk_size) besides the feature, memory-mapped features are read chunk by chunk
+        The model is sent to every process once, only the chunks are sent per task
+        The score of the stored feature is memoized per version of the model and of the stored data
+        """
+        stored = feature is None and response is None
+        key = (self._version, "score", self._data_version, id(self.feature), id(self.response))
+        if stored and key in self._metrics:
+            return self._metrics[key]
+
+        X = np.asarray(self.feature if feature is None else feature)
+        y = np.asarray(self.response if response is None else response).ravel()
+        if X.shape[0] != y.shape[0]:
+            raise ValueError("The feature and the response must have the same observations")
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive")
+
+        starts = range(0, X.shape[0], chunk_size)
+        if n_jobs is None or n_jobs <= 1 or len(starts) <= 1:
+            correct = [_count_correct(self.model, self._scaler, X[start:start + chunk_size], y[start:start + chunk_size])
+                       for start in starts]
+        else:
+            with ProcessPoolExecutor(n_jobs, initializer=_score_init, initargs=(self.model, self._scaler)) as pool:
+                correct = list(pool.map(_score_chunk, (X[start:start + chunk_size] for start in starts),
+                                        (y[start:start + chunk_size] for start in starts)))
+        value = sum(correct) / X.shape[0] if X.shape[0] else np.nan
+        if stored:
+            self._metrics[key] = value
+        return value
+
+    def decision_function_batches(self, feature:tuple[float], chunk_size:int = 1 << 16):
+        """
+        @brief Compute the decision values in batches
+        @param feature (tuple[float]): The independent variable, unscaled
+        @param chunk_size (int): The rows of a batch
+        @return (generator): (start, decision values) of every batch, in order
+        @details
+        Only one batch is held at a time
+        @example
+        for start, values in machine.decision_function_batches(X):
+            output[start:start + len(values)] = values
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive")
+        X = np.asarray(feature)
+        for start in range(0, X.shape[0], chunk_size):
+            yield start, self.model.decision_function(self._transform(X[start:start + chunk_size]))
+
+    def save(self, file_name:str, metadata:dict = None) -> None:
+        """
+        @brief Save the fitted model
+        @param file_name (str): The path to the file
+        @param metadata (dict): Values kept with the model, e.g. symbol
+        @details
+        Keeps the estimator with its support vectors, the scaler and the evaluation
+        The feature and response are not saved
+        """
+        PersistenceMgmt.save(file_name, type(self).__name__, {
+            "model": self.model,
+            "mode": self._mode,
+            "parameters": self._parameters,
+            "scaler": self._scaler,
+            "machines": {name: self._metric(name) for name in self._saved}
+        }, metadata)
+
+    @classmethod
+    def load(cls, file_name:str, mmap:bool = True) -> "SupportVectorMachine":
+        """
+        @brief Load a saved model
+        @param file_name (str): The path to the file
+        @param mmap (bool): True to map the support vectors read-only instead of reading them
+        @return (SupportVectorMachine): The model, ready to predict | metadata in machines["metadata"]
+        """
+        payload = PersistenceMgmt.load(file_name, cls.__name__, mmap)
+        machine = cls()
+        machine._model = payload["state"]["model"]
+        machine._mode = payload["state"].get("mode", "exact")
+        machine._parameters = payload["state"].get("parameters", {})
+        machine._scaler = payload["state"]["scaler"]
+        machine._fitted(metrics={name: value for name, value in payload["state"]["machines"].items()
+                                 if not value is None})
+        machine.machines["metadata"] = payload["metadata"]
+        return machine
+
+    def _transform(self, feature:tuple[float]) -> np.ndarray:
+        """
+        @brief Scale features with the scaler of the training split
         @param feature (tuple[float]): The independent variable
-        @param response (tuple[float]): The dependent variable
-        @return (float): The score
+        @return (np.ndarray): The scaled independent variable
         """
-        return self.model.score(self.feature, self.response)
-    
+        return feature if self._scaler is None else self._scaler.transform(feature)
@@ -0,0 +1,104 @@
+"""
+@gitsil10
+@version 0.1
+@date 2026-10-19
+@file persistence_mgmt.py
+@brief model persistence
+
+@dependencies
+joblib -> dump | load
+numpy -> np
+os -> path | makedirs | close | remove | replace
+sklearn
+tempfile -> mkstemp
+time
+
+@details
+A file to save and load fitted models
+        1. format -> one joblib file per model
+            1. format | version -> checked on load, older versions are read, newer versions are rejected
+            2. kind -> the class of the model | Regression | SupportVectorMachine
+            3. state -> estimator | scaler | fitted values of the class
+            4. metadata -> saved | numpy and sklearn versions | caller values, e.g. symbol
+        2. memory mapping
+            1. arrays are stored uncompressed, each one is a contiguous block of the file
+            2. load with mmap_mode="r" maps the arrays instead of reading them
+            3. coefficients and support vectors of many models load in milliseconds
+            4. processes loading the same file share its pages
+        3. writes -> to a unique temporary file first, a reader never sees a partial model
+"""
+#imports
+import joblib
+import numpy as np
+from os import path, makedirs, close, remove, replace
+import sklearn
+from tempfile import mkstemp
+import time
+
+#class
+class PersistenceMgmt:
+    """
+    @brief A class to save and load fitted models
+    @param format -> str | the name of the file format
+    @param version -> int | the version of the file format
+
+    @details
+    save -> None | write the state of a model
+    load -> dict | read the state of a model
+    """
+    format:str = "analytical-explorations/model"
+    version:int = 1
+
+    @classmethod
+    def save(cls, file_name:str, kind:str, state:dict, metadata:dict = None) -> None:
+        """
+        @brief Write the state of a model
+        @param file_name -> str | the path to the file
+        @param kind -> str | the class of the model
+        @param state -> dict | estimator | scaler | fitted values
+        @param metadata -> dict | None | values kept with the model, e.g. symbol | training window
+        @return (None)
+        """
+        directory = path.dirname(file_name)
+        if directory:
+            makedirs(directory, exist_ok=True)
+
+        payload = {
+            "format": cls.format,
+            "version": cls.version,
+            "kind": kind,
+            "state": state,
+            "metadata": {
+                "saved": time.time(),
+                "numpy": np.__version__,
+                "sklearn": sklearn.__version__,
+                **(metadata or {})
+            }
+        }
+        #unique per writer, concurrent saves of the same model never share it
+        descriptor, temporary = mkstemp(dir=directory or ".", suffix=".tmp")
+        close(descriptor)
+        try:
+            joblib.dump(payload, temporary, compress=0)
+            replace(temporary, file_name)
+        except BaseException:
+            remove(temporary)
+            raise
+
+    @classmethod
+    def load(cls, file_name:str, kind:str, mmap:bool = True) -> dict:
+        """
+        @brief Read the state of a model
+        @param file_name -> str | the path to the file
+        @param kind -> str | the class the model must be
+        @param mmap -> bool | True | map the arrays read-only instead of reading them
+        @return (dict): format | version | kind | state | metadata
+        """
+        payload = joblib.load(file_name, mmap_mode="r" if mmap else None)
+        if not isinstance(payload, dict) or payload.get("format") != cls.format:
+            raise ValueError(f"{file_name} is not a saved model")
+        if payload["version"] > cls.version:
+            raise ValueError(f"{file_name} has version {payload['version']}, newer than {cls.version}")
+        if payload["kind"] != kind:
+            raise ValueError(f"{file_name} is a {payload['kind']}, not a {kind}")
+        return payload
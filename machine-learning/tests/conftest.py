@@ -0,0 +1,11 @@
+"""
+@gitsil10
+@file conftest.py
+@brief test configuration
+@details Imports are rooted at src, like main.py
+"""
+#imports
+from os import path
+import sys
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "src"))
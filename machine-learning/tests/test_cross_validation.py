@@ -0,0 +1,47 @@
+"""
+@gitsil10
+@file test_cross_validation.py
+@brief tests of cross_validation.py
+"""
+#imports
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import KFold, TimeSeriesSplit, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from include.cross_validation import CrossValidation
+from include.linear_regression import Regression
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(5.0, 3.0, (120, 3))
+    y = X @ np.array([1.0, -2.0, 0.5]) + rng.normal(size=120)
+    return X, y
+
+@pytest.mark.parametrize("scheme, splitter", [
+    ("kfold", KFold(4, shuffle=True, random_state=0)),
+    ("walk_forward", TimeSeriesSplit(4))
+])
+def test_evaluate_matches_sklearn(data, scheme, splitter):
+    X, y = data
+    scores = CrossValidation(scheme, n_splits=4).evaluate(LinearRegression(), X, y, {"mse": mean_squared_error})
+
+    expected = -cross_val_score(make_pipeline(StandardScaler(), LinearRegression()), X, y, cv=splitter,
+                                scoring="neg_mean_squared_error")
+    assert np.allclose(scores["mse"], expected)
+    assert scores["folds"] == 4
+
+def test_cache_is_bounded(data):
+    X, y = data
+    cv = CrossValidation(n_splits=3, cache_size=2)
+    for shift in range(4):
+        cv.evaluate(LinearRegression(), X + shift, y, {"mse": mean_squared_error})
+    assert len(cv._cache) == 2
+
+def test_cv_and_options_are_exclusive(data):
+    X, y = data
+    with pytest.raises(ValueError):
+        Regression().cross_validate(X[:, 0], y, cv=CrossValidation(), scheme="walk_forward")
@@ -0,0 +1,150 @@
+"""
+@gitsil10
+@file test_linear_regression.py
+@brief tests of linear_regression.py
+"""
+#imports
+import numpy as np
+import pytest
+import scipy.stats as st
+from include.linear_regression import Regression
+
+def test_online_metrics_match_batch_fit():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 10, 2000)
+    y = 100 + 2 * x + rng.normal(size=2000)
+    regression = Regression()
+    regression.online(1)
+    regression.update_batch(x, y)
+
+    Z = np.column_stack((np.ones(x.size), x))
+    theta, _, _, _ = np.linalg.lstsq(Z, y, rcond=None)
+    residuals = y - Z @ theta
+    mse = residuals @ residuals / x.size
+    assert np.allclose([regression.intercept, regression.slope], theta, rtol=1e-4)
+    assert np.isclose(regression.mean_squared_error, mse, rtol=1e-6)
+    assert np.isclose(regression.r_squared, 1 - mse / y.var(), rtol=1e-6)
+    assert regression.regression["prequential_mean_squared_error"] > mse
+
+def test_online_forgetting_tracks_a_change():
+    regression = Regression()
+    regression.online(1, forgetting=0.9)
+    x = np.linspace(0, 1, 400)
+    regression.update_batch(x[:200], 3 * x[:200])
+    regression.update_batch(x[200:], -1 * x[200:])
+    assert np.isclose(regression.slope, -1, atol=1e-3)
+
+def test_predict_after_online_fit():
+    rng = np.random.default_rng(5)
+    X = rng.normal(size=(200, 2))
+    y = 1.5 + X @ np.array([2.0, -0.5]) + 0.01 * rng.normal(size=200)
+
+    regression = Regression()
+    regression.update_batch(X, y)
+    theta = regression._online["theta"]
+    assert np.allclose(regression.predict(X), theta[0] + X @ theta[1:])
+    assert regression.prediction(X[0]) == pytest.approx(theta[0] + X[0] @ theta[1:])
+
+    #fit switches back to the scaled batch model
+    regression.fit(X, y)
+    assert regression._online is None
+    assert np.allclose(regression.predict(X), regression.model.predict(regression.scaler.transform(X)))
+
+def test_fit_batch_matches_linregress():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=60)
+    y = np.vstack((0.5 * x + rng.normal(size=60), rng.normal(size=60), -2 * x + 1 + 0.1 * rng.normal(size=60)))
+
+    batch = Regression().fit_batch(x, y)
+    for pair, response in enumerate(y):
+        expected = st.linregress(x, response)
+        assert batch["slope"][pair] == pytest.approx(expected.slope)
+        assert batch["intercept"][pair] == pytest.approx(expected.intercept)
+        assert batch["r_squared"][pair] == pytest.approx(expected.rvalue ** 2)
+        assert batch["p_value"][pair] == pytest.approx(expected.pvalue)
+        assert batch["std_err"][pair] == pytest.approx(expected.stderr)
+        assert batch["intercept_std_err"][pair] == pytest.approx(expected.intercept_stderr)
+    assert np.allclose(batch["residuals"], y - batch["intercept"][:, None] - batch["slope"][:, None] * x)
+    with pytest.raises(ValueError):
+        Regression().fit_batch(x[:2], y[:, :2])
+
+def test_fit_batch_skips_missing_observations():
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=40)
+    y = np.vstack((2 * x + rng.normal(size=40), -x + rng.normal(size=40), rng.normal(size=40)))
+    x[[3, 17]] = np.nan
+    y[0, [5, 9, 30]] = np.nan
+    y[2, 2:] = np.nan
+
+    batch = Regression().fit_batch(x, y)
+    for pair in (0, 1):
+        valid = ~(np.isnan(x) | np.isnan(y[pair]))
+        expected = st.linregress(x[valid], y[pair][valid])
+        assert batch["count"][pair] == valid.sum()
+        assert batch["slope"][pair] == pytest.approx(expected.slope)
+        assert batch["intercept"][pair] == pytest.approx(expected.intercept)
+        assert batch["p_value"][pair] == pytest.approx(expected.pvalue)
+        assert batch["intercept_std_err"][pair] == pytest.approx(expected.intercept_stderr)
+    assert np.isnan(batch["slope"][2]) and np.isnan(batch["p_value"][2])
+    assert np.isnan(batch["residuals"][0, 5]) and not np.isnan(batch["residuals"][1, 5])
+
+def test_fit_rolling_matches_fit_batch():
+    rng = np.random.default_rng(2)
+    #prices, the sums are far from zero
+    x = 100 + np.cumsum(rng.normal(size=300))
+    y = np.vstack((1.5 * x + rng.normal(size=300), 50 - 0.5 * x + rng.normal(size=300)))
+    window = 40
+
+    rolling = Regression().fit_rolling(x, y, window)
+    assert rolling["slope"].shape == y.shape
+    assert np.isnan(rolling["slope"][:, :window - 1]).all()
+    for end in (window - 1, 150, 299):
+        batch = Regression().fit_batch(x[end - window + 1:end + 1], y[:, end - window + 1:end + 1], residuals=False)
+        for name in ("slope", "intercept", "r_squared", "std_err"):
+            assert np.allclose(rolling[name][:, end], batch[name], rtol=1e-7)
+
+def test_multiple_features():
+    rng = np.random.default_rng(3)
+    X = rng.normal(10.0, 4.0, (400, 3))
+    y = X @ np.array([2.0, 0.0, -1.0]) + 5 + rng.normal(size=400)
+
+    regression = Regression()
+    assert regression.fit(X, y)
+    assert regression.slope.shape == (3,)
+    assert np.allclose(regression.predict(X, chunk_size=64, workers=2),
+                       regression.model.predict(regression.scaler.transform(X)))
+    assert regression.prediction(X[0]) == pytest.approx(regression.predict(X[:1])[0])
+    assert regression.p_value[0] < 1e-10 and regression.p_value[1] > 1e-3
+    with pytest.raises(ValueError):
+        regression.predict(X[:, :2])
+
+def test_single_feature_inference_matches_linregress():
+    rng = np.random.default_rng(4)
+    x = rng.normal(size=100)
+    y = 0.3 * x + rng.normal(size=100)
+
+    regression = Regression()
+    regression.fit(x, y)
+    expected = st.linregress(x, y)
+    assert regression.p_value == pytest.approx(expected.pvalue)
+    assert regression.std_err == pytest.approx(expected.stderr)
+
+def test_fit_rolling_with_gaps():
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=290)
+    y = np.vstack((0.8 * x + rng.normal(size=290), 1.2 * x + rng.normal(size=290)))
+    #listed later than the index | one missing day
+    y[0, :50] = np.nan
+    y[1, 100] = np.nan
+    window = 50
+
+    rolling = Regression().fit_rolling(x, y, window)
+    valid = ~np.isnan(rolling["slope"])
+    assert valid[0].sum() == 290 - 50 - window + 1 and valid[0, 99] and not valid[0, 98]
+    assert valid[1].sum() == 290 - window + 1 - window
+    assert not valid[1, 100:100 + window].any()
+    for pair, end in ((0, 99), (0, 289), (1, 99), (1, 150), (1, 289)):
+        batch = Regression().fit_batch(x[end - window + 1:end + 1], y[pair, end - window + 1:end + 1], residuals=False)
+        assert rolling["slope"][pair, end] == pytest.approx(batch["slope"][0])
+        assert rolling["intercept"][pair, end] == pytest.approx(batch["intercept"][0])
+        assert rolling["std_err"][pair, end] == pytest.approx(batch["std_err"][0])
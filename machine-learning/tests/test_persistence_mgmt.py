@@ -0,0 +1,75 @@
+"""
+@gitsil10
+@file test_persistence_mgmt.py
+@brief tests of persistence_mgmt.py and the save | load of the models
+"""
+#imports
+import joblib
+import numpy as np
+import pytest
+from include.linear_regression import Regression
+from include.support_vector_machine import SupportVectorMachine
+from utils.persistence_mgmt import PersistenceMgmt
+
+def test_regression_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 2))
+    y = X @ [1.0, -3.0] + rng.normal(size=500)
+    regression = Regression()
+    regression.fit(X, y)
+    regression.online(2)
+    regression.update_batch(X, y)
+
+    file_name = str(tmp_path / "models" / "regression.joblib")
+    regression.save(file_name, {"symbol": "AAPL"})
+    loaded = Regression.load(file_name)
+    assert np.array_equal(loaded.predict(X), regression.predict(X))
+    assert np.array_equal(loaded.slope, regression.slope)
+    assert loaded.regression["metadata"]["symbol"] == "AAPL"
+    #the online state keeps updating after a load
+    assert loaded.update(X[0], y[0]) == pytest.approx(regression.update(X[0], y[0]))
+
+def test_support_vector_machine_maps_the_support_vectors(tmp_path):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(600, 2))
+    y = (X[:, 0] * X[:, 1] > 0).astype(int)
+    machine = SupportVectorMachine()
+    machine.fit(X, y)
+
+    file_name = str(tmp_path / "svm.joblib")
+    machine.save(file_name)
+    loaded = SupportVectorMachine.load(file_name)
+    assert isinstance(loaded.model.support_vectors_, np.memmap)
+    assert np.array_equal(loaded.predict(X), machine.predict(X))
+    assert loaded.accuracy == machine.accuracy
+    assert not isinstance(SupportVectorMachine.load(file_name, mmap=False).model.support_vectors_, np.memmap)
+
+def test_failed_save_keeps_the_previous_model(tmp_path, monkeypatch):
+    file_name = str(tmp_path / "model.joblib")
+    PersistenceMgmt.save(file_name, "Regression", {"weights": 1.0})
+
+    def fail(payload, temporary, compress):
+        open(temporary, "w").close()
+        raise OSError("disk full")
+
+    monkeypatch.setattr(joblib, "dump", fail)
+    with pytest.raises(OSError):
+        PersistenceMgmt.save(file_name, "Regression", {"weights": 2.0})
+    assert [item.name for item in tmp_path.iterdir()] == ["model.joblib"]
+    assert PersistenceMgmt.load(file_name, "Regression")["state"] == {"weights": 1.0}
+
+def test_load_checks_the_kind_and_version(tmp_path):
+    file_name = str(tmp_path / "model.joblib")
+    PersistenceMgmt.save(file_name, "Regression", {})
+    with pytest.raises(ValueError):
+        PersistenceMgmt.load(file_name, "SupportVectorMachine")
+
+    payload = joblib.load(file_name)
+    payload["version"] = PersistenceMgmt.version + 1
+    joblib.dump(payload, file_name)
+    with pytest.raises(ValueError):
+        PersistenceMgmt.load(file_name, "Regression")
+
+    joblib.dump({"weights": [1.0]}, file_name)
+    with pytest.raises(ValueError):
+        PersistenceMgmt.load(file_name, "Regression")
@@ -0,0 +1,149 @@
+"""
+@gitsil10
+@file test_support_vector_machine.py
+@brief tests of support_vector_machine.py
+"""
+#imports
+import numpy as np
+import pytest
+from sklearn import svm
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+from include.support_vector_machine import SupportVectorMachine
+
+@pytest.fixture
+def circle():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3000, 4))
+    y = ((X[:, 0] ** 2 + X[:, 1] ** 2) < 1.5).astype(int)
+    return X, y
+
+@pytest.fixture
+def linear():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(20000, 5)) * [1, 2, 3, 4, 5] + 10
+    y = (X @ [1, -2, 0.5, 0, 3] > 10 - 20 + 5 + 30).astype(int)
+    return X, y
+
+def test_fit_stream_then_fit_restores_svc(linear):
+    X, y = linear
+    chunks = [(X[start:start + 1000], y[start:start + 1000]) for start in range(0, 16000, 1000)]
+    validation = [(X[16000:], y[16000:])]
+    machine = SupportVectorMachine()
+    assert machine.fit_stream(lambda: iter(chunks), validation=validation, epochs=2, check_every=4)
+    assert machine.mode == "stream" and isinstance(machine.model, SGDClassifier)
+    assert machine.accuracy > 0.97
+    assert machine.machines["stream"]["rows"] <= 32000
+
+    machine.fit(X[:2000], y[:2000])
+    assert machine.mode == "exact" and isinstance(machine.model, svm.SVC)
+
+def test_fit_stream_restores_the_scaler_of_the_best_check(linear):
+    X, y = linear
+    rng = np.random.default_rng(2)
+    chunks = [(X[start:start + 1000], y[start:start + 1000]) for start in range(0, 4000, 1000)]
+    #later chunks move the scaler and carry noise labels
+    chunks += [(X[:1000] * 5 + 100, rng.integers(0, 2, 1000)) for _ in range(8)]
+    validation = [(X[16000:], y[16000:])]
+    machine = SupportVectorMachine()
+    assert machine.fit_stream(chunks, validation=validation, check_every=2, patience=2)
+    assert machine.machines["stream"]["stopped"]
+    assert machine.scaler.n_samples_seen_ < machine.machines["stream"]["rows"]
+    assert SupportVectorMachine._stream_accuracy(machine.model, machine.scaler, validation) == machine.accuracy
+    assert machine.accuracy > 0.9
+
+def test_fit_approximate_is_not_sticky(circle, tmp_path):
+    X, y = circle
+    machine = SupportVectorMachine()
+    assert machine.fit_approximate(X, y, n_components=200)
+    assert machine.mode == "approximate" and machine.accuracy > 0.9
+
+    machine.save(str(tmp_path / "approximate.joblib"))
+    loaded = SupportVectorMachine.load(str(tmp_path / "approximate.joblib"))
+    assert loaded.mode == "approximate"
+    assert (loaded.predict(X[:100]) == machine.predict(X[:100])).all()
+
+    machine.fit()
+    assert machine.mode == "exact" and isinstance(machine.model, svm.SVC)
+
+def test_benchmark_rows(circle):
+    rows = SupportVectorMachine().benchmark(*circle, sizes=(500, 2000), exact_limit=500, n_components=100)
+    assert [(row["size"], row["model"]) for row in rows] == [(500, "exact"), (500, "nystroem"), (2000, "nystroem")]
+    assert all(row["fit_time"] > 0 and 0 <= row["accuracy"] <= 1 for row in rows)
+
+def test_metrics_are_lazy_and_memoized_per_version(circle):
+    X, y = circle
+    machine = SupportVectorMachine()
+    machine.fit(X, y)
+    assert machine.machines["accuracy"] is None
+    accuracy = machine.accuracy
+    assert machine.machines["accuracy"] == accuracy
+    assert np.isclose(machine.error, 1 - accuracy)
+    assert machine.confusion_matrix.sum() == 600
+
+    version = machine.version
+    machine.fit_approximate(n_components=100)
+    assert machine.version == version + 1 and machine.machines["accuracy"] is None
+
+def test_score_follows_the_stored_data(circle):
+    X, y = circle
+    machine = SupportVectorMachine()
+    machine.fit(X, y)
+    first = machine.score()
+    assert first == machine.score()
+
+    #changing the stored data must not return the memoized score
+    flipped = 1 - y
+    machine.cross_validate(X, flipped, n_splits=2)
+    assert np.isclose(machine.score(), 1 - first)
+
+def test_chunked_parallel_score_and_decision_batches(circle):
+    X, y = circle
+    machine = SupportVectorMachine()
+    machine.fit(X, y)
+    expected = machine.model.score(machine.scaler.transform(X), y)
+    assert np.isclose(machine.score(X, y, chunk_size=700), expected)
+    assert np.isclose(machine.score(X, y, chunk_size=700, n_jobs=2), expected)
+
+    values = np.empty(X.shape[0])
+    for start, batch in machine.decision_function_batches(X, chunk_size=700):
+        assert batch.shape[0] <= 700
+        values[start:start + batch.shape[0]] = batch
+    assert np.allclose(values, machine.model.decision_function(machine.scaler.transform(X)))
+
+def test_tune_halves_the_candidates(circle):
+    X, y = circle
+    grid = {"kernel": ["rbf"], "C": [0.1, 1, 10], "gamma": [0.01, 0.1, 1]}
+    machine = SupportVectorMachine()
+    tune = machine.tune(X, y, grid, min_samples=200, max_samples=1800)
+
+    history = tune["history"]
+    assert [len(rung["candidates"]) for rung in history] == [9, 3, 1]
+    assert [rung["samples"] for rung in history] == [200, 600, 1800]
+    assert tune["fits"] == 13 and tune["grid_size"] == 9
+    assert tune["accuracy"] > 0.9
+    assert machine.parameters == tune["best"] and machine.mode == "exact"
+
+    #the precomputed kernels score like svm.SVC on the same rows
+    X_train, X_validation, y_train, y_validation = train_test_split(X, y, test_size=0.2, random_state=0)
+    scaler = StandardScaler().fit(X_train)
+    order = np.random.default_rng(0).permutation(X_train.shape[0])[:1800]
+    reference = svm.SVC(**tune["best"]).fit(scaler.transform(X_train)[order], y_train[order])
+    assert tune["accuracy"] == pytest.approx(reference.score(scaler.transform(X_validation), y_validation))
+
+def test_tune_bounds_the_validation_rows(circle, monkeypatch):
+    X, y = circle
+    shapes = []
+    extend = SupportVectorMachine._extend_kernel
+    def record(*args):
+        kernels = extend(*args)
+        shapes.append(kernels[1].shape)
+        return kernels
+    monkeypatch.setattr(SupportVectorMachine, "_extend_kernel", staticmethod(record))
+
+    tune = SupportVectorMachine().tune(X, y, {"kernel": ["rbf"], "C": [1, 10], "gamma": [0.1, 1]},
+                                       min_samples=100, max_samples=400, refit=False)
+    assert max(rows for rows, _ in shapes) == 400
+    assert max(samples for _, samples in shapes) == 400
+    assert tune["accuracy"] > 0.85
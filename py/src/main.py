@@ -6,13 +6,129 @@
 @brief application driver
 @details A file to run the application
 
+fetch -> clean -> aggregate | model -> write
+Every symbol runs the stages on its own, symbols run concurrently across processes
+An interrupted run resumes from the checkpoints in data/processed/checkpoints/<run id>
+The run id defaults to the date, a run on a later day fetches again
+
+@example
+python main.py AAPL MSFT GOOG
 """
 #imports
+import json
+import os
+import sys
+import numpy as np
+import pandas as pd
+from include.financial_security_mgmt import FinancialSecurityMgmt
+from utils.dataframe_mgmt import DataframeMgmt
+from utils.pipeline_mgmt import PipelineMgmt
+from utils.process_mgmt import ProcessMgmt
+from utils.statistics_mgmt import StatisticsMgmt
+
+#stages
+def fetch(symbol:str) -> pd.DataFrame:
+    """
+    @brief Fetch the daily history of a symbol
+    @param symbol (str): The symbol
+    @return (pd.DataFrame): The history
+    """
+    security = FinancialSecurityMgmt(symbol)
+    if security.security["history"] is None or security.security["history"].empty:
+        raise ValueError(f"No history for {symbol}")
+    return security.security["history"]
+
+def clean(symbol:str, history:pd.DataFrame) -> pd.DataFrame:
+    """
+    @brief Clean the history of a symbol
+    @param symbol (str): The symbol
+    @param history (pd.DataFrame): The history
+    @return (pd.DataFrame): The history without na and repeated dates
+
+    @details
+    Equal prices on different dates are kept, e.g. a halted symbol
+    """
+    frame = DataframeMgmt(history.select_dtypes(include="number"))
+    return frame.inplace_drop_na().inplace_drop_duplicates(index=True).data
+
+def aggregate(symbol:str, history:pd.DataFrame) -> pd.DataFrame:
+    """
+    @brief Aggregate the history of a symbol by year and month
+    @param symbol (str): The symbol
+    @param history (pd.DataFrame): The clean history
+    @return (pd.DataFrame): sum | mean | std | count of every column by year and month
+    """
+    grouped = DataframeMgmt(history).group_by_year_month()
+    grouped.columns = ["_".join(column) for column in grouped.columns]
+    grouped.index = pd.to_datetime(
+        [f"{year}-{month:02d}-01" for year, month in grouped.index]
+    ).rename("Date")
+    return grouped
+
+def model(symbol:str, history:pd.DataFrame) -> dict:
+    """
+    @brief Summarize the daily log returns of a symbol
+    @param symbol (str): The symbol
+    @param history (pd.DataFrame): The clean history
+    @return (dict): mean | std_dev | count | conf_interval | t-statistic | p-value
+    """
+    statistics = StatisticsMgmt()
+    statistics.data = np.diff(np.log(history["Close"].to_numpy()))
+    statistic, pvalue = tuple(statistics.hypothesis_test())[:2]
+    return {
+        "symbol": symbol,
+        "mean": statistics.mean,
+        "std_dev": statistics.std_dev,
+        "count": statistics.count,
+        "conf_interval": [float(bound) for bound in statistics.conf_interval()],
+        "statistic": float(statistic),
+        "pvalue": float(pvalue)
+    }
+
+def write(symbol:str, monthly:pd.DataFrame, summary:dict) -> bool:
+    """
+    @brief Write the aggregate and the summary of a symbol
+    @param symbol (str): The symbol
+    @param monthly (pd.DataFrame): The aggregate
+    @param summary (dict): The summary
+    @return (bool): True if both were written
+
+    @details
+    Both outputs are replaced, not appended to, a resumed run that repeats this stage writes the same files
+    """
+    process = ProcessMgmt()
+    return (
+        process.write_frame("processed", os.path.join("monthly", symbol), monthly,
+                            partition_on=("date",), overwrite=True)
+        and process.replace_output(f"{symbol}.json", json.dumps(summary))
+    )
 
 #main
-def main():
-    pass
+def main(symbols:list = None, workers:int = None, run_id:str = None) -> dict:
+    """
+    @brief Run the pipeline for every symbol
+    @param symbols (list): The symbols, defaults to the command line arguments
+    @param workers (int): The number of processes, defaults to the number of cpus
+    @param run_id (str): The run whose checkpoints are resumed, defaults to the date
+    @return (dict): symbol -> status | error
+    """
+    symbols = symbols if symbols else sys.argv[1:]
+    for name in ProcessMgmt().get_path().values():
+        os.makedirs(name, exist_ok=True)
+
+    run_id = run_id if run_id else pd.Timestamp.today().strftime("%Y-%m-%d")
+    pipeline = PipelineMgmt(workers=workers if workers else os.cpu_count(), run_id=run_id)
+    pipeline.add_stage("fetch", fetch, kind="io")
+    pipeline.add_stage("clean", clean, ("fetch",))
+    pipeline.add_stage("aggregate", aggregate, ("clean",))
+    pipeline.add_stage("model", model, ("clean",))
+    pipeline.add_stage("write", write, ("aggregate", "model"), kind="io")
+
+    results = pipeline.run(symbols)
+    for symbol, result in results.items():
+        print(symbol, result["status"], result.get("error", ""))
+    return results
 
 #driver
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
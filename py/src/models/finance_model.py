@@ -6,9 +6,16 @@
 @version 0.1
 @date 2024-03-20
 @dependencies
+numpy -> np
+
+@details
+1. Finance -> one entity | lists of values per period
+2. FinancePanel -> many entities | (entities, periods) arrays
+    1. derived measures are computed for the whole panel in one vectorized operation
+    2. FinanceRow -> lightweight view of one entity of the panel
 """
 #imports
-
+import numpy as np
 
 #class
 class Finance:
@@ -63,7 +70,7 @@ class Finance:
         @brief Get the net income of an entity
         @return (float): The net income of an entity
         """
-        return self._revenue - self._expense
+        return (np.asarray(self._revenue, dtype=float) - np.asarray(self._expense, dtype=float)).tolist()
     
     @property
     def equity(self) -> list[float]:
@@ -71,7 +78,7 @@ class Finance:
         @brief Get the equity of an entity
         @return (float): The equity of an entity
         """
-        return self._asset - self._liability
+        return (np.asarray(self._asset, dtype=float) - np.asarray(self._liability, dtype=float)).tolist()
     
     @revenue.setter
     def revenue(self, revenue:list[float]) -> None:
@@ -104,3 +111,322 @@ class Finance:
         @param liability (float): The liability of an entity
         """
         self._liability = liability
+
+
+class FinancePanel:
+    """
+    @brief A class to manage the financial security of many entities
+    @param entities (list[str]): The entities, one row each
+    @param periods (list): The periods, one column each
+    @param revenue (np.ndarray): The incomes, (entities, periods)
+    @param expense (np.ndarray): The costs, (entities, periods)
+    @param asset (np.ndarray): The financial resources, (entities, periods)
+    @param liability (np.ndarray): The financial obligations, (entities, periods)
+
+    @details
+    Missing values are nan
+    Indexing by entity name or row returns a FinanceRow view, not a copy
+    """
+    _measures:tuple = ("revenue", "expense", "asset", "liability")
+
+    def __init__(self, entities:list[str], periods:list, revenue:np.ndarray = None, expense:np.ndarray = None,
+                 asset:np.ndarray = None, liability:np.ndarray = None):
+        self._entities:tuple = tuple(entities)
+        self._periods:tuple = tuple(periods)
+        self._rows:dict = {entity: row for row, entity in enumerate(self._entities)}
+        if len(self._rows) != len(self._entities):
+            raise ValueError("The entities must be unique")
+
+        self._panel:dict = {
+            measure: np.full(self.shape, np.nan) for measure in self._measures
+        }
+        for measure, values in zip(self._measures, (revenue, expense, asset, liability)):
+            if not values is None:
+                setattr(self, measure, values)
+
+    @classmethod
+    def from_finances(cls, finances:dict, periods:list = None) -> "FinancePanel":
+        """
+        @brief Create a panel from Finance objects
+        @param finances (dict): entity -> Finance
+        @param periods (list): The periods, defaults to 0 .. longest list - 1
+        @return (FinancePanel): The panel, shorter lists are padded with nan, longer lists are cut to the periods
+
+        @details
+        The measures may be lists, numpy arrays or pandas series, None is left as nan
+        """
+        if periods is None:
+            length = max(
+                (len(getattr(finance, measure)) for finance in finances.values() for measure in cls._measures
+                 if not getattr(finance, measure) is None),
+                default=0
+            )
+            periods = list(range(length))
+
+        panel = cls(list(finances), periods)
+        for row, finance in enumerate(finances.values()):
+            for measure in cls._measures:
+                values = getattr(finance, measure)
+                if not values is None:
+                    values = np.asarray(values, dtype=float)[:len(periods)]
+                    panel._panel[measure][row, :len(values)] = values
+        return panel
+
+    @property
+    def entities(self) -> tuple:
+        """
+        @brief Get the entities
+        @return (tuple): The entities
+        """
+        return self._entities
+
+    @property
+    def periods(self) -> tuple:
+        """
+        @brief Get the periods
+        @return (tuple): The periods
+        """
+        return self._periods
+
+    @property
+    def shape(self) -> tuple:
+        """
+        @brief Get the shape of the panel
+        @return (tuple): (entities, periods)
+        """
+        return len(self._entities), len(self._periods)
+
+    @property
+    def revenue(self) -> np.ndarray:
+        """
+        @brief Get the revenue of every entity
+        @return (np.ndarray): The revenue, (entities, periods)
+        """
+        return self._panel["revenue"]
+
+    @property
+    def expense(self) -> np.ndarray:
+        """
+        @brief Get the expense of every entity
+        @return (np.ndarray): The expense, (entities, periods)
+        """
+        return self._panel["expense"]
+
+    @property
+    def asset(self) -> np.ndarray:
+        """
+        @brief Get the asset of every entity
+        @return (np.ndarray): The asset, (entities, periods)
+        """
+        return self._panel["asset"]
+
+    @property
+    def liability(self) -> np.ndarray:
+        """
+        @brief Get the liability of every entity
+        @return (np.ndarray): The liability, (entities, periods)
+        """
+        return self._panel["liability"]
+
+    @revenue.setter
+    def revenue(self, revenue:np.ndarray) -> None:
+        """
+        @brief Set the revenue of every entity
+        @param revenue (np.ndarray): The revenue, (entities, periods)
+        """
+        self._set("revenue", revenue)
+
+    @expense.setter
+    def expense(self, expense:np.ndarray) -> None:
+        """
+        @brief Set the expense of every entity
+        @param expense (np.ndarray): The expense, (entities, periods)
+        """
+        self._set("expense", expense)
+
+    @asset.setter
+    def asset(self, asset:np.ndarray) -> None:
+        """
+        @brief Set the asset of every entity
+        @param asset (np.ndarray): The asset, (entities, periods)
+        """
+        self._set("asset", asset)
+
+    @liability.setter
+    def liability(self, liability:np.ndarray) -> None:
+        """
+        @brief Set the liability of every entity
+        @param liability (np.ndarray): The liability, (entities, periods)
+        """
+        self._set("liability", liability)
+
+    @property
+    def net_income(self) -> np.ndarray:
+        """
+        @brief Get the net income of every entity
+        @return (np.ndarray): revenue - expense, (entities, periods)
+        """
+        return self.revenue - self.expense
+
+    @property
+    def equity(self) -> np.ndarray:
+        """
+        @brief Get the equity of every entity
+        @return (np.ndarray): asset - liability, (entities, periods)
+        """
+        return self.asset - self.liability
+
+    @property
+    def net_margin(self) -> np.ndarray:
+        """
+        @brief Get the net margin of every entity
+        @return (np.ndarray): net income / revenue, (entities, periods)
+        """
+        return self._divide(self.net_income, self.revenue)
+
+    @property
+    def return_on_assets(self) -> np.ndarray:
+        """
+        @brief Get the return on assets of every entity
+        @return (np.ndarray): net income / asset, (entities, periods)
+        """
+        return self._divide(self.net_income, self.asset)
+
+    @property
+    def return_on_equity(self) -> np.ndarray:
+        """
+        @brief Get the return on equity of every entity
+        @return (np.ndarray): net income / equity, (entities, periods)
+        """
+        return self._divide(self.net_income, self.equity)
+
+    @property
+    def debt_to_equity(self) -> np.ndarray:
+        """
+        @brief Get the debt to equity of every entity
+        @return (np.ndarray): liability / equity, (entities, periods)
+        """
+        return self._divide(self.liability, self.equity)
+
+    def row(self, entity) -> int:
+        """
+        @brief Get the row of an entity
+        @param entity (str | int): The entity or its row
+        @return (int): The row
+        """
+        if isinstance(entity, (int, np.integer)):
+            if not -len(self) <= entity < len(self):
+                raise IndexError("The row is out of range")
+            return int(entity) % len(self)
+        if entity not in self._rows:
+            raise KeyError(entity)
+        return self._rows[entity]
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __getitem__(self, entity) -> "FinanceRow":
+        return FinanceRow(self, self.row(entity))
+
+    def __iter__(self):
+        return (FinanceRow(self, row) for row in range(len(self)))
+
+    def _set(self, measure:str, values:np.ndarray) -> None:
+        """
+        @brief Set a measure of every entity
+        @param measure (str): The measure
+        @param values (np.ndarray): The values, broadcast to (entities, periods)
+        """
+        values = np.asarray(values, dtype=float)
+        try:
+            self._panel[measure] = np.array(np.broadcast_to(values, self.shape))
+        except ValueError:
+            raise ValueError(f"The {measure} must have the shape {self.shape}")
+
+    @staticmethod
+    def _divide(numerator:np.ndarray, denominator:np.ndarray) -> np.ndarray:
+        """
+        @brief Divide element-wise, nan where the denominator is zero
+        @param numerator (np.ndarray): The numerator
+        @param denominator (np.ndarray): The denominator
+        @return (np.ndarray): The ratio
+        """
+        return np.divide(
+            numerator, denominator, out=np.full(np.broadcast(numerator, denominator).shape, np.nan),
+            where=denominator != 0
+        )
+
+
+class FinanceRow:
+    """
+    @brief A view of one entity of a FinancePanel
+    @param panel (FinancePanel): The panel
+    @param row (int): The row of the entity
+
+    @details
+    Measures are views of the panel arrays, writes go through to the panel
+    """
+    __slots__ = ("_panel", "_row")
+
+    def __init__(self, panel:FinancePanel, row:int):
+        self._panel:FinancePanel = panel
+        self._row:int = row
+
+    @property
+    def entity(self) -> str:
+        """
+        @brief Get the entity
+        @return (str): The entity
+        """
+        return self._panel.entities[self._row]
+
+    @property
+    def revenue(self) -> np.ndarray:
+        """
+        @brief Get the revenue of the entity
+        @return (np.ndarray): The revenue, (periods,)
+        """
+        return self._panel.revenue[self._row]
+
+    @property
+    def expense(self) -> np.ndarray:
+        """
+        @brief Get the expense of the entity
+        @return (np.ndarray): The expense, (periods,)
+        """
+        return self._panel.expense[self._row]
+
+    @property
+    def asset(self) -> np.ndarray:
+        """
+        @brief Get the asset of the entity
+        @return (np.ndarray): The asset, (periods,)
+        """
+        return self._panel.asset[self._row]
+
+    @property
+    def liability(self) -> np.ndarray:
+        """
+        @brief Get the liability of the entity
+        @return (np.ndarray): The liability, (periods,)
+        """
+        return self._panel.liability[self._row]
+
+    @property
+    def net_income(self) -> np.ndarray:
+        """
+        @brief Get the net income of the entity
+        @return (np.ndarray): revenue - expense, (periods,)
+        """
+        return self.revenue - self.expense
+
+    @property
+    def equity(self) -> np.ndarray:
+        """
+        @brief Get the equity of the entity
+        @return (np.ndarray): asset - liability, (periods,)
+        """
+        return self.asset - self.liability
+
+    def __repr__(self) -> str:
+        return f"FinanceRow({self.entity!r})"
@@ -0,0 +1,206 @@
+"""
+@gitsil10
+@file accumulator_mgmt.py
+@brief streaming moments
+@details A file to accumulate moments of a stream of data
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+numpy -> np
+
+@details
+A file to accumulate the moments of data that arrives in chunks
+1. count | mean | m2 | min | max
+    1. m2 -> sum of squared differences from the mean
+    2. variance = m2 / (count - 1)
+2. updates
+    1. each chunk is reduced to its own count, mean and m2 with numpy
+    2. the chunk is folded into the running moments with the pairwise update of Chan et al.
+    3. a chunk of one value is the Welford update
+3. merge
+    1. accumulators from parallel workers combine with the same pairwise update
+    2. the result does not depend on how the data was split
+4. missing values
+    1. nan values are ignored
+"""
+#imports
+import numpy as np
+
+#class
+class AccumulatorMgmt:
+    """
+    @brief A class to accumulate moments of a stream of data
+    @param count (int): The number of values
+    @param mean (float): The mean of the values
+    @param m2 (float): The sum of squared differences from the mean
+    @param min (float): The smallest value
+    @param max (float): The largest value
+
+    @details
+    update -> AccumulatorMgmt | fold an array or chunk into the moments
+    consume -> AccumulatorMgmt | fold an iterable of chunks into the moments
+    merge -> AccumulatorMgmt | fold another accumulator into the moments
+    variance -> float | the sample variance
+    std_dev -> float | the sample standard deviation
+    """
+    def __init__(self, data = None):
+        self._moments:dict = {
+            "count": 0,
+            "mean": 0.0,
+            "m2": 0.0,
+            "min": np.inf,
+            "max": -np.inf
+        }
+        if not data is None:
+            self.update(data)
+
+    @property
+    def moments(self) -> dict:
+        """
+        @brief Get the moments
+        @return (dict): The moments
+        """
+        return self._moments
+
+    @property
+    def count(self) -> int:
+        """
+        @brief Get the number of values
+        @return (int): The number of values
+        """
+        return self._moments["count"]
+
+    @property
+    def mean(self) -> float:
+        """
+        @brief Get the mean of the values
+        @return (float): The mean of the values, nan if empty
+        """
+        return self._moments["mean"] if self.count > 0 else np.nan
+
+    @property
+    def m2(self) -> float:
+        """
+        @brief Get the sum of squared differences from the mean
+        @return (float): The sum of squared differences from the mean
+        """
+        return self._moments["m2"]
+
+    @property
+    def min(self) -> float:
+        """
+        @brief Get the smallest value
+        @return (float): The smallest value, nan if empty
+        """
+        return self._moments["min"] if self.count > 0 else np.nan
+
+    @property
+    def max(self) -> float:
+        """
+        @brief Get the largest value
+        @return (float): The largest value, nan if empty
+        """
+        return self._moments["max"] if self.count > 0 else np.nan
+
+    @property
+    def variance(self) -> float:
+        """
+        @brief Get the sample variance
+        @return (float): The sample variance, nan for less than two values
+        """
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std_dev(self) -> float:
+        """
+        @brief Get the sample standard deviation
+        @return (float): The sample standard deviation, nan for less than two values
+        """
+        return float(np.sqrt(self.variance))
+
+    def update(self, data) -> "AccumulatorMgmt":
+        """
+        @brief Fold an array or chunk into the moments
+        @param data (float | array): The values
+        @return (AccumulatorMgmt): The instance, for chaining
+
+        @note
+        Time: O(n)
+        Space: O(n) for the centered chunk
+        """
+        values = np.asarray(data, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+
+        mean = values.mean()
+        centered = values - mean
+        return self._combine(
+            values.size, float(mean), float(np.dot(centered, centered)),
+            float(values.min()), float(values.max())
+        )
+
+    def consume(self, chunks) -> "AccumulatorMgmt":
+        """
+        @brief Fold an iterable of chunks into the moments
+        @param chunks (iterable): The chunks of values
+        @return (AccumulatorMgmt): The instance, for chaining
+
+        @note
+        Time: O(n)
+        Space: O(chunk)
+        """
+        for chunk in chunks:
+            self.update(chunk)
+        return self
+
+    def merge(self, other:"AccumulatorMgmt") -> "AccumulatorMgmt":
+        """
+        @brief Fold another accumulator into the moments
+        @param other (AccumulatorMgmt): The accumulator, e.g. from a parallel worker
+        @return (AccumulatorMgmt): The instance, for chaining
+
+        @note
+        Time: O(1)
+        Space: O(1)
+        """
+        if not isinstance(other, AccumulatorMgmt):
+            raise ValueError("Only accumulators can be merged")
+
+        if other.count == 0:
+            return self
+        return self._combine(other.count, other.mean, other.m2, other.min, other.max)
+
+    def __add__(self, other:"AccumulatorMgmt") -> "AccumulatorMgmt":
+        """
+        @brief Merge two accumulators into a new one
+        @param other (AccumulatorMgmt): The accumulator
+        @return (AccumulatorMgmt): The merged accumulator
+        """
+        merged = AccumulatorMgmt()
+        return merged.merge(self).merge(other)
+
+    def _combine(self, count:int, mean:float, m2:float, low:float, high:float) -> "AccumulatorMgmt":
+        """
+        @brief Fold the moments of a partition into the moments
+        @param count (int): The number of values of the partition
+        @param mean (float): The mean of the partition
+        @param m2 (float): The sum of squared differences from the mean of the partition
+        @param low (float): The smallest value of the partition
+        @param high (float): The largest value of the partition
+        @return (AccumulatorMgmt): The instance, for chaining
+
+        @details
+        delta = mean_b - mean_a
+        mean = mean_a + delta * n_b / n
+        m2 = m2_a + m2_b + delta^2 * n_a * n_b / n
+        """
+        total = self.count + int(count)
+        delta = mean - self._moments["mean"]
+        self._moments["mean"] += delta * count / total
+        self._moments["m2"] += m2 + delta * delta * self.count * count / total
+        self._moments["min"] = min(self._moments["min"], low)
+        self._moments["max"] = max(self._moments["max"], high)
+        self._moments["count"] = total
+        return self
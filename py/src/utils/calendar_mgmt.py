@@ -0,0 +1,304 @@
+"""
+@gitsil10
+@file calendar_mgmt.py
+@brief A class to index trading days
+@details A class to look up trading days and periods of many dates at once
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+numpy -> np
+pandas -> pd
+pandas.tseries.holiday -> exchange holiday rules
+
+@details
+1. index
+    1. every calendar day between start and end is a position in precomputed arrays
+    2. trading days -> weekdays that are not holidays | numbered by ordinal
+    3. holidays -> exchange | None | list of dates
+2. arrays | one entry per calendar day
+    1. trading ordinal -> ordinal of the last trading day on or before the day
+    2. next trading ordinal -> ordinal of the first trading day on or after the day
+    3. month | quarter | year | fiscal quarter | fiscal year period starts
+3. lookups
+    1. dates are converted to positions once
+    2. every lookup is array indexing | O(1) per date, vectorized over any number of dates
+4. bounds
+    1. dates and trading days after end extend the calendar lazily | the arrays are rebuilt with a later end
+    2. positions do not change when the calendar is extended, the start is fixed
+    3. dates before start and trading days before the first one raise ValueError
+"""
+#imports
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar, Holiday, GoodFriday, USLaborDay, USMartinLutherKingJr, USMemorialDay,
+    USPresidentsDay, USThanksgivingDay, nearest_workday, sunday_to_monday
+)
+
+#holidays
+class _ExchangeHolidays(AbstractHolidayCalendar):
+    """
+    @brief The full day holidays of the US equity exchanges
+    """
+    rules = [
+        Holiday("New Years Day", month=1, day=1, observance=sunday_to_monday),
+        USMartinLutherKingJr,
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday("Juneteenth", month=6, day=19, start_date="2022-01-01", observance=nearest_workday),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas", month=12, day=25, observance=nearest_workday)
+    ]
+
+#class
+class CalendarMgmt:
+    """
+    @brief A class to index trading days
+    @param start (str): The first calendar day
+    @param end (str): The last calendar day, extended when a lookup needs a later day
+    @param holidays (str | list): exchange | None for weekdays only | list of dates
+    @param fiscal_start_month (int): The first month of the fiscal year
+    @return (CalendarMgmt): The CalendarMgmt object
+
+    @example
+    calendar = CalendarMgmt("2000-01-01", "2030-12-31")
+    calendar.shift(history.index, -20)
+    calendar.period_start(history.index, "Q")
+
+    @details
+    is_trading_day -> np.ndarray | whether dates are trading days
+    ordinal -> np.ndarray | trading ordinal of dates
+    trading_day -> np.ndarray | trading day of ordinals
+    shift -> np.ndarray | trading day n trading days from dates
+    trading_days_between -> np.ndarray | trading days between two sets of dates
+    month | quarter | year | fiscal_quarter | fiscal_year -> np.ndarray | period of dates
+    period_start -> np.ndarray | first calendar day of the period of dates
+    trading_period_start -> np.ndarray | first trading day of the period of dates
+    """
+    _frequencies:tuple = ("M", "Q", "Y", "FQ", "FY")
+
+    def __init__(self, start:str = "1990-01-01", end:str = "2040-12-31", holidays = "exchange",
+                 fiscal_start_month:int = 1):
+        if not 1 <= fiscal_start_month <= 12:
+            raise ValueError("The fiscal start month must be within 1 and 12")
+
+        self._start:np.datetime64 = np.datetime64(pd.Timestamp(start).date(), "D")
+        self._end:np.datetime64 = np.datetime64(pd.Timestamp(end).date(), "D")
+        if self._end < self._start:
+            raise ValueError("The end must not be before the start")
+
+        self._holidays = holidays
+        self._fiscal_start_month:int = fiscal_start_month
+        self._build(self._end)
+
+    def _build(self, end:np.datetime64) -> None:
+        """
+        @brief Compute the arrays of every calendar day between start and end
+        @param end (np.datetime64): The last calendar day
+        """
+        holidays = self._holidays
+        if isinstance(holidays, str) and holidays == "exchange":
+            holidays = _ExchangeHolidays().holidays(start=pd.Timestamp(self._start), end=pd.Timestamp(end))
+        holidays = np.array([] if holidays is None else pd.DatetimeIndex(holidays).values, dtype="datetime64[D]")
+
+        #days
+        self._end = end
+        days = np.arange(self._start, self._end + 1, dtype="datetime64[D]")
+        trading = np.is_busday(days, holidays=holidays)
+        counted = np.cumsum(trading)
+        self._trading:np.ndarray = days[trading]
+        self._ordinal:np.ndarray = counted - 1
+        self._next_ordinal:np.ndarray = counted - trading
+        self._is_trading:np.ndarray = trading
+
+        #periods
+        months = days.astype("datetime64[M]").astype(np.int64)
+        fiscal = months - (self._fiscal_start_month - 1)
+        self._period:dict = {
+            "M": months,
+            "Q": months // 3,
+            "Y": months // 12,
+            "FQ": fiscal // 3,
+            "FY": fiscal // 12
+        }
+
+    def _extend(self, end:np.datetime64) -> None:
+        """
+        @brief Rebuild the arrays with a later end
+        @param end (np.datetime64): The calendar day that must be covered
+
+        @details
+        The end grows by at least a year, a run of later lookups does not rebuild every time
+        """
+        self._build(max(end, self._end + 366))
+
+    @property
+    def trading_days(self) -> np.ndarray:
+        """
+        @brief Get the trading days
+        @return (np.ndarray): The trading days, datetime64[D], position is the ordinal
+        """
+        return self._trading
+
+    def positions(self, dates) -> np.ndarray:
+        """
+        @brief Convert dates to calendar positions
+        @param dates (str | pd.Timestamp | pd.DatetimeIndex | pd.Series | np.ndarray): The dates, time zones are dropped
+        @return (np.ndarray): The positions, days since start
+
+        @details
+        Convert once and pass the positions to the lookups to skip the conversion
+        Dates after end extend the calendar, dates before start raise ValueError
+        """
+        if isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.integer):
+            positions = dates
+        elif isinstance(dates, np.ndarray) and np.issubdtype(dates.dtype, np.datetime64):
+            positions = (dates.astype("datetime64[D]") - self._start).astype(np.int64)
+        else:
+            index = pd.DatetimeIndex(np.atleast_1d(dates) if pd.api.types.is_scalar(dates) else dates)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            positions = (index.values.astype("datetime64[D]") - self._start).astype(np.int64)
+
+        if positions.size and positions.min() < 0:
+            raise ValueError(f"The dates must not be before {self._start}")
+        if positions.size and positions.max() >= len(self._ordinal):
+            self._extend(self._start + positions.max())
+        return positions
+
+    def is_trading_day(self, dates) -> np.ndarray:
+        """
+        @brief Check whether dates are trading days
+        @param dates: The dates or positions
+        @return (np.ndarray): bool
+        """
+        positions = self.positions(dates)
+        return self._is_trading[positions]
+
+    def ordinal(self, dates) -> np.ndarray:
+        """
+        @brief Get the trading ordinal of dates
+        @param dates: The dates or positions
+        @return (np.ndarray): The ordinal of the last trading day on or before every date, -1 if none
+        """
+        positions = self.positions(dates)
+        return self._ordinal[positions]
+
+    def trading_day(self, ordinals) -> np.ndarray:
+        """
+        @brief Get the trading day of ordinals
+        @param ordinals (np.ndarray): The trading ordinals
+        @return (np.ndarray): The trading days, datetime64[D]
+
+        @details
+        Ordinals after the last trading day extend the calendar, negative ordinals raise ValueError
+        """
+        ordinals = np.asarray(ordinals)
+        if ordinals.size and ordinals.min() < 0:
+            raise ValueError("The ordinals must not be before the first trading day")
+        while ordinals.size and ordinals.max() >= len(self._trading):
+            self._extend(self._end + (int(ordinals.max()) - len(self._trading) + 1) * 7 // 5 + 14)
+        return self._trading[ordinals]
+
+    def shift(self, dates, n:int) -> np.ndarray:
+        """
+        @brief Get the trading day n trading days from dates
+        @param dates: The dates or positions
+        @param n (int | np.ndarray): The trading days, negative goes back
+        @return (np.ndarray): The trading days, datetime64[D]
+
+        @details
+        A date that is not a trading day counts from the last trading day before it
+
+        @example
+        shift(dates, -20) -> 20 trading days back
+        """
+        return self.trading_day(self.ordinal(dates) + np.asarray(n))
+
+    def trading_days_between(self, start, end) -> np.ndarray:
+        """
+        @brief Get the trading days after start up to and including end
+        @param start: The dates or positions
+        @param end: The dates or positions
+        @return (np.ndarray): The number of trading days
+        """
+        return self.ordinal(end) - self.ordinal(start)
+
+    def month(self, dates) -> np.ndarray:
+        """
+        @brief Get the month of dates
+        @param dates: The dates or positions
+        @return (np.ndarray): 1 .. 12
+        """
+        positions = self.positions(dates)
+        return self._period["M"][positions] % 12 + 1
+
+    def quarter(self, dates) -> np.ndarray:
+        """
+        @brief Get the quarter of dates
+        @param dates: The dates or positions
+        @return (np.ndarray): 1 .. 4
+        """
+        positions = self.positions(dates)
+        return self._period["Q"][positions] % 4 + 1
+
+    def year(self, dates) -> np.ndarray:
+        """
+        @brief Get the year of dates
+        @param dates: The dates or positions
+        @return (np.ndarray): The year
+        """
+        positions = self.positions(dates)
+        return self._period["Y"][positions] + 1970
+
+    def fiscal_quarter(self, dates) -> np.ndarray:
+        """
+        @brief Get the fiscal quarter of dates
+        @param dates: The dates or positions
+        @return (np.ndarray): 1 .. 4
+        """
+        positions = self.positions(dates)
+        return self._period["FQ"][positions] % 4 + 1
+
+    def fiscal_year(self, dates) -> np.ndarray:
+        """
+        @brief Get the fiscal year of dates
+        @param dates: The dates or positions
+        @return (np.ndarray): The fiscal year, named after the calendar year it ends in
+        """
+        positions = self.positions(dates)
+        year = self._period["FY"][positions] + 1970
+        return year + (self._fiscal_start_month > 1)
+
+    def period_start(self, dates, freq:str = "M") -> np.ndarray:
+        """
+        @brief Get the first calendar day of the period of dates
+        @param dates: The dates or positions
+        @param freq (str): M | Q | Y | FQ | FY
+        @return (np.ndarray): The period starts, datetime64[D]
+        """
+        if freq not in self._frequencies:
+            raise ValueError(f"The frequency must be one of {', '.join(self._frequencies)}")
+
+        positions = self.positions(dates)
+        period = self._period[freq][positions]
+        if freq in ("M", "Q", "Y"):
+            months = period * {"M": 1, "Q": 3, "Y": 12}[freq]
+        else:
+            months = period * (3 if freq == "FQ" else 12) + (self._fiscal_start_month - 1)
+        return months.astype("datetime64[M]").astype("datetime64[D]")
+
+    def trading_period_start(self, dates, freq:str = "M") -> np.ndarray:
+        """
+        @brief Get the first trading day of the period of dates
+        @param dates: The dates or positions
+        @param freq (str): M | Q | Y | FQ | FY
+        @return (np.ndarray): The trading days, datetime64[D]
+        """
+        starts = np.maximum(self.period_start(dates, freq), self._start)
+        positions = self.positions(starts)
+        return self.trading_day(self._next_ordinal[positions])
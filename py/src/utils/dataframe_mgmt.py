@@ -11,6 +11,7 @@ Groups a dataframe
 @date 2024-03-20
 
 @dependencies
+numpy -> np
 pandas -> pd
 
 @todo
@@ -25,6 +26,7 @@ pandas -> pd
     4. fill duplicates
     5. drop outliers
     6. fill outliers
+    7. in place | chainable | bounded by a memory budget
 4. return group data by dates
     1. group by year as mean, std, count
     2. group by month as mean, std, count
@@ -59,6 +61,7 @@ pandas -> pd
     3. pivot table by column and row
 """
 #imports
+import numpy as np
 import pandas as pd
 
 #class
@@ -75,6 +78,13 @@ class DataframeMgmt:
     clean_drop_duplicates -> clean the data by dropping duplicates
     clean_fill_duplicates -> float | clean the data by filling duplicates
     clean_drop_outliers -> clean the data by dropping outliers
+    inplace_drop_na -> DataframeMgmt | drop na in place
+    inplace_fill_na -> DataframeMgmt | fill na in place
+    inplace_drop_duplicates -> DataframeMgmt | drop duplicates in place
+    inplace_drop_outliers -> DataframeMgmt | drop outliers in place
+    memory_usage -> int | bytes held by the data
+    memory_peak -> int | peak bytes observed while cleaning in place
+    memory_budget -> int | bytes the in place cleaning may not exceed
     group_by_year -> group the data by year
     group_by_month -> group the data by month
     group_by_quarter -> group the data by quarter
@@ -102,11 +112,18 @@ class DataframeMgmt:
     pivot_table_by_row -> get the pivot table by row
     pivot_table_by_column_row -> get the pivot table by column and row
     """
-    def __init__(self, data:pd.DataFrame = None):
+    def __init__(self, data:pd.DataFrame = None, memory_budget:int = None):
         self._data:pd.DataFrame = None
+        self._memory:dict = {
+            "budget": None,
+            "peak": 0
+        }
         if not data is None:
             self.data = data
 
+        if not memory_budget is None:
+            self.memory_budget = memory_budget
+
     @property
     def data(self) -> pd.DataFrame:
         """
@@ -125,6 +142,88 @@ class DataframeMgmt:
             raise ValueError("The data must be a pandas dataframe")
         
         self._data = data
+        self._memory["peak"] = self.memory_usage
+
+    @property
+    def memory_usage(self) -> int:
+        """
+        @brief Get the bytes held by the data
+        @return (int): The bytes held by the data, index included
+
+        @details
+        Object columns are counted by reference, not by content
+        """
+        if self._data is None:
+            return 0
+        return int(self._data.memory_usage(index=True, deep=False).sum())
+
+    @property
+    def memory_peak(self) -> int:
+        """
+        @brief Get the peak bytes observed while cleaning in place
+        @return (int): The peak bytes, data and transient buffers included
+        """
+        return self._memory["peak"]
+
+    @property
+    def memory_budget(self) -> int:
+        """
+        @brief Get the bytes the in place cleaning may not exceed
+        @return (int): The memory budget, None if unbounded
+        """
+        return self._memory["budget"]
+
+    @memory_budget.setter
+    def memory_budget(self, memory_budget:int) -> None:
+        """
+        @brief Set the bytes the in place cleaning may not exceed
+        @param memory_budget (int): The memory budget, None if unbounded
+        """
+        if not memory_budget is None and (not isinstance(memory_budget, int) or memory_budget <= 0):
+            raise ValueError("The memory budget must be a positive int")
+
+        self._memory["budget"] = memory_budget
+
+    def memory_reset(self) -> None:
+        """
+        @brief Reset the peak bytes to the bytes currently held by the data
+        """
+        self._memory["peak"] = self.memory_usage
+
+    def _reserve(self, transient:int) -> None:
+        """
+        @brief Account for a transient allocation on top of the data
+        @param transient (int): The bytes about to be allocated
+
+        @details
+        Raises MemoryError before allocating if the budget would be exceeded
+        """
+        required = self.memory_usage + int(transient)
+        if not self.memory_budget is None and required > self.memory_budget:
+            raise MemoryError(
+                f"Cleaning requires {required} bytes, the budget is {self.memory_budget} bytes"
+            )
+        self._memory["peak"] = max(self._memory["peak"], required)
+
+    def _keep_rows(self, keep:np.ndarray) -> None:
+        """
+        @brief Keep the rows selected by a boolean mask
+        @param keep (np.ndarray): The rows to keep
+
+        @details
+        No allocation when every row is kept
+        Otherwise the rows are dropped from the frame itself, the frame passed in as data is modified as well
+        A frame with duplicate index labels is filtered by position instead, dropping by label would drop more rows
+        """
+        if keep.all():
+            return
+
+        count = int(keep.sum())
+        self._reserve(keep.nbytes + self.memory_usage * count // max(len(keep), 1))
+        if self._data.index.is_unique:
+            self._data.drop(index=self._data.index[~keep], inplace=True)
+        else:
+            self._data = self._data[keep]
 
     def describe_data(self) -> pd.DataFrame:
         """
@@ -180,6 +279,109 @@ class DataframeMgmt:
         iqr = q3 - q1
         return self._data[~((self._data < (q1 - 1.5 * iqr)) | (self._data > (q3 + 1.5 * iqr))).any(axis=1)]
 
+    def inplace_drop_na(self) -> "DataframeMgmt":
+        """
+        @brief Clean the data in place by dropping na
+        @return (DataframeMgmt): The instance, for chaining
+
+        @details
+        Builds one row mask column by column instead of a full boolean frame
+
+        @note
+        Time: O(n * m)
+        Space: O(n) + the kept rows
+        """
+        keep = np.ones(len(self._data), dtype=bool)
+        self._reserve(keep.nbytes * 2)
+        for column in self._data.columns:
+            keep &= self._data[column].notna().to_numpy()
+
+        self._keep_rows(keep)
+        return self
+
+    def inplace_fill_na(self, value:float = 0) -> "DataframeMgmt":
+        """
+        @brief Clean the data in place by filling na
+        @param value (float): The value to fill na
+        @return (DataframeMgmt): The instance, for chaining
+
+        @details
+        Float columns with a numeric value are written through their own buffers, one column at a time
+        Other columns, e.g. datetime or object, are filled like clean_fill_na and replaced
+        Every replaced column is filled before anything is written, a failure leaves the data unchanged
+        The frame passed in as data is modified as well
+
+        @note
+        Time: O(n * m)
+        Space: O(n) + the replaced columns
+        """
+        self._reserve(len(self._data))
+        numeric = isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+        masks = {}
+        replaced = {}
+        for column in self._data.columns:
+            series = self._data[column]
+            mask = series.isna().to_numpy()
+            if not mask.any():
+                continue
+            if numeric and isinstance(series.dtype, np.dtype) and series.dtype.kind == "f":
+                masks[column] = mask
+            else:
+                self._reserve(int(series.memory_usage(index=False, deep=False)))
+                replaced[column] = series.fillna(value)
+
+        for column, mask in masks.items():
+            self._data.loc[mask, column] = value
+        for column, series in replaced.items():
+            self._data[column] = series
+
+        return self
+
+    def inplace_drop_duplicates(self, index:bool = False) -> "DataframeMgmt":
+        """
+        @brief Clean the data in place by dropping duplicates
+        @param index (bool): True to drop the rows whose index repeats an earlier row, False to compare the values
+        @return (DataframeMgmt): The instance, for chaining
+
+        @details
+        Use index for time series, equal values on different dates are different observations
+
+        @note
+        Time: O(n * m)
+        Space: O(n) + the kept rows
+        """
+        #row hashes and the mask
+        self._reserve(len(self._data) * (np.dtype(np.uint64).itemsize + 1))
+        duplicated = self._data.index.duplicated() if index else self._data.duplicated().to_numpy()
+        keep = ~duplicated
+        self._keep_rows(keep)
+        return self
+
+    def inplace_drop_outliers(self) -> "DataframeMgmt":
+        """
+        @brief Clean the data in place by dropping outliers
+        @return (DataframeMgmt): The instance, for chaining
+
+        @details
+        Outliers are values outside of q1 - 1.5 * iqr and q3 + 1.5 * iqr of their column
+        Builds one row mask column by column instead of a full boolean frame
+
+        @note
+        Time: O(n * m)
+        Space: O(n) + the kept rows
+        """
+        keep = np.ones(len(self._data), dtype=bool)
+        for column in self._data.select_dtypes(include="number").columns:
+            #the mask, the comparison and the sorted copy behind the quantiles
+            self._reserve(keep.nbytes * 2 + self._data[column].nbytes)
+            q1, q3 = self._data[column].quantile([0.25, 0.75])
+            iqr = q3 - q1
+            values = self._data[column].to_numpy()
+            keep &= ~((values < (q1 - 1.5 * iqr)) | (values > (q3 + 1.5 * iqr)))
+
+        self._keep_rows(keep)
+        return self
+
     def group_by_year(self) -> pd.DataFrame:
         """
         @brief Group the data by year
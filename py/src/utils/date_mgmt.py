@@ -1,7 +1,3 @@
-<<<<<<< HEAD
-import pandas as pd
-class Date:
-=======
 """
 @gitsil10
 @file date_mgmt.py
@@ -12,9 +8,15 @@ class Date:
 
 @dependencies
 pandas -> pd
+utils.calendar_mgmt -> CalendarMgmt
+
+@details
+Dates relative to today
+For trading days and vectorized lookups over many dates, use the calendar of get_calendar
 """
 #imports
 import pandas as pd
+from utils.calendar_mgmt import CalendarMgmt
 
 #class
 class DateMgmt:
@@ -26,37 +28,19 @@ class DateMgmt:
     @param current_month_date (pd.Timestamp.date): The current month date
     @param next_month (int): The next month
     @param last_month (int): The last month
+    @param calendar (CalendarMgmt): The trading calendar, built on first use
     @return (Date): The Date object
     """
->>>>>>> feat/python/analytics
     def __init__(self):
-        self.current_month:int = pd.Timestamp.today().month
-        self.current_year:int = pd.Timestamp.today().year
-        self.today:pd.Timestamp.date = pd.Timestamp.today().date()
+        now = pd.Timestamp.today()
+        self.current_month:int = now.month
+        self.current_year:int = now.year
+        self.today:pd.Timestamp.date = now.date()
         self.current_month_date:pd.Timestamp.date = self.today.replace(day=1)
         self.next_month:int = (self.current_month_date + pd.DateOffset(months=1)).date()
         self.last_month:int = (self.current_month_date - pd.DateOffset(months=1)).date()
-<<<<<<< HEAD
-    def get_current_month(self) -> int:
-        return self.current_month
-    def get_next_month(self) -> int:
-        return self.next_month
-    def get_last_month(self) -> int:
-        return self.last_month
-    def get_current_year(self) -> int:
-        return self.current_year
-    def get_last_year(self) -> int:
-        return self.current_year - 1
-    def get_current_month_date(self) -> pd.Timestamp.date:
-        return self.current_month_date
-    def get_today(self) -> pd.Timestamp.date:
-        return self.today
-    def get_last_year_date(self) -> pd.Timestamp.date:
-        return self.current_month_date - pd.DateOffset(years=1)
-    def get_previous_date(self, months:int) -> pd.Timestamp:
-        return self.current_month_date - pd.DateOffset(months=months)
-    def get_date(self, date:str) -> pd.Timestamp.date:
-=======
+        self.calendar:CalendarMgmt = None
+        self._calendar_arguments:tuple = None
 
     def get_current_month(self) -> int:
         """
@@ -198,5 +182,43 @@ class DateMgmt:
         Time: O(1)
         Space: O(1)
         """
->>>>>>> feat/python/analytics
-        return pd.Timestamp(date).date()
\ No newline at end of file
+        return pd.Timestamp(date).date()
+
+    def get_calendar(self, start:str = "1990-01-01", end:str = None, holidays = "exchange",
+                     fiscal_start_month:int = 1) -> CalendarMgmt:
+        """
+        @brief Get the trading calendar
+        @param start (str): The first calendar day
+        @param end (str): The last calendar day, defaults to ten years from today
+        @param holidays (str | list): exchange | None for weekdays only | list of dates
+        @param fiscal_start_month (int): The first month of the fiscal year
+        @return (CalendarMgmt): The trading calendar
+
+        @details
+        Built once and reused, pass other arguments to build a new one
+
+        @note
+        Time: O(days) on the first call, O(1) afterwards
+        Space: O(days)
+        """
+        end = end if end else str(self.today.replace(year=self.current_year + 10, day=1))
+        arguments = (start, end, holidays if isinstance(holidays, str) or holidays is None else tuple(holidays), fiscal_start_month)
+        if self._calendar_arguments != arguments:
+            self.calendar = CalendarMgmt(start, end, holidays, fiscal_start_month)
+            self._calendar_arguments = arguments
+        return self.calendar
+
+    def get_previous_trading_date(self, days:int) -> pd.Timestamp.date:
+        """
+        @brief Get the trading date a number of trading days before today
+        @param days (int): The number of trading days to go back
+        @return (pd.Timestamp.date): The trading date
+
+        @details
+        Today counts as the last trading day on or before today
+
+        @note
+        Time: O(1) once the calendar is built
+        Space: O(1)
+        """
+        return pd.Timestamp(self.get_calendar().shift(self.today, -days)[0]).date()
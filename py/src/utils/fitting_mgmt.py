@@ -0,0 +1,269 @@
+"""
+@gitsil10
+@file fitting_mgmt.py
+@brief distribution fitting
+@details A file to fit distributions to many series and select the best one
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+concurrent.futures -> ProcessPoolExecutor
+hashlib -> sha256
+json
+os -> path | makedirs | fdopen | remove | replace
+numpy -> np
+scipy.stats -> st
+tempfile -> mkstemp
+
+@details
+A file to fit and select distributions
+1. fitting
+    1. maximum likelihood fit of every candidate distribution to every series
+    2. series are fitted in parallel across a process pool
+2. selection
+    1. aic -> 2k - 2 log(L)
+    2. bic -> k log(n) - 2 log(L)
+    3. ks -> kolmogorov-smirnov statistic | largest distance between the empirical and fitted cdf
+    4. smaller is better for all of them
+3. cache
+    1. keyed by a hash of the data and the candidates
+    2. in memory and optionally as json files in a directory | survives between runs
+    3. unchanged series are not fitted again
+    4. files are written to a temporary file first | a corrupt file is fitted again
+"""
+#imports
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+import json
+from os import path, makedirs, fdopen, remove, replace
+from tempfile import mkstemp
+import numpy as np
+import scipy.stats as st
+
+#distributions
+_candidates:dict = {
+    "normal": st.norm,
+    "t": st.t,
+    "gamma": st.gamma,
+    "weibull": st.weibull_min,
+    "exponential": st.expon,
+    "uniform": st.uniform,
+    "laplace": st.laplace,
+    "logistic": st.logistic
+}
+
+#workers
+def _fit_series(values:np.ndarray, names:tuple) -> dict:
+    """
+    @brief Fit the candidate distributions to one series
+    @param values (np.ndarray): The series, without nan
+    @param names (tuple): The candidate distributions
+    @return (dict): name -> params | log_likelihood | aic | bic | ks | ks_pvalue
+
+    @details
+    Candidates that fail to fit numerically or have an infinite likelihood are left out
+    """
+    fits = {}
+    count = len(values)
+    for name in names:
+        distribution = _candidates[name]
+        try:
+            params = distribution.fit(values)
+            log_likelihood = float(np.sum(distribution.logpdf(values, *params)))
+            if not np.isfinite(log_likelihood):
+                continue
+            ks = st.kstest(values, distribution.cdf, args=params)
+        except (ValueError, RuntimeError, FloatingPointError):
+            continue
+
+        k = len(params)
+        fits[name] = {
+            "params": [float(param) for param in params],
+            "log_likelihood": log_likelihood,
+            "aic": 2 * k - 2 * log_likelihood,
+            "bic": k * np.log(count) - 2 * log_likelihood,
+            "ks": float(ks.statistic),
+            "ks_pvalue": float(ks.pvalue)
+        }
+    return fits
+
+#class
+class FittingMgmt:
+    """
+    @brief A class to fit distributions to many series
+    @param candidates (tuple): The candidate distributions
+    @param cache_dir (str): The directory of the json cache, None keeps the cache in memory only
+    @param workers (int): The number of processes, None or 1 fits in this process
+
+    @details
+    fit -> dict | fit the candidates to every series and rank them
+    rank -> list | rank the fitted candidates of a series
+    distribution -> st.rv_continuous | the scipy distribution of a candidate
+    """
+    def __init__(self, candidates:tuple = ("normal", "t", "gamma", "weibull", "laplace", "logistic"),
+                 cache_dir:str = None, workers:int = None):
+        unknown = set(candidates) - set(_candidates)
+        if unknown:
+            raise ValueError(f"Unknown distributions {', '.join(sorted(unknown))}")
+
+        self._fitting:dict = {
+            "candidates": tuple(candidates),
+            "cache_dir": cache_dir,
+            "workers": workers,
+            "cache": {}
+        }
+        if not cache_dir is None:
+            makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def candidates(self) -> tuple:
+        """
+        @brief Get the candidate distributions
+        @return (tuple): The candidate distributions
+        """
+        return self._fitting["candidates"]
+
+    @property
+    def cache(self) -> dict:
+        """
+        @brief Get the fits cached in memory
+        @return (dict): data hash -> fits
+        """
+        return self._fitting["cache"]
+
+    @staticmethod
+    def distribution(name:str) -> st.rv_continuous:
+        """
+        @brief Get the scipy distribution of a candidate
+        @param name (str): The candidate
+        @return (st.rv_continuous): The scipy distribution, use with the fitted params
+        """
+        return _candidates[name]
+
+    def fit(self, series, criterion:str = "aic") -> dict:
+        """
+        @brief Fit the candidates to every series and rank them
+        @param series (dict | array): key -> series | (series, observations) | nan values are ignored
+        @param criterion (str): aic | bic | ks
+        @return (dict): key -> best | ranking | fits
+
+        @details
+        Series found in the cache are not fitted again
+        The remaining series are fitted across the process pool
+
+        @note
+        Time: O(series * candidates * fit) / workers
+        Space: O(series * candidates)
+        """
+        if criterion not in ("aic", "bic", "ks"):
+            raise ValueError("The criterion must be aic, bic or ks")
+
+        if isinstance(series, dict):
+            items = list(series.items())
+        else:
+            items = list(enumerate(np.atleast_2d(np.asarray(series, dtype=float))))
+
+        #cached | pending
+        fits = {}
+        pending = {}
+        for key, values in items:
+            values = np.asarray(values, dtype=float).ravel()
+            values = values[~np.isnan(values)]
+            digest = self._digest(values)
+            cached = self._load(digest)
+            if cached is None:
+                pending.setdefault(digest, (values, []))[1].append(key)
+            else:
+                fits[key] = cached
+
+        digests = list(pending)
+        arguments = ([pending[digest][0] for digest in digests], [self.candidates] * len(digests))
+        workers = self._fitting["workers"]
+        if workers is None or workers <= 1 or len(digests) < 2:
+            results = list(map(_fit_series, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunksize = max(1, len(digests) // (4 * workers))
+                results = list(pool.map(_fit_series, *arguments, chunksize=chunksize))
+
+        for digest, result in zip(digests, results):
+            self._store(digest, result)
+            for key in pending[digest][1]:
+                fits[key] = result
+
+        ranked = {}
+        for key, _ in items:
+            ranking = self.rank(fits[key], criterion)
+            ranked[key] = {
+                "best": ranking[0] if ranking else None,
+                "ranking": ranking,
+                "fits": fits[key]
+            }
+        return ranked
+
+    @staticmethod
+    def rank(fits:dict, criterion:str = "aic") -> list:
+        """
+        @brief Rank the fitted candidates of a series
+        @param fits (dict): name -> fit
+        @param criterion (str): aic | bic | ks
+        @return (list): The candidates, best first
+        """
+        return sorted(fits, key=lambda name: fits[name][criterion])
+
+    def _digest(self, values:np.ndarray) -> str:
+        """
+        @brief Hash the data and the candidates
+        @param values (np.ndarray): The series
+        @return (str): The hash
+        """
+        digest = sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+        digest.update(",".join(self.candidates).encode())
+        return digest.hexdigest()
+
+    def _load(self, digest:str) -> dict:
+        """
+        @brief Get the fits of a hash from memory or from the cache directory
+        @param digest (str): The hash
+        @return (dict): The fits, None if not cached or the file is corrupt
+        """
+        if digest in self.cache:
+            return self.cache[digest]
+
+        cache_dir = self._fitting["cache_dir"]
+        if cache_dir is None or not path.exists(path.join(cache_dir, f"{digest}.json")):
+            return None
+
+        try:
+            with open(path.join(cache_dir, f"{digest}.json"), "r") as f:
+                fits = json.load(f)
+        except (ValueError, UnicodeDecodeError):
+            return None
+        if not isinstance(fits, dict):
+            return None
+
+        self.cache[digest] = fits
+        return fits
+
+    def _store(self, digest:str, fits:dict) -> None:
+        """
+        @brief Cache the fits of a hash in memory and in the cache directory
+        @param digest (str): The hash
+        @param fits (dict): The fits
+
+        @details
+        The file is written to a unique temporary file and moved into place, a reader never sees a partial file
+        Concurrent writers of the same hash never share the temporary file
+        """
+        self.cache[digest] = fits
+        cache_dir = self._fitting["cache_dir"]
+        if not cache_dir is None:
+            file_name = path.join(cache_dir, f"{digest}.json")
+            descriptor, temporary = mkstemp(dir=cache_dir, suffix=".tmp")
+            try:
+                with fdopen(descriptor, "w") as f:
+                    json.dump(fits, f)
+                replace(temporary, file_name)
+            except BaseException:
+                remove(temporary)
+                raise
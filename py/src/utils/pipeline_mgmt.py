@@ -0,0 +1,253 @@
+"""
+@gitsil10
+@file pipeline_mgmt.py
+@brief A class to run the data pipeline
+@details A class to run a graph of stages for many symbols
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+concurrent.futures -> ProcessPoolExecutor | ThreadPoolExecutor | as_completed | wait
+os -> path | makedirs | remove | replace
+pickle
+
+@details
+1. stages
+    1. a function of the symbol and the outputs of the stages it depends on
+    2. the stages form a directed acyclic graph, run in dependency order
+    3. io stages run on a thread pool | cpu stages run in the process of the symbol
+2. symbols
+    1. every symbol runs the whole graph
+    2. independent symbols run concurrently across a process pool
+3. checkpoints
+    1. the output of every finished stage is pickled to checkpoint_dir/run_id/symbol/stage.pkl
+    2. a finished symbol is marked with checkpoint_dir/run_id/symbol/_done, its stage checkpoints are removed
+    3. an interrupted run resumes after the last finished stage of every symbol
+    4. a new run id starts over | e.g. the date, the inputs of a later day are fetched again
+"""
+#imports
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from os import path, makedirs, remove, replace
+import pickle
+
+#class
+class PipelineMgmt:
+    """
+    @brief A class to run the data pipeline
+    @param checkpoint_dir (str): The path to the checkpoints
+    @param workers (int): The number of processes, None or 1 runs the symbols in this process
+    @param io_workers (int): The number of threads for the io stages of a symbol
+    @param run_id (str): The run the checkpoints belong to, None shares them between every run
+    @return (PipelineMgmt): The PipelineMgmt object
+
+    @example
+    pipeline = PipelineMgmt(workers=8, run_id="2026-10-19")
+    pipeline.add_stage("fetch", fetch, kind="io")
+    pipeline.add_stage("clean", clean, ("fetch",))
+    pipeline.run(["AAPL", "MSFT"])
+
+    @details
+    add_stage -> None | declare a stage
+    order -> list | the stages in dependency order
+    run_symbol -> dict | run the stages of one symbol
+    run -> dict | run the stages of many symbols
+    reset -> None | remove the checkpoints of a symbol
+    """
+    def __init__(self, checkpoint_dir:str = "data/processed/checkpoints", workers:int = None, io_workers:int = 4,
+                 run_id:str = None):
+        self.checkpoint_dir:str = checkpoint_dir if run_id is None else path.join(checkpoint_dir, str(run_id))
+        self.run_id:str = run_id
+        self.workers:int = workers
+        self.io_workers:int = io_workers
+        self._stages:dict = {}
+
+    @property
+    def stages(self) -> dict:
+        """
+        @brief Get the stages
+        @return (dict): stage -> function | depends | kind
+        """
+        return self._stages
+
+    def add_stage(self, name:str, function, depends:tuple = (), kind:str = "cpu") -> None:
+        """
+        @brief Declare a stage
+        @param name (str): The stage
+        @param function (callable): function(symbol, *outputs of depends) -> output, defined at module level
+        @param depends (tuple): The stages whose outputs it takes, in order
+        @param kind (str): cpu | io
+        """
+        if name in self._stages:
+            raise ValueError(f"The stage {name} is already declared")
+        if kind not in ("cpu", "io"):
+            raise ValueError("The kind must be cpu or io")
+
+        self._stages[name] = {"function": function, "depends": tuple(depends), "kind": kind}
+
+    def order(self) -> list:
+        """
+        @brief Get the stages in dependency order
+        @return (list): The stages, every stage after the stages it depends on
+
+        @note
+        Time: O(stages + dependencies)
+        Space: O(stages)
+        """
+        for name, stage in self._stages.items():
+            unknown = [depend for depend in stage["depends"] if depend not in self._stages]
+            if unknown:
+                raise ValueError(f"The stage {name} depends on unknown stages {', '.join(unknown)}")
+
+        remaining = {name: len(stage["depends"]) for name, stage in self._stages.items()}
+        ordered = [name for name, count in remaining.items() if count == 0]
+        for name in ordered:
+            for other, stage in self._stages.items():
+                if name in stage["depends"]:
+                    remaining[other] -= stage["depends"].count(name)
+                    if remaining[other] == 0:
+                        ordered.append(other)
+
+        if len(ordered) != len(self._stages):
+            raise ValueError("The stages must not depend on each other in a cycle")
+        return ordered
+
+    def run_symbol(self, symbol:str) -> dict:
+        """
+        @brief Run the stages of one symbol
+        @param symbol (str): The symbol
+        @return (dict): symbol | status -> done | error
+
+        @details
+        Stages finished by an interrupted run with the same run id are loaded from their checkpoints
+        io stages are submitted to threads as soon as their dependencies finish
+        cpu stages run in this thread while io stages are in flight
+        Once every stage finished, the symbol is marked done and its stage checkpoints are removed
+        """
+        if self._is_done(symbol):
+            return {"symbol": symbol, "status": "done"}
+
+        order = self.order()
+        finished = {name for name in order if path.exists(self._checkpoint(symbol, name))}
+        pending = [name for name in order if name not in finished]
+        outputs = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.io_workers) as threads:
+            while pending or running:
+                ready = [name for name in pending if all(depend in finished for depend in self._stages[name]["depends"])]
+                for name in ready:
+                    if self._stages[name]["kind"] == "io":
+                        pending.remove(name)
+                        running[threads.submit(self._call, symbol, name, outputs)] = name
+
+                cpu = [name for name in ready if self._stages[name]["kind"] == "cpu"]
+                if cpu:
+                    pending.remove(cpu[0])
+                    self._finish(symbol, cpu[0], self._call(symbol, cpu[0], outputs), outputs, finished)
+                    continue
+
+                if not running:
+                    break
+
+                complete, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in complete:
+                    self._finish(symbol, running.pop(future), future.result(), outputs, finished)
+
+        self._mark_done(symbol)
+        for name in order:
+            if path.exists(self._checkpoint(symbol, name)):
+                remove(self._checkpoint(symbol, name))
+        return {"symbol": symbol, "status": "done"}
+
+    def run(self, symbols:list) -> dict:
+        """
+        @brief Run the stages of many symbols
+        @param symbols (list): The symbols
+        @return (dict): symbol -> status | error
+
+        @details
+        A failing symbol does not stop the others, its finished stages are kept for the next run
+
+        @note
+        Time: O(symbols * stages) / workers
+        Space: O(workers * outputs of a symbol)
+        """
+        #finished symbols are not sent to the pool
+        results = {symbol: {"symbol": symbol, "status": "done"} for symbol in symbols if self._is_done(symbol)}
+        symbols = [symbol for symbol in symbols if symbol not in results]
+        if self.workers is None or self.workers <= 1:
+            for symbol in symbols:
+                results[symbol] = self._safe_run(symbol)
+            return results
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._safe_run, symbol): symbol for symbol in symbols}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
+
+    def reset(self, symbol:str) -> None:
+        """
+        @brief Remove the checkpoints of a symbol, the next run starts over
+        @param symbol (str): The symbol
+        """
+        for file_name in [self._done(symbol)] + [self._checkpoint(symbol, name) for name in self._stages]:
+            if path.exists(file_name):
+                remove(file_name)
+
+    def _safe_run(self, symbol:str) -> dict:
+        """
+        @brief Run the stages of one symbol, catching the error of a failing stage
+        @param symbol (str): The symbol
+        @return (dict): status | error
+        """
+        try:
+            return self.run_symbol(symbol)
+        except Exception as e:
+            return {"symbol": symbol, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    def _call(self, symbol:str, name:str, outputs:dict):
+        """
+        @brief Call the function of a stage with the outputs of the stages it depends on
+        @param symbol (str): The symbol
+        @param name (str): The stage
+        @param outputs (dict): stage -> output, finished stages of earlier runs are loaded on demand
+        @return The output of the stage
+        """
+        arguments = []
+        for depend in self._stages[name]["depends"]:
+            if depend not in outputs:
+                with open(self._checkpoint(symbol, depend), "rb") as f:
+                    outputs[depend] = pickle.load(f)
+            arguments.append(outputs[depend])
+        return self._stages[name]["function"](symbol, *arguments)
+
+    def _finish(self, symbol:str, name:str, output, outputs:dict, finished:set) -> None:
+        """
+        @brief Keep and checkpoint the output of a stage
+        @param symbol (str): The symbol
+        @param name (str): The stage
+        @param output: The output of the stage
+        @param outputs (dict): stage -> output
+        @param finished (set): The finished stages
+        """
+        file_name = self._checkpoint(symbol, name)
+        makedirs(path.dirname(file_name), exist_ok=True)
+        with open(f"{file_name}.tmp", "wb") as f:
+            pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+        replace(f"{file_name}.tmp", file_name)
+        outputs[name] = output
+        finished.add(name)
+
+    def _checkpoint(self, symbol:str, name:str) -> str:
+        return path.join(self.checkpoint_dir, symbol, f"{name}.pkl")
+
+    def _done(self, symbol:str) -> str:
+        return path.join(self.checkpoint_dir, symbol, "_done")
+
+    def _is_done(self, symbol:str) -> bool:
+        return path.exists(self._done(symbol))
+
+    def _mark_done(self, symbol:str) -> None:
+        makedirs(path.join(self.checkpoint_dir, symbol), exist_ok=True)
+        open(self._done(symbol), "w").close()
@@ -7,10 +7,34 @@
 @date 2024-03-20
 
 @dependencies
-os -> path
+fastparquet
+json
+numpy -> np
+os -> path | makedirs | remove | rename | replace
+shutil -> rmtree
+pandas -> pd
+utils.stage_mgmt -> StageMgmt
+utils.writer_mgmt -> WriterMgmt
+
+@details
+1. text -> appended to files in the raw, processed, and output paths
+2. dataframes -> parquet datasets through fastparquet, compressed with cramjam codecs
+    1. partitioned by symbol and date | one directory per partition value
+    2. reads prune partitions by symbol and date and load only the requested columns
+3. arrays -> .npy files or fixed-width binary records
+    1. read as memory maps | processes reading the same file share the page cache
+    2. dataframes of one numeric dtype wrap the memory map without copying
+4. stages -> manifest of the inputs every output was built from | unchanged outputs are skipped
 """
 #imports
-from os import path
+import json
+from os import path, makedirs, remove, rename, replace
+from shutil import rmtree
+import fastparquet
+import numpy as np
+import pandas as pd
+from utils.stage_mgmt import StageMgmt
+from utils.writer_mgmt import WriterMgmt
 
 #class
 class ProcessMgmt:
@@ -94,6 +118,30 @@ class ProcessMgmt:
             return True
         return False
 
+    def replace_data(self, path_name:str, file_name:str, data:str) -> bool:
+        """
+        @brief Replace the content of a file
+        @param path_name (str): The path to the file
+        @param file_name (str): The file name
+        @param data (str): The data to write
+        @return (bool): True if the file was written, False otherwise
+
+        @details
+        Same rules as write_data, but the file holds only data afterwards.
+        The data is written to a temporary file first and moved over the file,
+        a reader never sees a partial file and writing twice gives the same file.
+        """
+        if path.isdir(path_name) and data and len(data) > 0:
+            target = path.join(path_name, file_name)
+            with open(f"{target}.tmp", "w") as f:
+                f.write(data)
+            replace(f"{target}.tmp", target)
+            return True
+        return False
+
+    def replace_output(self, file_name:str, data:str) -> bool:
+        return self.replace_data(self.path_output(), file_name, data)
+
     def write_raw(self, file_name:str, data:str) -> bool:
         return self.write_data(self.path_raw(), file_name, data)
 
@@ -101,4 +149,260 @@ class ProcessMgmt:
         return self.write_data(self.path_processed(), file_name, data)
 
     def write_output(self, file_name:str, data:str) -> bool:
-        return self.write_data(self.path_output(), file_name, data)
\ No newline at end of file
+        return self.write_data(self.path_output(), file_name, data)
+
+    def writer(self, flush_size:int = 1 << 20, flush_interval:float = 1.0,
+               durability:str = "flush", background:bool = False) -> WriterMgmt:
+        """
+        @brief Get a buffered writer for the raw, processed, and output data
+        @param flush_size (int): The buffered bytes per file that trigger a write
+        @param flush_interval (float): The seconds after which buffered data is written
+        @param durability (str): none | flush | fsync
+        @param background (bool): True to flush from a writer thread
+        @return (WriterMgmt): The writer, close it or use it as a context manager
+
+        @example
+        with ProcessMgmt().writer() as writer:
+            writer.write_raw("raw.txt", "Hello, World!")
+
+        @details
+        For high volumes of small records, write_data opens and closes the file on every call
+        The writer keeps one handle per file and writes in batches
+        """
+        return WriterMgmt(self.get_path(), flush_size, flush_interval, durability, background)
+
+    def path_stage(self, stage:str) -> str:
+        """
+        @brief Get the path to the raw, processed, or output data
+        @param stage (str): raw | processed | output
+        @return (str): The path to the data
+        """
+        if stage not in self.get_path():
+            raise ValueError(f"The stage must be one of {', '.join(self.get_path())}")
+        return self.get_path()[stage]
+
+    def write_frame(self, stage:str, name:str, data:pd.DataFrame, partition_on:tuple = ("symbol", "date"),
+                    date_format:str = "%Y-%m", compression:str = "ZSTD", overwrite:bool = False) -> bool:
+        """
+        @brief Write a dataframe to a partitioned parquet dataset
+        @param stage (str): raw | processed | output
+        @param name (str): The dataset name, a directory in the stage path
+        @param data (pd.DataFrame): The data to write
+        @param partition_on (tuple): The partition columns, those missing from the data are skipped
+        @param date_format (str): The format of the date partition when derived from a datetime index
+        @param compression (str): ZSTD | SNAPPY | GZIP | LZ4 | BROTLI | None
+        @param overwrite (bool): True to replace the dataset, False to append to it
+        @return (bool): True if the data was written, False otherwise
+
+        @example
+        write_frame("processed", "history", history.assign(symbol="AAPL"))
+
+        @details
+        If the stage path exists and the data is not empty, write the data to the dataset.
+        A date partition is derived from a datetime index when the data has no date column, by month by default.
+        If the dataset exists, the data is appended to it as new files, unless overwrite is set.
+        Otherwise, the dataset is created.
+        An overwrite is written to a temporary dataset that is swapped in once complete,
+        writing the same data twice gives the same dataset.
+
+        @note
+        Time: O(n)
+        Space: O(n)
+        """
+        if not path.isdir(self.path_stage(stage)) or not isinstance(data, pd.DataFrame) or data.empty:
+            return False
+
+        if "date" in partition_on and "date" not in data.columns and isinstance(data.index, pd.DatetimeIndex):
+            data = data.assign(date=data.index.strftime(date_format))
+
+        dataset = path.join(self.path_stage(stage), name)
+        target = f"{dataset}.tmp" if overwrite else dataset
+        if overwrite and path.exists(target):
+            rmtree(target)
+        makedirs(path.dirname(target) or ".", exist_ok=True)
+        fastparquet.write(
+            target, data,
+            partition_on=[column for column in partition_on if column in data.columns],
+            file_scheme="hive",
+            compression=compression,
+            append=not overwrite and path.exists(path.join(dataset, "_metadata"))
+        )
+
+        if overwrite:
+            #swap the complete dataset in, then drop the previous one
+            previous = f"{dataset}.old"
+            if path.exists(previous):
+                rmtree(previous)
+            if path.exists(dataset):
+                rename(dataset, previous)
+            rename(target, dataset)
+            if path.exists(previous):
+                rmtree(previous)
+        return True
+
+    def read_frame(self, stage:str, name:str, columns:list = None, symbols:list = None,
+                   start:str = None, end:str = None, date_format:str = "%Y-%m", filters:list = None) -> pd.DataFrame:
+        """
+        @brief Read a partitioned parquet dataset
+        @param stage (str): raw | processed | output
+        @param name (str): The dataset name
+        @param columns (list): The columns to load, None loads every column
+        @param symbols (list): The symbol partitions to load, None loads every symbol
+        @param start (str): The first date partition to load
+        @param end (str): The last date partition to load
+        @param date_format (str): The format the date partition was written with
+        @param filters (list): Additional fastparquet filters, e.g. [("symbol", "==", "AAPL")]
+        @return (pd.DataFrame): The data, empty if the dataset does not exist
+
+        @details
+        Partitions and row groups outside of symbols, start, end, and filters are not read.
+        Only the requested columns are decoded.
+        """
+        dataset = path.join(self.path_stage(stage), name)
+        if not path.exists(path.join(dataset, "_metadata")):
+            return pd.DataFrame()
+
+        filters = list(filters) if filters else []
+        if symbols is not None:
+            filters.append(("symbol", "in", list(symbols)))
+        if start is not None:
+            filters.append(("date", ">=", pd.Timestamp(start).strftime(date_format)))
+        if end is not None:
+            filters.append(("date", "<=", pd.Timestamp(end).strftime(date_format)))
+
+        return fastparquet.ParquetFile(dataset).to_pandas(columns=columns, filters=filters or None)
+
+    def stages(self, file_name:str = "manifest.json") -> StageMgmt:
+        """
+        @brief Get the manifest of the raw, processed, and output stages
+        @param file_name (str): The manifest file, next to the raw, processed, and output paths
+        @return (StageMgmt): The stage manifest
+
+        @example
+        stages = ProcessMgmt().stages()
+        if stages.is_stale("processed", "data/processed/AAPL", ["data/raw/AAPL.csv"], "v1"):
+            ...
+        """
+        return StageMgmt(path.join(path.dirname(self.path_processed()), file_name))
+
+    def write_array(self, stage:str, name:str, data:np.ndarray) -> bool:
+        """
+        @brief Write an array to a .npy file
+        @param stage (str): raw | processed | output
+        @param name (str): The file name, without the .npy extension
+        @param data (np.ndarray): The array, numeric or datetime
+        @return (bool): True if the array was written, False otherwise
+
+        @details
+        The file is replaced, not appended to
+        """
+        if not path.isdir(self.path_stage(stage)) or data is None:
+            return False
+
+        data = np.asarray(data)
+        if data.dtype.hasobject:
+            raise ValueError("Arrays of objects can not be memory mapped")
+        np.save(path.join(self.path_stage(stage), f"{name}.npy"), data, allow_pickle=False)
+        return True
+
+    def read_array(self, stage:str, name:str, mmap_mode:str = "r") -> np.ndarray:
+        """
+        @brief Read a .npy file as a memory map
+        @param stage (str): raw | processed | output
+        @param name (str): The file name, without the .npy extension
+        @param mmap_mode (str): r | r+ | c | None reads a private copy
+        @return (np.ndarray): A view of the file, None if it does not exist
+
+        @details
+        Pages are loaded on first access and shared with every process mapping the same file
+
+        @note
+        Time: O(1)
+        Space: O(1) until accessed
+        """
+        file_name = path.join(self.path_stage(stage), f"{name}.npy")
+        if not path.exists(file_name):
+            return None
+        return np.load(file_name, mmap_mode=mmap_mode, allow_pickle=False)
+
+    def read_binary(self, stage:str, file_name:str, dtype, shape:tuple = None,
+                    offset:int = 0, mmap_mode:str = "r") -> np.memmap:
+        """
+        @brief Read a file of fixed-width binary records as a memory map
+        @param stage (str): raw | processed | output
+        @param file_name (str): The file name
+        @param dtype (np.dtype): The record type, e.g. np.float64 or [("time", "<i8"), ("price", "<f8")]
+        @param shape (tuple): The shape, None infers the number of records from the file size
+        @param offset (int): The bytes to skip, e.g. a header
+        @param mmap_mode (str): r | r+ | c
+        @return (np.memmap): A view of the file, None if it does not exist
+        """
+        file_name = path.join(self.path_stage(stage), file_name)
+        if not path.exists(file_name):
+            return None
+        return np.memmap(file_name, dtype=np.dtype(dtype), mode=mmap_mode, offset=offset, shape=shape)
+
+    def write_array_frame(self, stage:str, name:str, data:pd.DataFrame) -> bool:
+        """
+        @brief Write a dataframe of one numeric dtype as .npy files
+        @param stage (str): raw | processed | output
+        @param name (str): The file name, without extension
+        @param data (pd.DataFrame): The data
+        @return (bool): True if the data was written, False otherwise
+
+        @details
+        name.npy -> the values | name.index.npy -> the index | name.json -> the column names
+        A string index, e.g. symbols, is stored as fixed-width unicode
+        Mixed dtypes, e.g. float and int columns, are rejected instead of upcast
+        Every dtype is checked before anything is written, name.json is written last and marks a complete frame
+        """
+        if not path.isdir(self.path_stage(stage)) or not isinstance(data, pd.DataFrame):
+            return False
+
+        if data.dtypes.nunique() > 1:
+            raise ValueError("The dataframe must have one numeric dtype, cast the columns first")
+        values = data.to_numpy()
+        if values.dtype.hasobject:
+            raise ValueError("The dataframe must have one numeric dtype")
+
+        index = data.index.to_numpy()
+        strings = index.dtype.hasobject or index.dtype.kind in ("U", "S")
+        if index.dtype.hasobject:
+            if not all(isinstance(label, str) for label in index):
+                raise ValueError("The index must be numeric, datetime or strings")
+            index = index.astype(str)
+
+        meta = path.join(self.path_stage(stage), f"{name}.json")
+        if path.exists(meta):
+            remove(meta)
+        self.write_array(stage, name, values)
+        self.write_array(stage, f"{name}.index", index)
+        with open(f"{meta}.tmp", "w") as f:
+            json.dump({
+                "columns": [str(column) for column in data.columns],
+                "index": data.index.name,
+                "index_dtype": "str" if strings else str(index.dtype)
+            }, f)
+        replace(f"{meta}.tmp", meta)
+        return True
+
+    def read_array_frame(self, stage:str, name:str, mmap_mode:str = "r") -> pd.DataFrame:
+        """
+        @brief Read a dataframe written by write_array_frame without copying its values
+        @param stage (str): raw | processed | output
+        @param name (str): The file name, without extension
+        @param mmap_mode (str): r | r+ | c
+        @return (pd.DataFrame): The data backed by the memory map, None if it does not exist or is incomplete
+        """
+        meta = path.join(self.path_stage(stage), f"{name}.json")
+        values = self.read_array(stage, name, mmap_mode)
+        if values is None or not path.exists(meta):
+            return None
+
+        with open(meta, "r") as f:
+            meta = json.load(f)
+        index = self.read_array(stage, f"{name}.index", mmap_mode)
+        if meta.get("index_dtype") == "str":
+            index = index.astype(object)
+        index = pd.Index(index, name=meta["index"])
+        return pd.DataFrame(values, index=index, columns=meta["columns"], copy=False)
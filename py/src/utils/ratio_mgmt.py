@@ -0,0 +1,372 @@
+"""
+@gitsil10
+@file ratio_mgmt.py
+@brief financial ratios
+@details A file to evaluate financial ratios for many securities at once
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+numpy -> np
+pandas -> pd
+
+@details
+A file to evaluate financial ratios
+1. line items
+    1. read once from the 10k | 10q statements and the info of every security
+    2. aligned into (symbols, periods) arrays | period 0 is the most recent
+    3. aligned by period end date, not by position
+        1. period 0 of a symbol -> its latest period end over every 10k (10q) statement
+        2. period k -> k years (quarters) before it, fiscal year ends may differ between symbols
+        3. a period missing from one statement is nan, it does not shift the older periods
+    4. missing items are nan
+2. ratios
+    1. declared as (operation, operands) | operands are line items or other ratios
+    2. operations
+        1. add | sub | mul | div -> element-wise
+        2. ttm -> trailing twelve months | sum of the latest four quarters | (symbols, 1)
+        3. average -> mean of a period and the period before | for balances
+    3. evaluated for every symbol in one vectorized operation
+    4. scalars -> info items and ttm ratios hold one value per symbol, they broadcast over the periods
+        1. declared by the line item or the operation, not inferred from the shape
+        2. a line item with a single period is a period, it is never broadcast
+    5. ratios computed from themselves, directly or through other ratios, are rejected
+3. cache
+    1. every evaluated line item and ratio is cached
+    2. adding a ratio does not recompute the others
+"""
+#imports
+import numpy as np
+import pandas as pd
+
+#class
+class RatioMgmt:
+    """
+    @brief A class to evaluate financial ratios for many securities
+    @param sources (dict): symbol -> FinancialSecurityMgmt | dict of statements and info
+    @param max_periods (int): The number of periods kept per statement
+
+    @details
+    load -> None | align the line items of the sources into arrays
+    add_ratio -> None | declare a ratio
+    evaluate -> np.ndarray | evaluate a line item or ratio for every symbol
+    to_frame -> pd.DataFrame | ratios of one period, one row per symbol
+    """
+    #line item -> (statement, labels tried in order)
+    _line_items:dict = {
+        "revenue": ("income_statement_10k", ("Total Revenue", "Operating Revenue")),
+        "gross_profit": ("income_statement_10k", ("Gross Profit",)),
+        "operating_income": ("income_statement_10k", ("Operating Income",)),
+        "net_income": ("income_statement_10k", ("Net Income", "Net Income Common Stockholders")),
+        "total_assets": ("balance_sheet_10k", ("Total Assets",)),
+        "total_liabilities": ("balance_sheet_10k", ("Total Liabilities Net Minority Interest",)),
+        "equity": ("balance_sheet_10k", ("Stockholders Equity", "Common Stock Equity")),
+        "current_assets": ("balance_sheet_10k", ("Current Assets",)),
+        "current_liabilities": ("balance_sheet_10k", ("Current Liabilities",)),
+        "operating_cash_flow": ("cash_flow_10k", ("Operating Cash Flow",)),
+        "free_cash_flow": ("cash_flow_10k", ("Free Cash Flow",)),
+        "revenue_q": ("income_statement_10q", ("Total Revenue", "Operating Revenue")),
+        "net_income_q": ("income_statement_10q", ("Net Income", "Net Income Common Stockholders")),
+        "free_cash_flow_q": ("cash_flow_10q", ("Free Cash Flow",)),
+        "market_cap": ("info", ("marketCap",))
+    }
+
+    #ratio -> (operation, operands)
+    _ratios:dict = {
+        "gross_margin": ("div", "gross_profit", "revenue"),
+        "operating_margin": ("div", "operating_income", "revenue"),
+        "net_margin": ("div", "net_income", "revenue"),
+        "average_equity": ("average", "equity"),
+        "average_assets": ("average", "total_assets"),
+        "roe": ("div", "net_income", "average_equity"),
+        "roa": ("div", "net_income", "average_assets"),
+        "leverage": ("div", "total_assets", "equity"),
+        "debt_to_equity": ("div", "total_liabilities", "equity"),
+        "current_ratio": ("div", "current_assets", "current_liabilities"),
+        "ttm_revenue": ("ttm", "revenue_q"),
+        "ttm_net_income": ("ttm", "net_income_q"),
+        "ttm_free_cash_flow": ("ttm", "free_cash_flow_q"),
+        "ttm_net_margin": ("div", "ttm_net_income", "ttm_revenue"),
+        "fcf_yield": ("div", "ttm_free_cash_flow", "market_cap")
+    }
+
+    _operations:dict = {
+        "add": 2,
+        "sub": 2,
+        "mul": 2,
+        "div": 2,
+        "ttm": 1,
+        "average": 1
+    }
+
+    def __init__(self, sources:dict = None, max_periods:int = 8):
+        self._symbols:tuple = ()
+        self._max_periods:int = max_periods
+        self._ratio_formulas:dict = dict(self._ratios)
+        self._cache:dict = {}
+        if not sources is None:
+            self.load(sources)
+
+    @property
+    def symbols(self) -> tuple:
+        """
+        @brief Get the symbols
+        @return (tuple): The symbols, one row each
+        """
+        return self._symbols
+
+    @property
+    def ratios(self) -> dict:
+        """
+        @brief Get the declared ratios
+        @return (dict): ratio -> (operation, operands)
+        """
+        return self._ratio_formulas
+
+    def load(self, sources:dict) -> None:
+        """
+        @brief Align the line items of the sources into arrays
+        @param sources (dict): symbol -> FinancialSecurityMgmt | dict of statements and info
+
+        @details
+        Clears the cache, every ratio is evaluated again from the new line items
+
+        @note
+        Time: O(symbols * line items)
+        Space: O(symbols * line items * periods)
+        """
+        self._symbols = tuple(sources)
+        self._cache = {}
+        items = {name: [] for name in self._line_items}
+        for source in sources.values():
+            series = {name: self._read(source, statement, labels)
+                      for name, (statement, labels) in self._line_items.items()}
+
+            #latest period end of every frequency, over every statement of the source
+            latest = {}
+            for name, values in series.items():
+                frequency = self._frequency(self._line_items[name][0])
+                if isinstance(values.index, pd.DatetimeIndex) and len(values):
+                    latest[frequency] = max(latest.get(frequency, values.index.max()), values.index.max())
+
+            for name, values in series.items():
+                frequency = self._frequency(self._line_items[name][0])
+                items[name].append(self._align_periods(values, latest.get(frequency), frequency))
+
+        for name, rows in items.items():
+            width = max((len(row) for row in rows), default=0) or 1
+            values = np.full((len(rows), width), np.nan)
+            for position, row in enumerate(rows):
+                values[position, :len(row)] = row
+            self._cache[name] = values
+
+    def add_ratio(self, name:str, operation:str, *operands:str, replace:bool = False) -> None:
+        """
+        @brief Declare a ratio
+        @param name (str): The ratio
+        @param operation (str): add | sub | mul | div | ttm | average
+        @param operands (str): The line items or ratios it is computed from
+        @param replace (bool): Replace a declared ratio, its dependents are evaluated again
+
+        @example
+        add_ratio("asset_turnover", "div", "revenue", "average_assets")
+
+        @details
+        Raises ValueError if the ratio would be computed from itself
+        """
+        if name in self._line_items:
+            raise ValueError(f"{name} is a line item")
+        if name in self._ratio_formulas and not replace:
+            raise ValueError(f"{name} is already declared")
+        if operation not in self._operations or len(operands) != self._operations[operation]:
+            raise ValueError(f"{operation} must be one of {', '.join(self._operations)} with matching operands")
+
+        if name in operands or name in self._dependencies(operands):
+            raise ValueError(f"{name} must not be computed from itself")
+
+        self._ratio_formulas[name] = (operation, *operands)
+        if replace:
+            for dependent in self._dependents(name):
+                self._cache.pop(dependent, None)
+
+    def evaluate(self, name:str) -> np.ndarray:
+        """
+        @brief Evaluate a line item or ratio for every symbol
+        @param name (str): The line item or ratio
+        @return (np.ndarray): (symbols, periods) | (symbols, 1) for ttm and info items
+
+        @note
+        Time: O(symbols * periods) on the first call, O(1) once cached
+        Space: O(symbols * periods)
+        """
+        if name in self._cache:
+            return self._cache[name]
+        if name in self._line_items:
+            raise ValueError("The line items must be loaded")
+        if name not in self._ratio_formulas:
+            raise ValueError(f"{name} is neither a line item nor a ratio")
+
+        operation, *operands = self._ratio_formulas[name]
+        values = [self.evaluate(operand) for operand in operands]
+        if operation == "ttm":
+            result = values[0][:, :4].sum(axis=1, keepdims=True)
+            if values[0].shape[1] < 4:
+                result[:] = np.nan
+        elif operation == "average":
+            result = np.full(values[0].shape, np.nan)
+            result[:, :-1] = (values[0][:, :-1] + values[0][:, 1:]) / 2
+        else:
+            left, right = self._align(*values, *(self._is_scalar(operand) for operand in operands))
+            if operation == "add":
+                result = left + right
+            elif operation == "sub":
+                result = left - right
+            elif operation == "mul":
+                result = left * right
+            else:
+                result = np.divide(left, right, out=np.full(left.shape, np.nan), where=right != 0)
+
+        self._cache[name] = result
+        return result
+
+    def to_frame(self, names:list = None, period:int = 0) -> pd.DataFrame:
+        """
+        @brief Get the ratios of one period, one row per symbol
+        @param names (list): The line items or ratios, defaults to every ratio
+        @param period (int): The period, 0 is the most recent
+        @return (pd.DataFrame): The ratios
+        """
+        names = list(self._ratio_formulas) if names is None else names
+        columns = {}
+        for name in names:
+            values = self.evaluate(name)
+            columns[name] = values[:, period] if period < values.shape[1] else np.nan
+        return pd.DataFrame(columns, index=pd.Index(self._symbols, name="symbol"))
+
+    def _dependencies(self, names:tuple) -> set:
+        """
+        @brief Get the ratios the names are computed from, directly or through other ratios
+        @param names (tuple): The line items or ratios
+        @return (set): The ratios
+        """
+        dependencies = set()
+        pending = [name for name in names if name in self._ratio_formulas]
+        while pending:
+            name = pending.pop()
+            for operand in self._ratio_formulas[name][1:]:
+                if operand in self._ratio_formulas and operand not in dependencies:
+                    dependencies.add(operand)
+                    pending.append(operand)
+        return dependencies
+
+    def _is_scalar(self, name:str) -> bool:
+        """
+        @brief Check whether a line item or ratio holds one value per symbol instead of periods
+        @param name (str): The line item or ratio
+        @return (bool): True for info items, ttm ratios and ratios of scalars only
+        """
+        if name in self._line_items:
+            return self._frequency(self._line_items[name][0]) == 0
+
+        operation, *operands = self._ratio_formulas[name]
+        if operation == "ttm":
+            return True
+        return all(self._is_scalar(operand) for operand in operands)
+
+    def _dependents(self, name:str) -> set:
+        """
+        @brief Get a ratio and every ratio computed from it
+        @param name (str): The ratio
+        @return (set): The ratio and its dependents
+        """
+        dependents = {name}
+        changed = True
+        while changed:
+            changed = False
+            for ratio, (_, *operands) in self._ratio_formulas.items():
+                if ratio not in dependents and dependents.intersection(operands):
+                    dependents.add(ratio)
+                    changed = True
+        return dependents
+
+    @staticmethod
+    def _align(left:np.ndarray, right:np.ndarray, left_scalar:bool = False, right_scalar:bool = False) -> tuple:
+        """
+        @brief Align two arrays to the same number of periods
+        @param left (np.ndarray): (symbols, periods)
+        @param right (np.ndarray): (symbols, periods)
+        @param left_scalar (bool): True if left holds one value per symbol
+        @param right_scalar (bool): True if right holds one value per symbol
+        @return (tuple): The arrays, a scalar broadcasts, otherwise cut to the shorter one
+        """
+        if left_scalar or right_scalar:
+            return left[:, :1] if left_scalar else left, right[:, :1] if right_scalar else right
+        width = min(left.shape[1], right.shape[1])
+        return left[:, :width], right[:, :width]
+
+    @staticmethod
+    def _frequency(statement:str) -> int:
+        """
+        @brief Get the months between the periods of a statement
+        @param statement (str): The statement, or info
+        @return (int): 12 for 10k | 3 for 10q | 0 for info
+        """
+        if statement.endswith("10k"):
+            return 12
+        return 3 if statement.endswith("10q") else 0
+
+    def _align_periods(self, values:pd.Series, latest:pd.Timestamp, frequency:int) -> np.ndarray:
+        """
+        @brief Place the values of a line item at their period
+        @param values (pd.Series): The values, indexed by period end date
+        @param latest (pd.Timestamp): The latest period end of the source, period 0
+        @param frequency (int): The months between periods
+        @return (np.ndarray): The values, period k at position k, nan for missing periods
+
+        @details
+        Period ends within half a period of k periods before latest are period k
+        Values without period end dates keep their order, most recent first
+        """
+        if not isinstance(values.index, pd.DatetimeIndex) or latest is None or frequency == 0:
+            return values.to_numpy(dtype=float)[:self._max_periods]
+
+        days = (latest - values.index).days.to_numpy()
+        periods = np.rint(days / (frequency * 365.25 / 12)).astype(int)
+        keep = (periods >= 0) & (periods < self._max_periods)
+        if not keep.any():
+            return np.empty(0)
+
+        aligned = np.full(periods[keep].max() + 1, np.nan)
+        aligned[periods[keep]] = values.to_numpy(dtype=float)[keep]
+        return aligned
+
+    def _read(self, source, statement:str, labels:tuple) -> pd.Series:
+        """
+        @brief Read a line item of a source
+        @param source (FinancialSecurityMgmt | dict): The source
+        @param statement (str): The statement, or info
+        @param labels (tuple): The labels tried in order
+        @return (pd.Series): The values indexed by period end date, most recent period first
+        """
+        data = source.get(statement) if isinstance(source, dict) else getattr(source, statement, None)
+        if data is None:
+            return pd.Series(dtype=float)
+
+        if statement == "info":
+            for label in labels:
+                if data.get(label) is not None:
+                    return pd.Series([data[label]], dtype=float)
+            return pd.Series(dtype=float)
+
+        for label in labels:
+            if label in data.index:
+                row = data.loc[label]
+                if isinstance(row, pd.DataFrame):
+                    row = row.iloc[0]
+                if not isinstance(row.index, pd.DatetimeIndex):
+                    converted = pd.to_datetime(row.index, errors="coerce")
+                    if not converted.isna().any():
+                        row = row.set_axis(converted)
+                row = row.sort_index(ascending=False) if isinstance(row.index, pd.DatetimeIndex) else row
+                return pd.to_numeric(row, errors="coerce").astype(float)
+        return pd.Series(dtype=float)
@@ -0,0 +1,228 @@
+"""
+@gitsil10
+@file simulation_mgmt.py
+@brief monte carlo simulation of price paths
+@details A file to simulate price paths calibrated from the history of a security
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+concurrent.futures -> ProcessPoolExecutor
+numpy -> np
+pandas -> pd
+
+@details
+A file to simulate price paths
+1. calibration
+    1. log returns of the closing prices of the history
+    2. drift -> mean of the log returns
+    3. volatility -> standard deviation of the log returns
+2. models
+    1. gbm -> geometric brownian motion | log return ~ N(drift, volatility^2) per step
+    2. bootstrap -> log returns resampled from the history with replacement
+3. memory
+    1. paths are generated in chunks of (chunk_size, n_steps)
+    2. each chunk is reduced before the next one is generated
+        1. terminal log return of every path | one float per path
+        2. sum of the price factors per step | mean path
+    3. the (n_paths, n_steps) path tensor is never held
+4. risk
+    1. percentiles of the terminal price
+    2. value at risk -> loss not exceeded with probability 1 - alpha
+    3. expected shortfall -> mean loss beyond the value at risk
+"""
+#imports
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+#workers
+def _simulate_chunk(model:str, drift:float, volatility:float, returns:np.ndarray,
+                    size:int, steps:int, seed:np.random.SeedSequence) -> tuple:
+    """
+    @brief Simulate one chunk of paths
+    @param model (str): gbm | bootstrap
+    @param drift (float): The mean log return per step
+    @param volatility (float): The standard deviation of the log return per step
+    @param returns (np.ndarray): The historical log returns, for bootstrap
+    @param size (int): The number of paths
+    @param steps (int): The number of steps
+    @param seed (np.random.SeedSequence): The seed of the chunk
+    @return (tuple): (terminal log returns -> (size,), sum of the price factors -> (steps,))
+    """
+    rng = np.random.default_rng(seed)
+    if model == "gbm":
+        paths = rng.standard_normal((size, steps))
+        paths *= volatility
+        paths += drift
+    else:
+        paths = returns[rng.integers(0, len(returns), size=(size, steps))]
+
+    np.cumsum(paths, axis=1, out=paths)
+    terminal = paths[:, -1].copy()
+    np.exp(paths, out=paths)
+    return terminal, paths.sum(axis=0)
+
+#class
+class SimulationMgmt:
+    """
+    @brief A class to simulate price paths
+    @param history (pd.DataFrame | pd.Series): The history of a security
+    @param column (str): The column of the closing prices
+
+    @details
+    calibrate -> bool | estimate the price, drift and volatility from a history
+    simulate -> dict | simulate price paths and reduce them to risk measures
+    """
+    def __init__(self, history:pd.DataFrame = None, column:str = "Close"):
+        self._simulation:dict = {
+            "price": None,
+            "returns": None,
+            "drift": None,
+            "volatility": None
+        }
+        if not history is None:
+            self.calibrate(history, column)
+
+    @property
+    def simulation(self) -> dict:
+        """
+        @brief Get the calibration
+        @return (dict): The calibration
+        """
+        return self._simulation
+
+    @property
+    def price(self) -> float:
+        """
+        @brief Get the last price of the history
+        @return (float): The last price of the history
+        """
+        return self._simulation["price"]
+
+    @property
+    def returns(self) -> np.ndarray:
+        """
+        @brief Get the log returns of the history
+        @return (np.ndarray): The log returns of the history
+        """
+        return self._simulation["returns"]
+
+    @property
+    def drift(self) -> float:
+        """
+        @brief Get the mean log return per step
+        @return (float): The mean log return per step
+        """
+        return self._simulation["drift"]
+
+    @property
+    def volatility(self) -> float:
+        """
+        @brief Get the standard deviation of the log return per step
+        @return (float): The standard deviation of the log return per step
+        """
+        return self._simulation["volatility"]
+
+    def calibrate(self, history:pd.DataFrame, column:str = "Close") -> bool:
+        """
+        @brief Estimate the price, drift and volatility from a history
+        @param history (pd.DataFrame | pd.Series | array): The history or the closing prices
+        @param column (str): The column of the closing prices, for a dataframe
+        @return (bool): True if calibrated, False if the history has less than three prices
+
+        @note
+        Time: O(n)
+        Space: O(n)
+        """
+        if isinstance(history, pd.DataFrame):
+            if column not in history.columns:
+                raise ValueError(f"The history must have a {column} column")
+            history = history[column]
+
+        prices = np.asarray(history, dtype=float)
+        prices = prices[np.isfinite(prices) & (prices > 0)]
+        if len(prices) < 3:
+            return False
+
+        returns = np.diff(np.log(prices))
+        self._simulation["price"] = float(prices[-1])
+        self._simulation["returns"] = returns
+        self._simulation["drift"] = float(returns.mean())
+        self._simulation["volatility"] = float(returns.std(ddof=1))
+        return True
+
+    def simulate(self, n_paths:int = 100000, n_steps:int = 252, model:str = "gbm",
+                 chunk_size:int = 10000, workers:int = None, seed:int = 0,
+                 percentiles:tuple = (1, 5, 25, 50, 75, 95, 99), alpha:float = 0.05) -> dict:
+        """
+        @brief Simulate price paths and reduce them to risk measures
+        @param n_paths (int): The number of paths
+        @param n_steps (int): The number of steps per path
+        @param model (str): gbm | bootstrap
+        @param chunk_size (int): The number of paths generated at once
+        @param workers (int): The number of processes, None or 1 simulates in this process
+        @param seed (int): The seed of the simulation
+        @param percentiles (tuple): The percentiles of the terminal price
+        @param alpha (float): The tail probability of the value at risk and expected shortfall
+        @return (dict): percentiles | var | es | mean_path | mean_terminal | count
+
+        @details
+        Every chunk has its own seed, the result does not depend on workers
+        var and es are losses relative to the current price, positive for a loss
+
+        @note
+        Time: O(n_paths * n_steps)
+        Space: O(chunk_size * n_steps + n_paths)
+        """
+        if self.price is None:
+            raise ValueError("The simulation must be calibrated")
+        if model not in ("gbm", "bootstrap"):
+            raise ValueError("The model must be gbm or bootstrap")
+        if n_paths < 1 or n_steps < 1 or chunk_size < 1 or alpha <= 0 or alpha >= 1:
+            raise ValueError("Paths, steps and chunk size must be positive, alpha within (0, 1)")
+
+        sizes = [chunk_size] * (n_paths // chunk_size)
+        if n_paths % chunk_size:
+            sizes.append(n_paths % chunk_size)
+        count = len(sizes)
+        arguments = (
+            [model] * count, [self.drift] * count, [self.volatility] * count, [self.returns] * count,
+            sizes, [n_steps] * count, np.random.SeedSequence(seed).spawn(count)
+        )
+
+        terminal = np.empty(n_paths)
+        path_sum = np.zeros(n_steps)
+        if workers is None or workers <= 1:
+            chunks = map(_simulate_chunk, *arguments)
+            position = self._reduce(chunks, terminal, path_sum)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                position = self._reduce(pool.map(_simulate_chunk, *arguments), terminal, path_sum)
+
+        loss = -np.expm1(terminal)
+        var = float(np.quantile(loss, 1 - alpha))
+        return {
+            "percentiles": dict(zip(percentiles, self.price * np.exp(np.percentile(terminal, percentiles)))),
+            "var": var,
+            "es": float(loss[loss >= var].mean()),
+            "mean_path": self.price * np.concatenate(([1.0], path_sum / position)),
+            "mean_terminal": float(self.price * np.exp(terminal).mean()),
+            "count": position
+        }
+
+    @staticmethod
+    def _reduce(chunks, terminal:np.ndarray, path_sum:np.ndarray) -> int:
+        """
+        @brief Fold simulated chunks into the terminal returns and the path sum
+        @param chunks (iterable): The (terminal, path sum) of each chunk
+        @param terminal (np.ndarray): The terminal log returns of every path
+        @param path_sum (np.ndarray): The sum of the price factors per step
+        @return (int): The number of paths folded
+        """
+        position = 0
+        for chunk_terminal, chunk_sum in chunks:
+            terminal[position:position + len(chunk_terminal)] = chunk_terminal
+            path_sum += chunk_sum
+            position += len(chunk_terminal)
+        return position
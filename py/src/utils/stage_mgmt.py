@@ -0,0 +1,252 @@
+"""
+@gitsil10
+@file stage_mgmt.py
+@brief A class to track the stages of the data pipeline
+@details A class to skip the stages whose inputs have not changed
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+hashlib -> sha256
+json
+os -> path | makedirs | replace | scandir | stat
+threading -> Lock
+
+@details
+1. manifest
+    1. json file | one record per stage output
+    2. record -> content hash of every input | version of the code and parameters
+2. stale
+    1. an output is stale if it has no record, its version changed, an input hash changed, or it is missing
+    2. fresh outputs are skipped
+3. partitions
+    1. every partition of an output has its own record
+    2. only the partitions whose inputs changed are rebuilt
+4. hashes
+    1. files -> sha256 of the content, read in blocks
+    2. directories -> sha256 of the relative paths and hashes of their files
+    3. a file is hashed again only if its size or modification time changed
+"""
+#imports
+from hashlib import sha256
+import json
+from os import path, makedirs, replace, scandir, stat
+from threading import Lock
+
+#class
+class StageMgmt:
+    """
+    @brief A class to track the stages of the data pipeline
+    @param manifest_path (str): The path to the manifest file
+    @return (StageMgmt): The StageMgmt object
+
+    @example
+    stages = ProcessMgmt().stages()
+    stages.run("processed", "data/processed/AAPL.csv", ["data/raw/AAPL.csv"], "clean-v1", clean, "AAPL")
+
+    @details
+    is_stale -> bool | check whether an output must be rebuilt
+    record -> None | record the inputs and version an output was built from
+    run -> bool | build an output if it is stale
+    stale_partitions -> list | the partitions of an output that must be rebuilt
+    record_partition -> None | record the inputs and version a partition was built from
+    """
+    def __init__(self, manifest_path:str = "data/manifest.json"):
+        self.manifest_path:str = manifest_path
+        self._lock:Lock = Lock()
+        self._manifest:dict = {"outputs": {}, "files": {}}
+        if path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                self._manifest = json.load(f)
+
+    @property
+    def manifest(self) -> dict:
+        """
+        @brief Get the manifest
+        @return (dict): outputs -> stage:output -> inputs | version | exists, files -> path -> size | mtime | hash
+        """
+        return self._manifest
+
+    def is_stale(self, stage:str, output:str, inputs:list, version = None) -> bool:
+        """
+        @brief Check whether an output must be rebuilt
+        @param stage (str): The stage, e.g. raw | processed | output
+        @param output (str): The output, a path or a name
+        @param inputs (list): The paths of the files or directories the output is built from
+        @param version (str | dict): The version of the code and parameters
+        @return (bool): True if the output must be rebuilt
+
+        @note
+        Time: O(changed input bytes)
+        Space: O(inputs)
+        """
+        record = self._manifest["outputs"].get(self._key(stage, output))
+        if record is None or record["version"] != self._version(version):
+            return True
+        if record["exists"] and not path.exists(output):
+            return True
+        return record["inputs"] != self.hash_inputs(inputs)
+
+    def record(self, stage:str, output:str, inputs:list, version = None, save:bool = True) -> None:
+        """
+        @brief Record the inputs and version an output was built from
+        @param stage (str): The stage
+        @param output (str): The output
+        @param inputs (list): The paths of the files or directories the output is built from
+        @param version (str | dict): The version of the code and parameters
+        @param save (bool): True to write the manifest, False to batch records and call save
+        """
+        hashes = self.hash_inputs(inputs)
+        with self._lock:
+            self._manifest["outputs"][self._key(stage, output)] = {
+                "inputs": hashes,
+                "version": self._version(version),
+                "exists": path.exists(output)
+            }
+        if save:
+            self.save()
+
+    def run(self, stage:str, output:str, inputs:list, version, function, *args, **kwargs) -> bool:
+        """
+        @brief Build an output if it is stale
+        @param stage (str): The stage
+        @param output (str): The output
+        @param inputs (list): The paths of the files or directories the output is built from
+        @param version (str | dict): The version of the code and parameters
+        @param function (callable): Builds the output, returning False marks a failure
+        @return (bool): True if the output was built, False if it was fresh or the build failed
+
+        @details
+        The record is written only after function succeeds
+        An output that existed as a path when recorded is rebuilt if it is deleted
+        """
+        if not self.is_stale(stage, output, inputs, version):
+            return False
+        if function(*args, **kwargs) is False:
+            return False
+
+        self.record(stage, output, inputs, version)
+        return True
+
+    def stale_partitions(self, stage:str, output:str, partitions:dict, version = None) -> list:
+        """
+        @brief Get the partitions of an output that must be rebuilt
+        @param stage (str): The stage
+        @param output (str): The output
+        @param partitions (dict): partition -> paths of its inputs
+        @param version (str | dict): The version of the code and parameters
+        @return (list): The stale partitions
+        """
+        return [
+            partition for partition, inputs in partitions.items()
+            if self.is_stale(stage, f"{output}#{partition}", inputs, version)
+        ]
+
+    def record_partition(self, stage:str, output:str, partition:str, inputs:list,
+                         version = None, save:bool = True) -> None:
+        """
+        @brief Record the inputs and version a partition was built from
+        @param stage (str): The stage
+        @param output (str): The output
+        @param partition (str): The partition
+        @param inputs (list): The paths of its inputs
+        @param version (str | dict): The version of the code and parameters
+        @param save (bool): True to write the manifest
+        """
+        self.record(stage, f"{output}#{partition}", inputs, version, save)
+
+    def save(self) -> None:
+        """
+        @brief Write the manifest
+        @details Written to a temporary file first, an interrupted run never leaves a partial manifest
+        """
+        with self._lock:
+            directory = path.dirname(self.manifest_path)
+            if directory:
+                makedirs(directory, exist_ok=True)
+            temporary = f"{self.manifest_path}.tmp"
+            with open(temporary, "w") as f:
+                json.dump(self._manifest, f)
+            replace(temporary, self.manifest_path)
+
+    def hash_inputs(self, inputs:list) -> dict:
+        """
+        @brief Hash the content of inputs
+        @param inputs (list): The paths of files or directories
+        @return (dict): path -> hash, None for a missing path
+        """
+        return {name: self.hash_path(name) for name in sorted(inputs)}
+
+    def hash_path(self, name:str) -> str:
+        """
+        @brief Hash the content of a file or directory
+        @param name (str): The path
+        @return (str): The hash, None for a missing path
+        """
+        if path.isdir(name):
+            digest = sha256()
+            for relative, file_name in self._walk(name):
+                digest.update(relative.encode())
+                digest.update(self._hash_file(file_name).encode())
+            return digest.hexdigest()
+        if path.isfile(name):
+            return self._hash_file(name)
+        return None
+
+    def _hash_file(self, file_name:str, block_size:int = 1 << 20) -> str:
+        """
+        @brief Hash the content of a file, reused while its size and modification time are unchanged
+        @param file_name (str): The file
+        @param block_size (int): The bytes read at once
+        @return (str): The hash
+        """
+        status = stat(file_name)
+        cached = self._manifest["files"].get(file_name)
+        if cached and cached["size"] == status.st_size and cached["mtime"] == status.st_mtime_ns:
+            return cached["hash"]
+
+        digest = sha256()
+        with open(file_name, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+
+        with self._lock:
+            self._manifest["files"][file_name] = {
+                "size": status.st_size,
+                "mtime": status.st_mtime_ns,
+                "hash": digest.hexdigest()
+            }
+        return digest.hexdigest()
+
+    @staticmethod
+    def _walk(directory:str) -> list:
+        """
+        @brief List the files of a directory recursively
+        @param directory (str): The directory
+        @return (list): (relative path, path) sorted by relative path
+        """
+        files = []
+        pending = [directory]
+        while pending:
+            with scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        pending.append(entry.path)
+                    elif entry.is_file():
+                        files.append((path.relpath(entry.path, directory), entry.path))
+        return sorted(files)
+
+    @staticmethod
+    def _key(stage:str, output:str) -> str:
+        return f"{stage}:{output}"
+
+    @staticmethod
+    def _version(version) -> str:
+        """
+        @brief Normalize a version
+        @param version (str | dict): The version of the code and parameters
+        @return (str): The version, dictionaries are hashed with sorted keys
+        """
+        if version is None or isinstance(version, str):
+            return version
+        return sha256(json.dumps(version, sort_keys=True, default=str).encode()).hexdigest()
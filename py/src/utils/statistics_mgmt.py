@@ -6,14 +6,27 @@
 @brief statistics management
 
 @dependencies
+concurrent.futures -> ProcessPoolExecutor
+numpy -> np
+scipy.special -> sp
 scipy.stats -> st
 
 @details
 A file to manage statistics
+0. moments
+    1. set from data | from an AccumulatorMgmt without keeping the data
 1. standard error
 2. normalize
 3. confidence intervals
+    1. parametric -> t-interval
+    2. bootstrap -> percentile | bca
+        1. resample indices drawn in blocks | memory bounded by the block size
+        2. statistic evaluated for a whole block at once
+        3. blocks spread across a process pool | one seed per block | reproducible for any number of workers
 4. hypothesis test
+    1. one series -> t-test on the data or on the moments
+    2. batch -> (series, observations) | nan aware moments | one vectorized pass
+    3. multiple testing -> benjamini-hochberg | holm
 5. probability
     1. normal distribution
     2. binomial distribution
@@ -30,17 +43,130 @@ A file to manage statistics
     13. gamma distribution
     14. weibull distribution
     15. t-distribution
+6. batch probability
+    1. array in | array out | parameters broadcast against the random variable
+    2. pdf | pmf | cdf | sf | ppf
+    3. frozen distributions cached by parameters
 """
 #imports
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.special as sp
 import scipy.stats as st
+from utils.accumulator_mgmt import AccumulatorMgmt
+
+#bootstrap
+def _std(data: np.ndarray, axis: int = -1) -> np.ndarray:
+    return np.std(data, axis=axis, ddof=1)
+
+def _var(data: np.ndarray, axis: int = -1) -> np.ndarray:
+    return np.var(data, axis=axis, ddof=1)
+
+_statistics: dict = {
+    "mean": np.mean,
+    "median": np.median,
+    "std": _std,
+    "var": _var
+}
+
+#data shared with the bootstrap workers, sent once per process
+_bootstrap_data: np.ndarray = None
+
+def _bootstrap_init(data: np.ndarray) -> None:
+    global _bootstrap_data
+    _bootstrap_data = data
+
+def _bootstrap_block(statistic: str, size: int, seed: np.random.SeedSequence, max_elements: int,
+                     rows: slice = slice(None)) -> np.ndarray:
+    """
+    @brief evaluates a statistic over one block of resamples
+    @param statistic -> str | "mean" | "median" | "std" | "var"
+    @param size -> int | resamples in the block
+    @param seed -> np.random.SeedSequence | seed of the block
+    @param max_elements -> int | largest gathered array, in elements
+    @param rows -> slice | all | the series evaluated
+    @return np.ndarray -> (series, size)
+
+    @details
+    The same resample indices are applied to every series
+    Series are gathered in slices so that at most max_elements values are held at once
+    """
+    data = _bootstrap_data[rows]
+    series, count = data.shape
+    index = np.random.default_rng(seed).integers(0, count, size=(size, count))
+    result = np.empty((series, size))
+    step = max(1, max_elements // (size * count))
+    for start in range(0, series, step):
+        result[start:start + step] = _statistics[statistic](data[start:start + step, index], axis=-1)
+    return result
+
+def _jackknife(data: np.ndarray, statistic: str, max_elements: int) -> np.ndarray:
+    """
+    @brief evaluates a statistic leaving out one observation at a time
+    @param data -> np.ndarray | (series, count)
+    @param statistic -> str | "mean" | "median" | "std" | "var"
+    @param max_elements -> int | largest gathered array, in elements
+    @return np.ndarray -> (series, count)
+    """
+    series, count = data.shape
+    if statistic == "mean":
+        return (data.sum(axis=1, keepdims=True) - data) / (count - 1)
+
+    result = np.empty((series, count))
+    step = max(1, max_elements // max(series * count, 1))
+    for start in range(0, count, step):
+        left_out = np.arange(start, min(start + step, count))
+        index = np.arange(count - 1)[None, :]
+        index = index + (index >= left_out[:, None])
+        result[:, left_out] = _statistics[statistic](data[:, index], axis=-1)
+    return result
+
+def _row_quantile(ordered: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """
+    @brief linear interpolated quantile with one probability per row
+    @param ordered -> np.ndarray | (series, count) | sorted along the rows
+    @param q -> np.ndarray | (series,) | probabilities
+    @return np.ndarray -> (series,)
+    """
+    position = np.clip(q, 0, 1) * (ordered.shape[1] - 1)
+    lower = np.floor(position).astype(int)
+    upper = np.minimum(lower + 1, ordered.shape[1] - 1)
+    rows = np.arange(ordered.shape[0])
+    weight = position - lower
+    return ordered[rows, lower] * (1 - weight) + ordered[rows, upper] * weight
 
 #class
 class StatisticsMgmt:
-    def __init__(self):
-        self._data: tuple[float] = None
+    #distribution name -> scipy distribution, parameters in the order of the *_prob methods
+    _distributions: dict = {
+        "normal": st.norm,
+        "binomial": st.binom,
+        "poisson": st.poisson,
+        "exponential": st.expon,
+        "uniform": st.uniform,
+        "bernoulli": st.bernoulli,
+        "geometric": st.geom,
+        "hypergeometric": st.hypergeom,
+        "negative_binomial": st.nbinom,
+        "chi_square": st.chi2,
+        "student_t": st.t,
+        "f": st.f,
+        "gamma": st.gamma,
+        "weibull": st.weibull_min,
+        "t": st.t
+    }
+
+    def __init__(self, frozen_size: int = 256):
+        if frozen_size < 1:
+            raise ValueError("Frozen size must be at least 1")
+
+        self._data: np.ndarray = None
+        self._accumulator: AccumulatorMgmt = None
         self._mean: float = None
         self._std_dev: float = None
         self._count: int = None
+        self._frozen: dict = {}
+        self._frozen_size: int = frozen_size
 
     @property
     def data(self):
@@ -58,18 +184,30 @@ class StatisticsMgmt:
     def count(self):
         return self._count
     
+    @property
+    def accumulator(self):
+        return self._accumulator
+    
     @property
     def standard_error(self):
         if self.data is None:
-            raise ValueError("Data must be set")
-        return st.sem(self.data)
+            if self.std_dev is None or self.count is None:
+                raise ValueError("Data or standard deviation and count must be set")
+            return self.std_dev / np.sqrt(self.count)
+        return st.sem(self.data, nan_policy="omit")
     
     @data.setter
     def data(self, data: list[float] = None):
-        if data is None or not isinstance(data, list[float]):
-            raise ValueError("Data must be list of floats")
+        if data is None or isinstance(data, (str, bytes)):
+            raise ValueError("Data must be a sequence of floats")
         
-        self._data = tuple(data)
+        try:
+            values = np.asarray(data, dtype=float).ravel()
+        except (TypeError, ValueError):
+            raise ValueError("Data must be a sequence of floats")
+        
+        self._data = values
+        self._moments(AccumulatorMgmt(values))
 
     @mean.setter
     def mean(self, mean: float = None):
@@ -92,6 +230,33 @@ class StatisticsMgmt:
         
         self._count = count
 
+    def accumulate(self, accumulator: AccumulatorMgmt = None) -> None:
+        """
+        @brief sets the moments from an accumulator and releases the data
+        @param accumulator -> AccumulatorMgmt | moments of a stream of data | merged from parallel workers
+
+        @details
+        A method to work off accumulated moments
+            1. mean, std_dev and count are set from the accumulator
+            2. standard_error, conf_interval and hypothesis_test use the moments only
+            3. normalize requires the data
+        """
+        if accumulator is None or not isinstance(accumulator, AccumulatorMgmt):
+            raise ValueError("Accumulator must be an AccumulatorMgmt")
+        
+        self._data = None
+        self._moments(accumulator)
+
+    def _moments(self, accumulator: AccumulatorMgmt) -> None:
+        """
+        @brief sets mean, std_dev and count from an accumulator
+        @param accumulator -> AccumulatorMgmt | moments of the data
+        """
+        self._accumulator = accumulator
+        self.count = int(accumulator.count)
+        self.mean = float(accumulator.mean)
+        self.std_dev = float(accumulator.std_dev)
+
     def normalize(self) -> tuple:
         """
         @brief sets data relative to mean of zero and standard deviation of one
@@ -104,6 +269,9 @@ class StatisticsMgmt:
         if self.mean is None or self.std_dev is None:
             raise ValueError("Mean and standard deviation must be set")
         
+        if self.data is None:
+            raise ValueError("Data must be set")
+        
         return st.zscore(self.data)
 
     def conf_interval(self, alpha: float = 0.05) -> tuple:
@@ -122,6 +290,124 @@ class StatisticsMgmt:
         
         return st.t.interval(1 - alpha, self.count -1 , loc = self.mean, scale=self.standard_error)
         
+    def bootstrap_interval(self, data = None, statistic: str = "mean", alpha: float = 0.05,
+                           method: str = "percentile", n_resamples: int = 10000, block_size: int = 1000,
+                           workers: int = None, seed: int = 0, max_elements: int = 2**24):
+        """
+        @brief bootstrap confidence interval
+        @param data -> array | None | (observations,) or (series, observations) | defaults to the data
+        @param statistic -> str | "mean" | "median" | "std" | "var"
+        @param alpha -> float | 0.05 | significance level
+        @param method -> str | "percentile" | "bca" | bias-corrected and accelerated
+        @param n_resamples -> int | 10000 | number of resamples
+        @param block_size -> int | 1000 | resamples drawn and evaluated at once
+        @param workers -> int | None | processes | None or 1 evaluates the blocks in this process
+        @param seed -> int | 0 | seed of the resamples
+        @param max_elements -> int | 2^24 | largest gathered array per block, in elements
+        @return tuple -> (float, float) for one series | np.ndarray -> (series, 2) | (lower, upper)
+
+        @details
+        A method to calculate confidence intervals without assuming a distribution
+            1. resample the observations with replacement and evaluate the statistic
+            2. percentile -> quantiles alpha / 2 and 1 - alpha / 2 of the resampled statistics
+            3. bca -> quantiles adjusted by
+                1. bias -> z0 = ppf(share of resampled statistics below the statistic)
+                2. acceleration -> a = sum(d^3) / (6 * sum(d^2)^(3/2)) | d -> jackknife deviations
+            4. series are evaluated in chunks of max_elements // n_resamples rows
+                1. the resampled statistics of one chunk are held at once, not those of every series
+                2. memory is bounded by max_elements, or by n_resamples for a single series
+            5. every block has its own seed, the result does not depend on workers or chunks
+        """
+        if data is None:
+            data = self.data
+        if data is None:
+            raise ValueError("Data must be set")
+        if statistic not in _statistics:
+            raise ValueError(f"Statistic must be one of {', '.join(_statistics)}")
+        if method not in ("percentile", "bca"):
+            raise ValueError("Method must be percentile or bca")
+        if alpha <= 0 or alpha >= 1 or n_resamples < 1 or block_size < 1:
+            raise ValueError("Alpha must be within (0, 1), resamples and block size must be positive")
+
+        values = np.asarray(data, dtype=float)
+        single = values.ndim == 1
+        values = np.atleast_2d(values)
+        if values.ndim != 2 or values.shape[1] < 2:
+            raise ValueError("Data must hold at least two observations per series")
+
+        #blocks
+        sizes = [block_size] * (n_resamples // block_size)
+        if n_resamples % block_size:
+            sizes.append(n_resamples % block_size)
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        step = max(1, max_elements // n_resamples)
+        chunks = [slice(start, start + step) for start in range(0, len(values), step)]
+
+        intervals = []
+        pool = None
+        if workers is None or workers <= 1:
+            _bootstrap_init(values)
+            evaluate = map
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_bootstrap_init, initargs=(values,))
+            evaluate = pool.map
+        try:
+            for rows in chunks:
+                blocks = list(evaluate(_bootstrap_block, [statistic] * len(sizes), sizes, seeds,
+                                       [max_elements] * len(sizes), [rows] * len(sizes)))
+                resampled = np.concatenate(blocks, axis=1)
+                del blocks
+                resampled.sort(axis=1)
+                intervals.append(self._bootstrap_quantiles(values[rows], resampled, statistic, alpha, method,
+                                                            max_elements))
+                del resampled
+        finally:
+            if pool is None:
+                _bootstrap_init(None)
+            else:
+                pool.shutdown()
+
+        lower, upper = np.concatenate(intervals, axis=1)
+
+        if single:
+            return float(lower[0]), float(upper[0])
+        return np.column_stack((lower, upper))
+
+    @staticmethod
+    def _bootstrap_quantiles(values: np.ndarray, resampled: np.ndarray, statistic: str, alpha: float, method: str,
+                             max_elements: int) -> np.ndarray:
+        """
+        @brief bootstrap confidence interval from the resampled statistics
+        @param values -> np.ndarray | (series, observations)
+        @param resampled -> np.ndarray | (series, resamples) | sorted along the rows
+        @param statistic -> str | "mean" | "median" | "std" | "var"
+        @param alpha -> float | significance level
+        @param method -> str | "percentile" | "bca"
+        @param max_elements -> int | largest gathered array of the jackknife, in elements
+        @return np.ndarray -> (2, series) | lower and upper
+        """
+        n_resamples = resampled.shape[1]
+        q = np.array([alpha / 2, 1 - alpha / 2])
+        if method == "percentile":
+            lower = _row_quantile(resampled, np.full(len(values), q[0]))
+            upper = _row_quantile(resampled, np.full(len(values), q[1]))
+            return np.vstack((lower, upper))
+
+        estimate = _statistics[statistic](values, axis=-1)
+        below = (resampled < estimate[:, None]).mean(axis=1)
+        equal = (resampled == estimate[:, None]).mean(axis=1)
+        z0 = sp.ndtri(np.clip(below + equal / 2, 1 / n_resamples, 1 - 1 / n_resamples))
+
+        jackknife = _jackknife(values, statistic, max_elements)
+        deviation = jackknife.mean(axis=1, keepdims=True) - jackknife
+        numerator = (deviation ** 3).sum(axis=1)
+        denominator = 6 * (deviation ** 2).sum(axis=1) ** 1.5
+        acceleration = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+        z = sp.ndtri(q)
+        adjusted = sp.ndtr(z0[:, None] + (z0[:, None] + z) / (1 - acceleration[:, None] * (z0[:, None] + z)))
+        return np.vstack((_row_quantile(resampled, adjusted[:, 0]), _row_quantile(resampled, adjusted[:, 1])))
+
     def hypothesis_test(self, mu: float = 0, alpha: float = 0.05, alternative: str = "two-sided") -> tuple:
         """
         @brief hypothesis test
@@ -143,8 +429,122 @@ class StatisticsMgmt:
         if self.mean is None or self.std_dev is None or self.count is None or alpha < 0 or alpha > 1:
             raise ValueError("Mean, standard deviation, and count must be set")
         
-        return st.ttest_1samp(self.data, mu, alternative=alternative, nan_policy="omit")
+        if self.data is not None:
+            return st.ttest_1samp(self.data, mu, alternative=alternative, nan_policy="omit")
+        
+        #from the moments
+        statistic = (self.mean - mu) / self.standard_error
+        df = self.count - 1
+        if alternative == "less":
+            return statistic, st.t.cdf(statistic, df)
+        if alternative == "greater":
+            return statistic, st.t.sf(statistic, df)
+        if alternative == "two-sided":
+            return statistic, 2 * st.t.sf(abs(statistic), df)
+        raise ValueError("Alternative must be two-sided, less or greater")
     
+    def batch_hypothesis_test(self, data, mu: float = 0, alpha: float = 0.05, alternative: str = "two-sided",
+                              correction: str = "fdr_bh", chunk_size: int = 8192) -> dict:
+        """
+        @brief hypothesis test for many series at once
+        @param data -> array | (series, observations) | nan marks a missing observation
+        @param mu -> float | array | mean of the population | one per series
+        @param alpha -> float | 0.05 | significance level | of the corrected p-values
+        @param alternative -> str | "two-sided" | "less" | "greater"
+        @param correction -> str | "fdr_bh" | "holm" | None
+        @param chunk_size -> int | 8192 | series evaluated at once | bounds the temporary arrays
+        @return dict -> statistic | pvalue | adjusted | reject | count | np.ndarray -> (series,)
+
+        @details
+        A method to perform the one sample t-test for every series
+            1. count, mean and variance ignore nan
+            2. t-statistic = (mean - mu) / (std_dev / sqrt(count))
+            3. series with less than two observations get a nan statistic and p-value
+            4. correction for testing many series
+                1. fdr_bh -> benjamini-hochberg | controls the false discovery rate
+                2. holm -> controls the family-wise error rate
+            5. reject where the adjusted p-value < alpha
+        """
+        if alpha < 0 or alpha > 1:
+            raise ValueError("Alpha must be within [0, 1]")
+        if alternative not in ("two-sided", "less", "greater"):
+            raise ValueError("Alternative must be two-sided, less or greater")
+
+        values = np.asarray(data, dtype=float)
+        if values.ndim != 2:
+            raise ValueError("Data must be (series, observations)")
+
+        series = values.shape[0]
+        mu = np.broadcast_to(np.asarray(mu, dtype=float), (series,))
+        count = np.empty(series)
+        mean = np.empty(series)
+        variance = np.empty(series)
+        for start in range(0, series, chunk_size):
+            chunk = values[start:start + chunk_size]
+            valid = ~np.isnan(chunk)
+            n = valid.sum(axis=1)
+            m = np.where(valid, chunk, 0).sum(axis=1) / np.maximum(n, 1)
+            centered = np.where(valid, chunk - m[:, None], 0)
+            count[start:start + chunk_size] = n
+            mean[start:start + chunk_size] = m
+            variance[start:start + chunk_size] = np.einsum("ij,ij->i", centered, centered) / np.maximum(n - 1, 1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            statistic = (mean - mu) / np.sqrt(variance / count)
+        statistic[count < 2] = np.nan
+        df = np.maximum(count - 1, 1)
+
+        if alternative == "less":
+            pvalue = st.t.cdf(statistic, df)
+        elif alternative == "greater":
+            pvalue = st.t.sf(statistic, df)
+        else:
+            pvalue = np.minimum(2 * st.t.sf(np.abs(statistic), df), 1)
+
+        adjusted = self.adjust_pvalues(pvalue, correction)
+        return {
+            "statistic": statistic,
+            "pvalue": pvalue,
+            "adjusted": adjusted,
+            "reject": adjusted < alpha,
+            "count": count.astype(int)
+        }
+
+    @staticmethod
+    def adjust_pvalues(pvalue, correction: str = "fdr_bh") -> np.ndarray:
+        """
+        @brief corrects p-values for multiple testing
+        @param pvalue -> array | p-values | nan values are not counted as tests
+        @param correction -> str | "fdr_bh" | "holm" | None
+        @return np.ndarray
+
+        @details
+        A method to adjust p-values of m tests ranked from smallest (i = 1) to largest (i = m)
+            1. fdr_bh -> min over j >= i of p(j) * m / j
+            2. holm -> max over j <= i of p(j) * (m - j + 1)
+            3. adjusted p-values are capped at one
+        """
+        pvalue = np.asarray(pvalue, dtype=float)
+        if correction is None:
+            return pvalue.copy()
+        if correction not in ("fdr_bh", "holm"):
+            raise ValueError("Correction must be fdr_bh, holm or None")
+
+        adjusted = np.full(pvalue.shape, np.nan)
+        tested = np.flatnonzero(~np.isnan(pvalue))
+        m = tested.size
+        if m == 0:
+            return adjusted
+
+        order = tested[np.argsort(pvalue[tested], kind="stable")]
+        rank = np.arange(1, m + 1)
+        if correction == "fdr_bh":
+            ranked = np.minimum.accumulate((pvalue[order] * m / rank)[::-1])[::-1]
+        else:
+            ranked = np.maximum.accumulate(pvalue[order] * (m - rank + 1))
+        adjusted[order] = np.minimum(ranked, 1)
+        return adjusted
+
     #probability
     def normal_prob(self, x: float = 0, mu: float = 0, sigma: float = 1) -> float:
         """
@@ -389,8 +789,135 @@ class StatisticsMgmt:
             4. used to estimate the population mean when the population standard deviation is unknown
         """
         return st.t.pdf(x, df)
-    
-    
 
+    #batch probability
+    def frozen(self, name: str, *params: float):
+        """
+        @brief frozen distribution
+        @param name -> str | distribution name | "normal" | "binomial" | ... | "t"
+        @param params -> float | parameters in the order of the matching *_prob method
+        @return st.rv_frozen
+
+        @details
+        A method to get a frozen distribution from the cache
+            1. the cache is keyed by name and parameters
+            2. the oldest entry is evicted once the cache holds frozen_size entries
+        """
+        if name not in self._distributions:
+            raise ValueError(f"Distribution must be one of {', '.join(self._distributions)}")
+
+        key = (name, tuple(float(param) for param in params))
+        if key not in self._frozen:
+            if len(self._frozen) >= self._frozen_size:
+                self._frozen.pop(next(iter(self._frozen)))
+            self._frozen[key] = self._distributions[name](*key[1])
+
+        return self._frozen[key]
+
+    def clear_frozen(self) -> None:
+        """
+        @brief empties the frozen distribution cache
+        """
+        self._frozen.clear()
+
+    def batch_prob(self, name: str, x, *params) -> np.ndarray:
+        """
+        @brief batch density | mass
+        @param name -> str | distribution name
+        @param x -> array | random variables
+        @param params -> float | array | parameters in the order of the matching *_prob method
+        @return np.ndarray
+
+        @details
+        A method to calculate the pdf of continuous and the pmf of discrete distributions
+            1. batch_prob("normal", x, mu, sigma) == normal_prob(x, mu, sigma) for every element
+            2. parameters broadcast against x | a grid of parameters is evaluated in one call
+        """
+        return self._batch(name, "prob", x, params)
+
+    def batch_cdf(self, name: str, x, *params) -> np.ndarray:
+        """
+        @brief batch cumulative distribution function
+        @param name -> str | distribution name
+        @param x -> array | random variables
+        @param params -> float | array | parameters in the order of the matching *_prob method
+        @return np.ndarray | P(X <= x)
+        """
+        return self._batch(name, "cdf", x, params)
+
+    def batch_sf(self, name: str, x, *params) -> np.ndarray:
+        """
+        @brief batch survival function
+        @param name -> str | distribution name
+        @param x -> array | random variables
+        @param params -> float | array | parameters in the order of the matching *_prob method
+        @return np.ndarray | P(X > x) | 1 - cdf without the loss of precision in the tail
+        """
+        return self._batch(name, "sf", x, params)
+
+    def batch_ppf(self, name: str, q, *params) -> np.ndarray:
+        """
+        @brief batch percent point function
+        @param name -> str | distribution name
+        @param q -> array | probabilities
+        @param params -> float | array | parameters in the order of the matching *_prob method
+        @return np.ndarray | inverse of the cdf
+        """
+        return self._batch(name, "ppf", q, params)
+
+    def _batch(self, name: str, method: str, x, params: tuple) -> np.ndarray:
+        """
+        @brief evaluates a distribution method over arrays
+        @param name -> str | distribution name
+        @param method -> str | "prob" | "cdf" | "sf" | "ppf"
+        @param x -> array | random variables | probabilities for ppf
+        @param params -> tuple | parameters
+        @return np.ndarray
+
+        @details
+        1. normal -> closed form on numpy ufuncs
+        2. scalar parameters -> cached frozen distribution
+        3. array parameters -> one broadcast call to the scipy distribution
+        """
+        if name not in self._distributions:
+            raise ValueError(f"Distribution must be one of {', '.join(self._distributions)}")
+
+        x = np.asarray(x, dtype=float)
+        params = tuple(np.asarray(param, dtype=float) for param in params)
+
+        if name == "normal":
+            return self._normal(method, x, *params)
+
+        distribution = self._distributions[name]
+        if method == "prob":
+            method = "pmf" if isinstance(distribution, st.rv_discrete) else "pdf"
+
+        if all(param.ndim == 0 for param in params):
+            return np.asarray(getattr(self.frozen(name, *params), method)(x))
+
+        return np.asarray(getattr(distribution, method)(x, *params))
+
+    @staticmethod
+    def _normal(method: str, x: np.ndarray, mu=0.0, sigma=1.0) -> np.ndarray:
+        """
+        @brief normal distribution on numpy ufuncs
+        @param method -> str | "prob" | "cdf" | "sf" | "ppf"
+        @param x -> np.ndarray | random variables | probabilities for ppf
+        @param mu -> float | array | mean
+        @param sigma -> float | array | standard deviation
+        @return np.ndarray
+
+        @details
+        Skips the argument checks of scipy's generic machinery
+        Invalid parameters (sigma <= 0) evaluate to nan
+        """
+        sigma = np.where(sigma > 0, sigma, np.nan)
+        if method == "ppf":
+            return mu + sigma * sp.ndtri(x)
 
-    
\ No newline at end of file
+        z = (x - mu) / sigma
+        if method == "cdf":
+            return sp.ndtr(z)
+        if method == "sf":
+            return sp.ndtr(-z)
+        return np.exp(-0.5 * z * z) / (sigma * np.sqrt(2 * np.pi))
@@ -0,0 +1,241 @@
+"""
+@gitsil10
+@file writer_mgmt.py
+@brief A class to write data in batches
+@details A class to buffer writes per file and flush them in batches
+@version 0.1
+@date 2026-10-19
+
+@dependencies
+os -> path | fsync
+threading -> Event | Lock | Thread
+time -> monotonic
+
+@details
+1. buffers
+    1. one buffer and one open handle per file
+    2. data is encoded as utf-8 when buffered | a buffer is written once it holds flush_size bytes
+       or flush_interval seconds have passed
+2. threads
+    1. any number of threads may write at once
+    2. background -> a writer thread flushes every flush_interval seconds
+    3. an error of the writer thread is raised by the next flush or close, the thread keeps running
+3. errors
+    1. a failing file does not stop the others from being written
+    2. the batch of a failing file is kept and written again by the next flush
+    3. close raises the first error after every file was written and every handle closed
+       the data of a file that still fails on close is dropped
+4. durability
+    1. none -> data is handed to the handle | the operating system writes it eventually
+    2. flush -> the handle is flushed to the operating system on every batch
+    3. fsync -> the file is synced to disk on every batch
+"""
+#imports
+from os import path, fsync
+from threading import Event, Lock, Thread
+from time import monotonic
+
+#class
+class WriterMgmt:
+    """
+    @brief A class to write data in batches
+    @param paths (dict): The paths to the raw, processed, and output data
+    @param flush_size (int): The buffered utf-8 bytes per file that trigger a write
+    @param flush_interval (float): The seconds after which buffered data is written
+    @param durability (str): none | flush | fsync
+    @param background (bool): True to flush from a writer thread every flush_interval seconds
+    @return (WriterMgmt): The WriterMgmt object
+
+    @example
+    with ProcessMgmt().writer(durability="fsync") as writer:
+        writer.write_raw("raw.txt", "Hello, World!")
+    """
+    def __init__(self, paths:dict = None, flush_size:int = 1 << 20, flush_interval:float = 1.0,
+                 durability:str = "flush", background:bool = False):
+        if durability not in ("none", "flush", "fsync"):
+            raise ValueError("The durability must be none, flush or fsync")
+        if flush_size < 1 or flush_interval <= 0:
+            raise ValueError("The flush size and interval must be positive")
+
+        self.paths:dict = paths if paths else {}
+        self.flush_size:int = flush_size
+        self.flush_interval:float = flush_interval
+        self.durability:str = durability
+        self._lock:Lock = Lock()
+        self._files:dict = {}
+        self._directories:dict = {}
+        self._flushed:float = monotonic()
+        self._stop:Event = Event()
+        self._error:Exception = None
+        self._thread:Thread = None
+        if background:
+            self._thread = Thread(target=self._run, name="WriterMgmt", daemon=True)
+            self._thread.start()
+
+    def write(self, path_name:str, file_name:str, data:str) -> bool:
+        """
+        @brief Buffer data for a file
+        @param path_name (str): The path to the file
+        @param file_name (str): The file name
+        @param data (str): The data to write
+        @return (bool): True if the data was buffered, False otherwise
+
+        @details
+        Same rules as ProcessMgmt.write_data, the path must exist and the data must not be empty
+        An existing path is checked once, a missing path again on every write
+        The data is appended to the file
+
+        @note
+        Time: O(1) amortized
+        Space: O(flush_size) per file
+        """
+        if not data or len(data) == 0 or not self._isdir(path_name):
+            return False
+
+        target = path.join(path_name, file_name)
+        data = data.encode("utf-8")
+        with self._lock:
+            if target not in self._files:
+                self._files[target] = {"buffer": [], "size": 0, "handle": None, "lock": Lock()}
+            entry = self._files[target]
+            entry["buffer"].append(data)
+            entry["size"] += len(data)
+            full = entry["size"] >= self.flush_size
+
+        if full:
+            self._flush(target)
+        elif self._thread is None and monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+        return True
+
+    def write_raw(self, file_name:str, data:str) -> bool:
+        return self.write(self.paths["raw"], file_name, data)
+
+    def write_processed(self, file_name:str, data:str) -> bool:
+        return self.write(self.paths["processed"], file_name, data)
+
+    def write_output(self, file_name:str, data:str) -> bool:
+        return self.write(self.paths["output"], file_name, data)
+
+    def flush(self) -> None:
+        """
+        @brief Write the buffered data of every file
+        @details Every file is written, then the error of the writer thread or of a failing file is raised once
+        """
+        self._raise(self._flush_all())
+
+    def close(self) -> None:
+        """
+        @brief Stop the writer thread, write the buffered data and close every handle
+
+        @details
+        Every file is written and every handle closed even if the writer thread or a file failed, the error is raised after
+        The data of a file that fails on close is dropped
+        """
+        if not self._thread is None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        error = self._flush_all()
+        with self._lock:
+            entries = list(self._files.values())
+            self._files = {}
+        for entry in entries:
+            with entry["lock"]:
+                if not entry["handle"] is None:
+                    try:
+                        entry["handle"].close()
+                    except Exception as e:
+                        error = e if error is None else error
+        self._raise(error)
+
+    def __enter__(self) -> "WriterMgmt":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _isdir(self, path_name:str) -> bool:
+        """
+        @brief Check whether a path exists, an existing path is remembered
+        @param path_name (str): The path
+        @return (bool): True if the path is a directory
+        """
+        if path_name in self._directories:
+            return True
+        if path.isdir(path_name):
+            self._directories[path_name] = True
+            return True
+        return False
+
+    def _flush(self, target:str) -> None:
+        """
+        @brief Write the buffered data of a file
+        @param target (str): The file
+
+        @details
+        The file lock is held from taking the buffer until it is written, batches keep their order
+        Writers only wait for the shared lock while the buffer is swapped, not for the disk
+        A batch that fails is put back in front of the buffer and the error is raised
+        """
+        with self._lock:
+            entry = self._files.get(target)
+        if entry is None:
+            return
+
+        with entry["lock"]:
+            with self._lock:
+                buffer, entry["buffer"], entry["size"] = entry["buffer"], [], 0
+            if not buffer:
+                return
+
+            try:
+                if entry["handle"] is None:
+                    entry["handle"] = open(target, "ab")
+                entry["handle"].write(b"".join(buffer))
+                if self.durability in ("flush", "fsync"):
+                    entry["handle"].flush()
+                if self.durability == "fsync":
+                    fsync(entry["handle"].fileno())
+            except Exception:
+                with self._lock:
+                    entry["buffer"][:0] = buffer
+                    entry["size"] += sum(len(data) for data in buffer)
+                raise
+
+    def _flush_all(self) -> Exception:
+        """
+        @brief Write the buffered data of every file, a failing file does not stop the others
+        @return (Exception): The first error, None if every file was written
+        """
+        error = None
+        with self._lock:
+            targets = list(self._files)
+        for target in targets:
+            try:
+                self._flush(target)
+            except Exception as e:
+                error = e if error is None else error
+        self._flushed = monotonic()
+        return error
+
+    def _run(self) -> None:
+        """
+        @brief Flush every flush_interval seconds until stopped
+        @details The first error is kept for the next flush or close, the failed batches are tried again
+        """
+        while not self._stop.wait(self.flush_interval):
+            error = self._flush_all()
+            if self._error is None:
+                self._error = error
+
+    def _raise(self, error:Exception = None) -> None:
+        """
+        @brief Raise the error of the writer thread, otherwise error
+        @param error (Exception): The error of this thread, None if there is none
+        """
+        thread_error, self._error = self._error, None
+        error = thread_error if not thread_error is None else error
+        if not error is None:
+            raise error
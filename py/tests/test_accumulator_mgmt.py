@@ -0,0 +1,41 @@
+"""
+@gitsil10
+@file test_accumulator_mgmt.py
+@brief tests of accumulator_mgmt.py
+"""
+#imports
+import numpy as np
+import pytest
+from utils.accumulator_mgmt import AccumulatorMgmt
+from utils.statistics_mgmt import StatisticsMgmt
+
+def test_merged_chunks_match_numpy():
+    #large offset, the naive sum of squares loses the variance
+    values = 1e9 + np.random.default_rng(0).normal(0.0, 1.0, 10001)
+    chunks = np.array_split(values, 7)
+
+    merged = sum((AccumulatorMgmt(chunk) for chunk in chunks), AccumulatorMgmt())
+    streamed = AccumulatorMgmt().consume(chunks)
+    for accumulator in (merged, streamed):
+        assert accumulator.count == values.size
+        assert accumulator.mean == pytest.approx(values.mean(), rel=1e-15)
+        assert accumulator.variance == pytest.approx(values.var(ddof=1), rel=1e-6)
+        assert (accumulator.min, accumulator.max) == (values.min(), values.max())
+
+def test_empty_and_nan():
+    accumulator = AccumulatorMgmt([np.nan, 2.0, np.nan, 4.0]).merge(AccumulatorMgmt())
+    assert (accumulator.count, accumulator.mean, accumulator.variance) == (2, 3.0, 2.0)
+    assert np.isnan(AccumulatorMgmt().variance)
+    with pytest.raises(ValueError):
+        accumulator.merge([1.0])
+
+def test_statistics_from_the_accumulator():
+    values = np.random.default_rng(1).normal(2.0, 3.0, 500)
+    expected = StatisticsMgmt()
+    expected.data = values
+
+    statistics = StatisticsMgmt()
+    statistics.accumulate(AccumulatorMgmt(values[:200]) + AccumulatorMgmt(values[200:]))
+    assert statistics.data is None
+    assert statistics.standard_error == pytest.approx(expected.standard_error)
+    assert statistics.hypothesis_test(2.0) == pytest.approx(tuple(expected.hypothesis_test(2.0)))
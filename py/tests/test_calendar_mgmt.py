@@ -0,0 +1,40 @@
+"""
+@gitsil10
+@file test_calendar_mgmt.py
+@brief tests of calendar_mgmt.py
+"""
+#imports
+import numpy as np
+import pandas as pd
+import pytest
+from utils.calendar_mgmt import CalendarMgmt
+
+def test_lookups():
+    calendar = CalendarMgmt("2023-01-01", "2024-12-31")
+    dates = pd.date_range("2023-01-01", "2024-12-31", freq="D")
+
+    assert calendar.trading_days[0] == np.datetime64("2023-01-03")
+    assert not calendar.is_trading_day("2024-07-04")[0]
+    assert calendar.shift("2024-07-03", 1)[0] == np.datetime64("2024-07-05")
+    assert calendar.trading_days_between("2024-01-02", "2024-12-31")[0] == 251
+    assert np.array_equal(calendar.quarter(dates), dates.quarter)
+    assert np.array_equal(calendar.period_start(dates, "Q"), dates.to_period("Q").start_time.values)
+
+def test_lookups_after_end_extend_the_calendar():
+    calendar = CalendarMgmt()
+    positions = calendar.positions(["2040-12-28"])
+
+    assert calendar.shift("2040-12-28", 5)[0] == np.datetime64("2041-01-07")
+    assert calendar.trading_period_start("2041-03-15", "Q")[0] == np.datetime64("2041-01-02")
+    assert np.array_equal(calendar.positions(["2040-12-28"]), positions)
+
+    short = CalendarMgmt("2024-01-01", "2024-01-01")
+    assert short.trading_period_start("2024-01-01")[0] == np.datetime64("2024-01-02")
+    assert short.shift(np.datetime64("2024-01-02"), 251)[0] == np.datetime64("2024-12-31")
+
+def test_lookups_before_start_raise():
+    calendar = CalendarMgmt("2024-01-01", "2024-12-31")
+    with pytest.raises(ValueError):
+        calendar.positions("2023-12-31")
+    with pytest.raises(ValueError):
+        calendar.shift("2024-01-03", -5)
@@ -0,0 +1,58 @@
+"""
+@gitsil10
+@file test_dataframe_mgmt.py
+@brief tests of dataframe_mgmt.py
+"""
+#imports
+import numpy as np
+import pandas as pd
+import pytest
+from utils.dataframe_mgmt import DataframeMgmt
+
+def frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "close": [1.0, np.nan, 3.0, 3.0],
+        "date": pd.to_datetime(["2024-01-01", None, "2024-01-03", "2024-01-03"]),
+        "symbol": ["AAPL", None, "MSFT", "MSFT"]
+    })
+
+def test_fill_na_matches_clean_fill_na():
+    data = frame()
+    expected = DataframeMgmt(frame()).clean_fill_na(0)
+
+    result = DataframeMgmt(data).inplace_fill_na(0).data
+    pd.testing.assert_frame_equal(result, expected)
+    assert result is data
+
+def test_fill_na_over_budget_leaves_data_unchanged():
+    data = frame()
+    frames = DataframeMgmt(data)
+    #room for the masks, not for a replaced column
+    frames.memory_budget = frames.memory_usage + len(data)
+    with pytest.raises(MemoryError):
+        frames.inplace_fill_na(0)
+    pd.testing.assert_frame_equal(data, frame())
+
+def test_drop_duplicates_keeps_the_frame():
+    data = frame()
+    expected = frame().drop_duplicates()
+
+    result = DataframeMgmt(data).inplace_drop_duplicates().data
+    pd.testing.assert_frame_equal(result, expected)
+    assert result is data
+
+def test_drop_duplicates_with_repeated_labels():
+    data = frame()
+    data.index = [0, 0, 1, 1]
+
+    result = DataframeMgmt(data).inplace_drop_duplicates().data
+    pd.testing.assert_frame_equal(result, frame().drop_duplicates().set_axis([0, 0, 1]))
+
+def test_drop_duplicates_on_the_index():
+    index = pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-03", "2024-01-04"])
+    data = pd.DataFrame({"Close": [5.0, 5.0, 6.0, 5.0], "Volume": [0.0, 0.0, 1.0, 0.0]}, index=index)
+
+    #a halted symbol repeats its prices on different dates
+    result = DataframeMgmt(data.copy()).inplace_drop_duplicates(index=True).data
+    pd.testing.assert_frame_equal(result, data.iloc[[0, 1, 3]])
+    assert len(DataframeMgmt(data.copy()).inplace_drop_duplicates().data) == 2
@@ -0,0 +1,32 @@
+"""
+@gitsil10
+@file test_finance_model.py
+@brief tests of finance_model.py
+"""
+#imports
+import numpy as np
+import pandas as pd
+from models.finance_model import Finance, FinancePanel
+
+def finance(revenue, expense = None) -> Finance:
+    result = Finance()
+    result.revenue = revenue
+    result.expense = expense
+    return result
+
+def test_from_finances_accepts_arrays_and_series():
+    panel = FinancePanel.from_finances({
+        "AAPL": finance(np.array([10.0, 12.0, 14.0]), pd.Series([4.0, 5.0, 6.0])),
+        "MSFT": finance([8.0, 9.0])
+    })
+
+    assert panel.shape == (2, 3)
+    assert np.array_equal(panel.revenue, [[10.0, 12.0, 14.0], [8.0, 9.0, np.nan]], equal_nan=True)
+    assert np.array_equal(panel["AAPL"].net_income, [6.0, 7.0, 8.0])
+    assert np.isnan(panel["MSFT"].expense).all()
+    assert np.isnan(panel.asset).all()
+
+def test_from_finances_cuts_to_the_periods():
+    panel = FinancePanel.from_finances({"AAPL": finance(np.arange(5.0))}, periods=["2023", "2024"])
+    assert np.array_equal(panel.revenue, [[0.0, 1.0]])
+    assert panel.row("AAPL") == 0
@@ -0,0 +1,43 @@
+"""
+@gitsil10
+@file test_fitting_mgmt.py
+@brief tests of fitting_mgmt.py
+"""
+#imports
+from os import listdir, path
+import numpy as np
+import pytest
+from utils import fitting_mgmt
+from utils.fitting_mgmt import FittingMgmt
+
+def test_fit_selects_the_generating_distribution(tmp_path):
+    rng = np.random.default_rng(0)
+    series = {"normal": rng.normal(1.0, 2.0, 2000), "laplace": rng.laplace(0.0, 1.0, 2000)}
+
+    fits = FittingMgmt(("normal", "laplace"), cache_dir=str(tmp_path)).fit(series, "bic")
+    assert fits["normal"]["best"] == "normal"
+    assert fits["laplace"]["best"] == "laplace"
+    assert np.allclose(fits["normal"]["fits"]["normal"]["params"], [1.0, 2.0], atol=0.15)
+    assert not [name for name in listdir(tmp_path) if name.endswith(".tmp")]
+
+def test_corrupt_cache_is_a_miss(tmp_path):
+    values = np.random.default_rng(1).normal(size=500)
+    first = FittingMgmt(("normal",), cache_dir=str(tmp_path)).fit({"a": values})
+
+    (file_name,) = listdir(tmp_path)
+    with open(path.join(tmp_path, file_name), "w") as f:
+        f.write('{"normal": {"params": [0.0')
+
+    fitting = FittingMgmt(("normal",), cache_dir=str(tmp_path))
+    assert fitting.fit({"a": values}) == first
+    assert fitting.cache
+
+def test_failed_cache_write_leaves_no_file(tmp_path, monkeypatch):
+    def fail(fits, f):
+        f.write("{")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(fitting_mgmt.json, "dump", fail)
+    with pytest.raises(OSError):
+        FittingMgmt(("normal",), cache_dir=str(tmp_path)).fit({"a": np.random.default_rng(2).normal(size=200)})
+    assert not listdir(tmp_path)
@@ -0,0 +1,90 @@
+"""
+@gitsil10
+@file test_pipeline_mgmt.py
+@brief tests of pipeline_mgmt.py
+"""
+#imports
+import json
+from os import makedirs, path
+import pandas as pd
+import pytest
+from utils.pipeline_mgmt import PipelineMgmt
+from utils.process_mgmt import ProcessMgmt
+
+#stages
+CALLS = []
+
+def load(symbol:str) -> pd.DataFrame:
+    CALLS.append(("load", symbol))
+    index = pd.date_range("2024-01-01", periods=14, freq="MS", name="Date")
+    return pd.DataFrame({"Close": range(14)}, index=index)
+
+def summarize(symbol:str, history:pd.DataFrame) -> dict:
+    CALLS.append(("summarize", symbol))
+    return {"symbol": symbol, "count": len(history)}
+
+def write(symbol:str, history:pd.DataFrame, summary:dict) -> bool:
+    process = ProcessMgmt()
+    written = (
+        process.write_frame("processed", path.join("monthly", symbol), history, partition_on=("date",), overwrite=True)
+        and process.replace_output(f"{symbol}.json", json.dumps(summary))
+    )
+    if not path.exists("crashed"):
+        #crash after the outputs are written, before the stage is checkpointed
+        open("crashed", "w").close()
+        raise RuntimeError("crash")
+    return written
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ProcessMgmt().get_path().values():
+        makedirs(name)
+    CALLS.clear()
+    pipeline = PipelineMgmt(checkpoint_dir=str(tmp_path / "checkpoints"))
+    pipeline.add_stage("load", load, kind="io")
+    pipeline.add_stage("summarize", summarize, ("load",))
+    pipeline.add_stage("write", write, ("load", "summarize"), kind="io")
+    return pipeline
+
+def test_order_and_cycle(pipeline):
+    assert pipeline.order() == ["load", "summarize", "write"]
+    pipeline.add_stage("a", load, ("b",))
+    pipeline.add_stage("b", load, ("a",))
+    with pytest.raises(ValueError):
+        pipeline.order()
+
+def test_resume_is_idempotent(pipeline):
+    assert pipeline.run(["AAPL"])["AAPL"]["status"] == "error"
+    assert pipeline.run(["AAPL"])["AAPL"]["status"] == "done"
+
+    #finished stages are loaded from their checkpoints, not run again
+    assert CALLS == [("load", "AAPL"), ("summarize", "AAPL")]
+    assert len(ProcessMgmt().read_frame("processed", path.join("monthly", "AAPL"))) == 14
+    with open(path.join("data", "output", "AAPL.json")) as f:
+        assert json.load(f) == {"symbol": "AAPL", "count": 14}
+
+def test_checkpoints_belong_to_a_run(pipeline, tmp_path):
+    open("crashed", "w").close()
+    assert pipeline.run(["AAPL"])["AAPL"]["status"] == "done"
+    #the stage checkpoints of a finished symbol are removed
+    assert not [name for name in pipeline.stages if path.exists(pipeline._checkpoint("AAPL", name))]
+    assert pipeline.run(["AAPL"])["AAPL"]["status"] == "done"
+    assert CALLS == [("load", "AAPL"), ("summarize", "AAPL")]
+
+    later = PipelineMgmt(checkpoint_dir=str(tmp_path / "checkpoints"), run_id="2026-10-20")
+    for name, stage in pipeline.stages.items():
+        later.add_stage(name, stage["function"], stage["depends"], stage["kind"])
+    assert later.run(["AAPL"])["AAPL"]["status"] == "done"
+    assert CALLS[2:] == [("load", "AAPL"), ("summarize", "AAPL")]
+
+def test_write_frame_overwrite(pipeline):
+    process = ProcessMgmt()
+    data = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-31", periods=2, freq="ME", name="Date"))
+    process.write_frame("processed", "monthly", data, partition_on=("date",))
+    process.write_frame("processed", "monthly", data, partition_on=("date",))
+    assert len(process.read_frame("processed", "monthly")) == 4
+    #the write stage replaces its dataset, a repeated stage writes the same rows
+    process.write_frame("processed", "monthly", data, partition_on=("date",), overwrite=True)
+    process.write_frame("processed", "monthly", data, partition_on=("date",), overwrite=True)
+    assert len(process.read_frame("processed", "monthly")) == 2
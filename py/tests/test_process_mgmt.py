@@ -0,0 +1,59 @@
+"""
+@gitsil10
+@file test_process_mgmt.py
+@brief tests of process_mgmt.py
+"""
+#imports
+from os import makedirs, path
+import numpy as np
+import pandas as pd
+import pytest
+from utils.process_mgmt import ProcessMgmt
+
+@pytest.fixture
+def process(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    process = ProcessMgmt()
+    for name in process.get_path().values():
+        makedirs(name)
+    return process
+
+def test_array_frame_round_trip_without_copy(process):
+    data = pd.DataFrame(np.arange(12.0).reshape(4, 3), columns=["a", "b", "c"],
+                        index=pd.date_range("2024-01-01", periods=4, name="Date"))
+    assert process.write_array_frame("processed", "prices", data)
+    frame = process.read_array_frame("processed", "prices")
+    pd.testing.assert_frame_equal(frame, data, check_freq=False)
+    #the values are a view of the mapped file
+    base = frame.to_numpy()
+    while not isinstance(base, np.memmap) and base.base is not None:
+        base = base.base
+    assert isinstance(base, np.memmap)
+    assert base.filename == path.abspath(path.join("data", "processed", "prices.npy"))
+
+def test_array_frame_string_index(process):
+    data = pd.DataFrame({"pe": [30.0, 25.0]}, index=pd.Index(["AAPL", "MSFT"], name="symbol"))
+    assert process.write_array_frame("processed", "ratios", data)
+    pd.testing.assert_frame_equal(process.read_array_frame("processed", "ratios"), data)
+
+def test_array_frame_rejects_before_writing(process):
+    data = pd.DataFrame({"pe": [30.0, 25.0]}, index=pd.Index(["AAPL", 1]))
+    with pytest.raises(ValueError):
+        process.write_array_frame("processed", "mixed", data)
+    with pytest.raises(ValueError):
+        process.write_array_frame("processed", "mixed", pd.DataFrame({"pe": [30.0, 25.0], "volume": [1, 2]}))
+    assert not path.exists(path.join("data", "processed", "mixed.npy"))
+    assert process.read_array_frame("processed", "mixed") is None
+
+def test_frame_partitions_are_pruned(process):
+    dates = pd.date_range("2024-01-01", "2024-06-30", freq="D", name="Date")
+    for symbol in ("AAPL", "MSFT"):
+        data = pd.DataFrame({"Close": np.arange(len(dates), dtype=float), "Volume": 1.0}, index=dates)
+        assert process.write_frame("processed", "history", data.assign(symbol=symbol))
+
+    assert len(process.read_frame("processed", "history")) == 2 * len(dates)
+    frame = process.read_frame("processed", "history", columns=["Close"], symbols=["MSFT"],
+                               start="2024-02-01", end="2024-03-31")
+    assert len(frame) == 29 + 31
+    assert "Volume" not in frame.columns
+    assert process.read_frame("processed", "missing").empty
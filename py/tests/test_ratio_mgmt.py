@@ -0,0 +1,80 @@
+"""
+@gitsil10
+@file test_ratio_mgmt.py
+@brief tests of ratio_mgmt.py
+"""
+#imports
+import numpy as np
+import pandas as pd
+import pytest
+from utils.ratio_mgmt import RatioMgmt
+
+def statement(rows:dict, dates:list) -> pd.DataFrame:
+    return pd.DataFrame(rows, index=pd.to_datetime(dates)).T
+
+def test_periods_are_aligned_by_date():
+    sources = {
+        #fiscal year ends in september, income has two years, balance three
+        "AAPL": {
+            "income_statement_10k": statement({"Net Income": [100.0, 90.0], "Total Revenue": [400.0, 380.0]},
+                                              ["2024-09-28", "2023-09-30"]),
+            "balance_sheet_10k": statement({"Stockholders Equity": [60.0, 40.0, 50.0]},
+                                           ["2024-09-28", "2023-09-30", "2022-09-24"])
+        },
+        #fiscal year ends in june, 2023 is missing from the balance sheet
+        "MSFT": {
+            "income_statement_10k": statement({"Net Income": [80.0, 70.0, 60.0], "Total Revenue": [250.0, 210.0, 200.0]},
+                                              ["2024-06-30", "2023-06-30", "2022-06-30"]),
+            "balance_sheet_10k": statement({"Stockholders Equity": [200.0, 160.0]}, ["2024-06-30", "2022-06-30"])
+        }
+    }
+    ratios = RatioMgmt(sources)
+
+    equity = ratios.evaluate("equity")
+    assert np.allclose(equity[0], [60, 40, 50])
+    assert equity[1, 0] == 200 and np.isnan(equity[1, 1]) and equity[1, 2] == 160
+
+    roe = ratios.evaluate("roe")
+    assert np.isclose(roe[0, 0], 100 / 50) and np.isclose(roe[0, 1], 90 / 45)
+    assert np.isnan(roe[1, 0]) and np.isnan(roe[1, 1])
+    assert np.allclose(ratios.to_frame(["net_margin"])["net_margin"], [100 / 400, 80 / 250])
+
+def test_add_ratio_invalidates_dependents():
+    sources = {"A": {"income_statement_10k": statement({"Net Income": [10.0], "Total Revenue": [100.0]}, ["2024-12-31"])}}
+    ratios = RatioMgmt(sources)
+    assert np.isclose(ratios.evaluate("net_margin")[0, 0], 0.1)
+    ratios.add_ratio("double_margin", "add", "net_margin", "net_margin")
+    ratios.add_ratio("net_margin", "div", "revenue", "net_income", replace=True)
+    assert np.isclose(ratios.evaluate("double_margin")[0, 0], 20)
+
+def test_single_period_is_not_broadcast():
+    #every symbol has one year of income, three years of balances
+    dates = ["2024-12-31", "2023-12-31", "2022-12-31"]
+    sources = {
+        symbol: {
+            "income_statement_10k": statement({"Net Income": [10.0], "Total Revenue": [100.0]}, dates[:1]),
+            "balance_sheet_10k": statement({"Stockholders Equity": [50.0, 30.0, 10.0]}, dates),
+            "cash_flow_10q": statement({"Free Cash Flow": [1.0, 2.0, 3.0, 4.0]},
+                                       ["2024-12-31", "2024-09-30", "2024-06-30", "2024-03-31"]),
+            "info": {"marketCap": 1000.0}
+        }
+        for symbol in ("A", "B")
+    }
+    ratios = RatioMgmt(sources)
+    assert ratios.evaluate("net_income").shape == (2, 1)
+
+    roe = ratios.evaluate("roe")
+    assert roe.shape == (2, 1) and np.allclose(roe, 10 / 40)
+    #ttm and info items still broadcast
+    ratios.add_ratio("equity_to_cap", "div", "equity", "market_cap")
+    assert np.allclose(ratios.evaluate("equity_to_cap"), [[0.05, 0.03, 0.01]] * 2)
+    assert np.allclose(ratios.evaluate("fcf_yield"), 0.01)
+
+def test_cyclic_ratios_are_rejected():
+    ratios = RatioMgmt()
+    ratios.add_ratio("a", "div", "revenue", "net_margin")
+    with pytest.raises(ValueError):
+        ratios.add_ratio("net_margin", "div", "net_income", "a", replace=True)
+    with pytest.raises(ValueError):
+        ratios.add_ratio("b", "average", "b")
+    assert ratios.ratios["net_margin"] == ("div", "net_income", "revenue")
@@ -0,0 +1,42 @@
+"""
+@gitsil10
+@file test_simulation_mgmt.py
+@brief tests of simulation_mgmt.py
+"""
+#imports
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.stats as st
+from utils.simulation_mgmt import SimulationMgmt
+
+@pytest.fixture
+def simulation():
+    returns = np.random.default_rng(0).normal(0.0005, 0.01, 500)
+    history = pd.DataFrame({"Close": 100 * np.exp(np.concatenate(([0.0], np.cumsum(returns))))})
+    return SimulationMgmt(history)
+
+def test_gbm_matches_the_lognormal(simulation):
+    steps = 20
+    result = simulation.simulate(n_paths=40000, n_steps=steps, chunk_size=7000)
+
+    drift, volatility = steps * simulation.drift, np.sqrt(steps) * simulation.volatility
+    assert result["count"] == 40000
+    assert len(result["mean_path"]) == steps + 1
+    assert result["mean_terminal"] == pytest.approx(simulation.price * np.exp(drift + volatility ** 2 / 2), rel=2e-3)
+    assert result["mean_path"][-1] == pytest.approx(result["mean_terminal"])
+    assert result["percentiles"][50] == pytest.approx(simulation.price * np.exp(drift), rel=5e-3)
+    assert result["var"] == pytest.approx(-np.expm1(drift + volatility * st.norm.ppf(0.05)), rel=0.05)
+    assert result["es"] > result["var"]
+
+def test_simulation_does_not_depend_on_workers(simulation):
+    serial = simulation.simulate(n_paths=3000, n_steps=10, model="bootstrap", chunk_size=1000)
+    parallel = simulation.simulate(n_paths=3000, n_steps=10, model="bootstrap", chunk_size=1000, workers=2)
+    assert serial["var"] == parallel["var"]
+    assert np.array_equal(serial["mean_path"], parallel["mean_path"])
+
+def test_calibrate_needs_three_prices():
+    simulation = SimulationMgmt()
+    assert not simulation.calibrate(pd.Series([100.0, np.nan, 101.0]))
+    with pytest.raises(ValueError):
+        simulation.simulate()
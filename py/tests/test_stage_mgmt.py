@@ -0,0 +1,54 @@
+"""
+@gitsil10
+@file test_stage_mgmt.py
+@brief tests of stage_mgmt.py
+"""
+#imports
+from os import makedirs, path, remove
+from utils.stage_mgmt import StageMgmt
+
+def write(file_name:str, text:str) -> None:
+    with open(file_name, "w") as f:
+        f.write(text)
+
+def test_run_skips_fresh_outputs(tmp_path):
+    raw, output = str(tmp_path / "raw.csv"), str(tmp_path / "clean.csv")
+    write(raw, "1,2,3")
+    builds = []
+    def build():
+        builds.append(1)
+        write(output, "clean")
+
+    manifest = str(tmp_path / "manifest.json")
+    stages = StageMgmt(manifest)
+    assert stages.run("processed", output, [raw], "v1", build)
+    assert not stages.run("processed", output, [raw], "v1", build)
+    #a new process reads the manifest
+    assert not StageMgmt(manifest).run("processed", output, [raw], "v1", build)
+
+    assert StageMgmt(manifest).run("processed", output, [raw], {"window": 20}, build)
+    write(raw, "1,2,4")
+    assert stages.run("processed", output, [raw], {"window": 20}, build)
+    remove(output)
+    assert stages.is_stale("processed", output, [raw], {"window": 20})
+    assert len(builds) == 3
+
+def test_failed_builds_are_not_recorded(tmp_path):
+    stages = StageMgmt(str(tmp_path / "manifest.json"))
+    assert not stages.run("processed", "name", [], "v1", lambda: False)
+    assert stages.is_stale("processed", "name", [], "v1")
+    assert not path.exists(tmp_path / "manifest.json")
+
+def test_only_changed_partitions_are_stale(tmp_path):
+    makedirs(tmp_path / "raw" / "AAPL")
+    write(str(tmp_path / "raw" / "AAPL" / "prices.csv"), "1")
+    write(str(tmp_path / "raw" / "MSFT.csv"), "2")
+    partitions = {"AAPL": [str(tmp_path / "raw" / "AAPL")], "MSFT": [str(tmp_path / "raw" / "MSFT.csv")]}
+
+    stages = StageMgmt(str(tmp_path / "manifest.json"))
+    assert stages.stale_partitions("processed", "history", partitions) == ["AAPL", "MSFT"]
+    for partition, inputs in partitions.items():
+        stages.record_partition("processed", "history", partition, inputs)
+
+    write(str(tmp_path / "raw" / "AAPL" / "volume.csv"), "3")
+    assert stages.stale_partitions("processed", "history", partitions) == ["AAPL"]
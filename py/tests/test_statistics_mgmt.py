@@ -0,0 +1,81 @@
+"""
+@gitsil10
+@file test_statistics_mgmt.py
+@brief tests of statistics_mgmt.py
+"""
+#imports
+import numpy as np
+import pytest
+import scipy.stats as st
+from utils.statistics_mgmt import StatisticsMgmt
+
+@pytest.mark.parametrize("method", ["percentile", "bca"])
+def test_bootstrap_does_not_depend_on_chunks(method):
+    data = np.random.default_rng(0).gamma(2.0, size=(7, 40))
+    statistics = StatisticsMgmt()
+
+    whole = statistics.bootstrap_interval(data, "median", method=method, n_resamples=500, block_size=64)
+    #one series per chunk
+    chunked = statistics.bootstrap_interval(data, "median", method=method, n_resamples=500, block_size=64,
+                                            max_elements=500)
+    assert whole.shape == (7, 2)
+    assert np.array_equal(whole, chunked)
+    assert (whole[:, 0] < whole[:, 1]).all()
+
+def test_bootstrap_matches_scipy():
+    data = np.random.default_rng(1).normal(3.0, 2.0, 200)
+    lower, upper = StatisticsMgmt().bootstrap_interval(data, "mean", method="bca", n_resamples=5000)
+
+    expected = st.bootstrap((data,), np.mean, n_resamples=5000, method="BCa", random_state=0).confidence_interval
+    assert lower == pytest.approx(expected.low, abs=0.05)
+    assert upper == pytest.approx(expected.high, abs=0.05)
+
+def test_batch_matches_the_scalar_methods():
+    statistics = StatisticsMgmt()
+    x = np.linspace(-3.0, 3.0, 13)
+
+    assert np.allclose(statistics.batch_prob("normal", x, 0.5, 2.0),
+                       [statistics.normal_prob(value, 0.5, 2.0) for value in x])
+    assert np.allclose(statistics.batch_prob("binomial", np.arange(11), 10, 0.3),
+                       [statistics.binomial_prob(value, 10, 0.3) for value in range(11)])
+    assert np.allclose(statistics.batch_sf("normal", x), st.norm.sf(x))
+    assert np.allclose(statistics.batch_ppf("student_t", [0.025, 0.975], 5), st.t.ppf([0.025, 0.975], 5))
+
+def test_batch_broadcasts_parameters():
+    statistics = StatisticsMgmt()
+    rates = np.array([[1.0], [2.0], [4.0]])
+
+    grid = statistics.batch_cdf("poisson", np.arange(5), rates)
+    assert grid.shape == (3, 5)
+    assert np.allclose(grid, st.poisson.cdf(np.arange(5), rates))
+    with pytest.raises(ValueError):
+        statistics.batch_cdf("cauchy", 0.0)
+
+def test_adjust_pvalues():
+    pvalue = np.array([0.01, 0.04, np.nan, 0.03, 0.2])
+
+    bh = StatisticsMgmt.adjust_pvalues(pvalue, "fdr_bh")
+    assert np.allclose(bh[~np.isnan(pvalue)], st.false_discovery_control(pvalue[~np.isnan(pvalue)]))
+    assert np.isnan(bh[2])
+    #ranked 0.01, 0.03, 0.04, 0.2 -> 0.04, 0.09, max(0.09, 0.08), 0.2
+    assert np.allclose(StatisticsMgmt.adjust_pvalues(pvalue, "holm"), [0.04, 0.09, np.nan, 0.09, 0.2], equal_nan=True)
+
+def test_batch_hypothesis_test_matches_scipy():
+    data = np.random.default_rng(2).normal(0.2, 1.0, (50, 30))
+    data[3, :10] = np.nan
+    expected = st.ttest_1samp(data, 0.0, axis=1, nan_policy="omit")
+
+    result = StatisticsMgmt().batch_hypothesis_test(data, chunk_size=16)
+    assert np.allclose(result["statistic"], expected.statistic)
+    assert np.allclose(result["pvalue"], expected.pvalue)
+    assert np.array_equal(result["reject"], result["adjusted"] < 0.05)
+    assert (result["adjusted"] >= result["pvalue"]).all()
+
+def test_frozen_cache_is_bounded():
+    statistics = StatisticsMgmt(frozen_size=1)
+    normal = statistics.frozen("normal", 0, 1)
+    assert statistics.frozen("normal", 0, 1) is normal
+    statistics.frozen("normal", 1, 1)
+    assert statistics.frozen("normal", 0, 1) is not normal
+    with pytest.raises(ValueError):
+        StatisticsMgmt(frozen_size=0)
@@ -0,0 +1,77 @@
+"""
+@gitsil10
+@file test_writer_mgmt.py
+@brief tests of writer_mgmt.py
+"""
+#imports
+from os import makedirs
+import threading
+import time
+import pytest
+from utils.writer_mgmt import WriterMgmt
+
+def test_threads_append_in_batches(tmp_path):
+    with WriterMgmt({"raw": str(tmp_path)}, flush_size=64) as writer:
+        def write(number:int) -> None:
+            for line in range(100):
+                writer.write_raw("lines.txt", f"{number}:{line}\n")
+        threads = [threading.Thread(target=write, args=(number,)) for number in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    lines = (tmp_path / "lines.txt").read_text().splitlines()
+    assert len(lines) == 400
+    for number in range(4):
+        assert [line for line in lines if line.startswith(f"{number}:")] == [f"{number}:{line}" for line in range(100)]
+
+def test_flush_size_counts_bytes(tmp_path):
+    writer = WriterMgmt({"raw": str(tmp_path)}, flush_size=8, flush_interval=60)
+    writer.write_raw("text.txt", "ééé")
+    assert (tmp_path / "text.txt").exists() is False
+    writer.write_raw("text.txt", "é")
+    assert (tmp_path / "text.txt").read_text(encoding="utf-8") == "éééé"
+    writer.close()
+
+def test_directory_created_later(tmp_path):
+    writer = WriterMgmt({"raw": str(tmp_path / "raw")})
+    assert not writer.write_raw("a.txt", "a")
+    makedirs(tmp_path / "raw")
+    assert writer.write_raw("a.txt", "a")
+    writer.close()
+    assert (tmp_path / "raw" / "a.txt").read_text() == "a"
+
+def test_background_error_is_raised(tmp_path):
+    writer = WriterMgmt({"raw": str(tmp_path)}, flush_interval=0.01, background=True)
+    writer.write_raw("a.txt", "a")
+    (tmp_path / "a.txt").mkdir()
+    time.sleep(0.2)
+    with pytest.raises(IsADirectoryError):
+        writer.close()
+
+def test_close_after_a_writer_error_writes_the_other_files(tmp_path):
+    writer = WriterMgmt({"raw": str(tmp_path)}, flush_interval=0.01, background=True)
+    (tmp_path / "broken.txt").mkdir()
+    writer.write_raw("broken.txt", "lost")
+    time.sleep(0.1)
+    writer.write_raw("a.txt", "a")
+    writer.write_raw("b.txt", "b")
+    with pytest.raises(IsADirectoryError):
+        writer.close()
+    assert (tmp_path / "a.txt").read_text() == "a"
+    assert (tmp_path / "b.txt").read_text() == "b"
+
+def test_failed_batch_is_written_again(tmp_path):
+    writer = WriterMgmt({"raw": str(tmp_path)}, flush_interval=60)
+    (tmp_path / "a.txt").mkdir()
+    writer.write_raw("a.txt", "first ")
+    writer.write_raw("b.txt", "b")
+    with pytest.raises(IsADirectoryError):
+        writer.flush()
+    assert (tmp_path / "b.txt").read_text() == "b"
+
+    (tmp_path / "a.txt").rmdir()
+    writer.write_raw("a.txt", "second")
+    writer.close()
+    assert (tmp_path / "a.txt").read_text() == "first second"